@@ -1,18 +1,103 @@
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
+from typing import Awaitable, Deque, Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict
 import asyncio
 import aiohttp
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
 import json
+import logging
+import random
 import re
+import time
+from collections import Counter, deque
+from contextlib import aclosing
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 from core.base_agent import BaseAgent, AgentResponse
-from core.llm_service import LLMService
+from core.llm_cache import InMemoryLLMCache
+from core.llm_service import LLMResponse, build_sections_prompt, get_llm_service, parse_sections
+from core.text_search import terms_pattern
 from mcp.mcp_manager import MCPManager, MCPSearchResult
 
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+_BULLET_RE = re.compile(r"^[-*•]\s+")
+_LINE_RE = re.compile(r"[^\n]*\S[^\n]*")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+)$")
+
+# Trailing findings/recommendations block requested from synthesis prompts
+_FINDINGS_BLOCK_RE = re.compile(r'(?:```(?:json)?\s*)?(\{\s*"findings".*\})\s*(?:```)?\s*$', re.S)
+_FINDINGS_BLOCK_INSTRUCTION = """
+
+End your response with a JSON block of the form {"findings": [...], "recommendations": [...]}
+holding 3-5 key findings and 3-5 specific, actionable recommendations for DSS."""
+
+def _parse_findings_json(text: str) -> Optional[Tuple[List[str], List[str]]]:
+    """Parse a {"findings": [...], "recommendations": [...]} object.
+    
+    Returns:
+        Tuple of (findings, recommendations), each limited to 5 items, or
+        None if the text is not such an object
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    findings, recommendations = data.get("findings"), data.get("recommendations")
+    if not isinstance(findings, list) or not isinstance(recommendations, list):
+        return None
+    return (
+        [str(item).strip() for item in findings if str(item).strip()][:5],
+        [str(item).strip() for item in recommendations if str(item).strip()][:5]
+    )
+
+def _parse_bulleted(text: str, limit: int = 5) -> List[str]:
+    """Parse up to ``limit`` list items from LLM output, one per line.
+    
+    Blank lines and markdown headings are skipped and leading bullet
+    markers are stripped.
+    """
+    items = []
+    # Scan non-blank lines lazily and stop once the limit is reached
+    for match in _LINE_RE.finditer(text):
+        line = match.group().strip()
+        if not line.startswith('#'):
+            items.append(_BULLET_RE.sub('', line))
+            if len(items) == limit:
+                break
+    return items
+
+def _existing_list_items(text: str, minimum: int = 3) -> Optional[List[str]]:
+    """Return the items of text if it is already a short bulleted or numbered list.
+    
+    Only text whose every non-blank, non-heading line is a list item counts,
+    so prose that merely contains a numbered outline is not mistaken for one.
+    
+    Args:
+        text: Text to inspect
+        minimum: Fewest items for the text to count as a list
+        
+    Returns:
+        The item texts, or None if text is not such a list
+    """
+    items = []
+    for match in _LINE_RE.finditer(text):
+        line = match.group().strip()
+        if line.startswith('#'):
+            continue
+        item = _LIST_ITEM_RE.match(line)
+        if item is None:
+            return None
+        items.append(item.group(1).strip())
+    return items if len(items) >= minimum else None
+
 class ResearchSource(BaseModel):
     """Model for research source information."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     url: str
     title: str
     content: str
@@ -40,16 +125,60 @@ class ResearchResult(BaseModel):
 class Researcher(BaseAgent):
     """Researcher agent for conducting comprehensive research and analysis."""
     
-    def __init__(self):
-        """Initialize the Researcher agent."""
+    # Concurrency limit for fan-out HTTP calls; LLM calls are limited by the
+    # LLM service, which is sized to the Ollama server
+    MAX_CONCURRENT_HTTP_REQUESTS = 32
+    
+    # Maximum number of memoized research() syntheses
+    RESEARCH_RESULT_CACHE_SIZE = 128
+    # Upper bound on bytes read from a single web page
+    MAX_PAGE_BYTES = 512 * 1024
+    # Worker threads for HTML parsing, kept off the event loop
+    PARSE_WORKERS = 4
+    # Attempts per web source and backoff for transient fetch failures
+    FETCH_ATTEMPTS = 3
+    FETCH_RETRY_BASE_DELAY = 0.25
+    FETCH_RETRY_JITTER = 0.1
+    # Adaptive comprehensive research adds web sources once an MCP search runs
+    # past this percentile of recent MCP search times (or the default delay
+    # until enough searches have been timed), or when MCP returns too few
+    ESCALATION_PERCENTILE = 0.9
+    ESCALATION_DEFAULT_DELAY = 0.2
+    ESCALATION_MIN_SAMPLES = 10
+    ESCALATION_WINDOW = 100
+    # Comprehensive research stops waiting on other searches once one search
+    # returns max_results sources with at least this mean relevance
+    SUFFICIENT_RELEVANCE = 0.75
+    
+    # Sources whose content shingles overlap more than this are duplicates
+    DUPLICATE_SIMILARITY = 0.8
+    # Words of each source's content included in synthesis prompts
+    SOURCE_SUMMARY_TOKENS = 100
+    
+    def __init__(self, mcp_manager: Optional[MCPManager] = None):
+        """Initialize the Researcher agent.
+        
+        Args:
+            mcp_manager: MCP manager with registered servers to search; pass one
+                to share initialized servers across agents. By default an
+                empty manager is created.
+        """
         super().__init__(
             name="Researcher",
             role="Conducts deep research and analysis for DSS strategic initiatives"
         )
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.session = None
-        self.research_cache = {}
-        self.mcp_manager = MCPManager()
+        # Final syntheses by research() prompt, so a repeat skips the whole pipeline
+        self.research_results = InMemoryLLMCache(maxsize=self.RESEARCH_RESULT_CACHE_SIZE)
+        self.mcp_manager = mcp_manager if mcp_manager is not None else MCPManager()
+        self._http_semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Failed web fetches per host
+        self._fetch_errors: Counter = Counter()
+        # Recent MCP search durations, used to decide when to add web sources
+        self._mcp_search_times: Deque[float] = deque(maxlen=self.ESCALATION_WINDOW)
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
         
     async def process_request(self, request: Dict[str, Any]) -> AgentResponse:
         """Process incoming research requests.
@@ -98,12 +227,96 @@ class Researcher(BaseAgent):
                 errors=[str(e)]
             )
     
+    def _get_http_semaphore(self) -> asyncio.Semaphore:
+        """Get the HTTP concurrency limiter for the running event loop.
+        
+        The limiter is recreated when the agent is used from a new event loop,
+        since a semaphore cannot be shared across loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._http_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_HTTP_REQUESTS)
+            self._semaphore_loop = loop
+        return self._http_semaphore
+    
+    async def _generate(self, prompt: str, system_prompt: Optional[str] = None,
+                        json_mode: bool = False) -> LLMResponse:
+        """Generate an LLM response.
+        
+        Concurrency is bounded and repeated prompts are answered from the
+        cache by the LLM service.
+        """
+        return await self.llm_service.generate_response(
+            prompt, system_prompt, json_mode=json_mode
+        )
+    
+    async def _generate_list(self, prompt: str, system_prompt: Optional[str] = None,
+                             limit: int = 5, source: Optional[str] = None) -> List[str]:
+        """Generate a list of up to ``limit`` items, one per line of LLM output.
+        
+        The response is streamed and the stream is closed as soon as ``limit``
+        items have arrived, so the model does not keep generating text that
+        would be discarded. Only streams read to the end are cached, by the
+        LLM service, so a cut-off list is never served to a later caller.
+        
+        Args:
+            prompt: The input prompt
+            system_prompt: Optional system prompt
+            limit: Maximum number of items to return
+            source: Text the list is extracted from; if it is already a list
+                of at least three items, those are returned without an LLM call
+            
+        Returns:
+            List items parsed with ``_parse_bulleted``
+        """
+        if source is not None:
+            existing = _existing_list_items(source)
+            if existing is not None:
+                return existing[:limit]
+        
+        items: List[str] = []
+        buffer = ""
+        stream = self.llm_service.generate_response_stream(prompt, system_prompt)
+        async with aclosing(stream):
+            async for chunk in stream:
+                buffer += chunk
+                *lines, buffer = buffer.split('\n')
+                items.extend(_parse_bulleted('\n'.join(lines), limit))
+                if len(items) >= limit:
+                    break
+            else:
+                items.extend(_parse_bulleted(buffer, limit))
+        
+        return items[:limit]
+    
     async def _get_session(self):
-        """Get or create aiohttp session for web requests."""
+        """Get or create aiohttp session for web requests.
+        
+        The session keeps connections alive and caches DNS lookups, so repeat
+        requests to the same host reuse the TCP/TLS connection. There is no
+        await between the check and the assignment, so concurrent callers on
+        the event loop cannot create duplicate sessions and no lock is needed.
+        """
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
         return self.session
     
+    async def aclose(self):
+        """Close the web request session."""
+        if self.session:
+            await self.session.close()
+            self.session = None
+    
     async def conduct_mcp_research(self, query_data: Dict[str, Any]) -> Dict[str, Any]:
         """Conduct research using MCP servers.
         
@@ -140,17 +353,19 @@ class Researcher(BaseAgent):
             
             # Synthesize findings
             synthesis = await self._synthesize_mcp_findings(mcp_results, query)
+            synthesis, key_findings, recommendations = await self._split_synthesis(
+                synthesis, ResearchQuery(topic=query, keywords=[], scope="focused", sources=[])
+            )
             
             return {
                 "success": True,
                 "message": "MCP research completed",
                 "data": {
                     "query": query,
-                    "sources": [source.dict() for source in sources],
+                    "sources": [source.model_dump(mode="json") for source in sources],
                     "synthesis": synthesis,
-                    "key_findings": await self._extract_key_findings(synthesis),
-                    "recommendations": await self._generate_recommendations(synthesis, 
-                        ResearchQuery(topic=query, keywords=[], scope="focused", sources=[])),
+                    "key_findings": key_findings,
+                    "recommendations": recommendations,
                     "mcp_sources": self.mcp_manager.get_available_sources()
                 },
                 "errors": []
@@ -177,55 +392,47 @@ class Researcher(BaseAgent):
             max_results = query_data.get("max_results", 10)
             include_web = query_data.get("include_web", True)
             include_mcp = query_data.get("include_mcp", True)
+            web_query = ResearchQuery(
+                topic=query,
+                keywords=query.split(),
+                scope="focused",
+                sources=["web"],
+                max_results=max_results
+            )
             
-            all_sources = []
+            # Unless the caller wants exhaustive results, a search that alone
+            # returns enough relevant sources cuts the others short
+            partial_ok = query_data.get("partial_ok", True)
             
-            # Conduct web research if requested
-            if include_web:
-                web_query = ResearchQuery(
-                    topic=query,
-                    keywords=query.split(),
-                    scope="focused",
-                    sources=["web"],
-                    max_results=max_results
-                )
-                web_results = await self._search_web_sources(web_query)
-                all_sources.extend(web_results)
-            
-            # Conduct MCP research if requested
-            if include_mcp:
-                mcp_results = await self.mcp_manager.search_all(
-                    query=query,
-                    max_results=max_results
-                )
-                
-                for result in mcp_results:
-                    source = ResearchSource(
-                        url=result.url or "",
-                        title=result.title,
-                        content=result.content,
-                        source_type=f"mcp_{result.source}",
-                        timestamp="2024-01-01",
-                        relevance_score=result.relevance_score
-                    )
-                    all_sources.append(source)
+            if include_web and include_mcp and query_data.get("adaptive", False):
+                all_sources = await self._search_adaptively(web_query, partial_ok)
+            else:
+                # Conduct the requested web and MCP research concurrently
+                searches = []
+                if include_web:
+                    searches.append(self._search_web_research_sources(web_query))
+                if include_mcp:
+                    searches.append(self._search_mcp_research_sources(query, max_results))
+                all_sources = await self._collect_sources(searches, max_results, partial_ok)
             
             # Sort by relevance
             all_sources.sort(key=lambda x: x.relevance_score, reverse=True)
             
             # Synthesize all findings
             synthesis = await self._synthesize_comprehensive_findings(all_sources, query)
+            synthesis, key_findings, recommendations = await self._split_synthesis(
+                synthesis, ResearchQuery(topic=query, keywords=[], scope="focused", sources=[])
+            )
             
             return {
                 "success": True,
                 "message": "Comprehensive research completed",
                 "data": {
                     "query": query,
-                    "sources": [source.dict() for source in all_sources],
+                    "sources": [source.model_dump(mode="json") for source in all_sources],
                     "synthesis": synthesis,
-                    "key_findings": await self._extract_key_findings(synthesis),
-                    "recommendations": await self._generate_recommendations(synthesis,
-                        ResearchQuery(topic=query, keywords=[], scope="focused", sources=[])),
+                    "key_findings": key_findings,
+                    "recommendations": recommendations,
                     "source_breakdown": {
                         "web_sources": len([s for s in all_sources if s.source_type.startswith("web")]),
                         "mcp_sources": len([s for s in all_sources if s.source_type.startswith("mcp")])
@@ -241,6 +448,113 @@ class Researcher(BaseAgent):
                 "errors": [str(e)]
             }
     
+    async def _collect_sources(self, searches: List[Awaitable[List[ResearchSource]]],
+                               max_results: int, partial_ok: bool = True) -> List[ResearchSource]:
+        """Run source searches concurrently and combine their results.
+        
+        Args:
+            searches: Searches to run
+            max_results: Number of sources the research asked for
+            partial_ok: Whether to stop once one search returns max_results
+                sources of mean relevance SUFFICIENT_RELEVANCE, cancelling
+                the searches still running
+            
+        Returns:
+            Sources in the order their searches finished
+        """
+        pending = {asyncio.ensure_future(search) for search in searches}
+        sources: List[ResearchSource] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    found = task.result()
+                    sources.extend(found)
+                    if partial_ok and self._is_sufficient(found, max_results):
+                        return sources
+            return sources
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _is_sufficient(self, sources: List[ResearchSource], max_results: int) -> bool:
+        """Check whether one search's sources are enough to synthesize from."""
+        if not sources or len(sources) < max_results:
+            return False
+        top = sorted((source.relevance_score for source in sources), reverse=True)[:max_results]
+        return sum(top) / len(top) >= self.SUFFICIENT_RELEVANCE
+    
+    async def _search_adaptively(self, query: ResearchQuery,
+                                 partial_ok: bool = True) -> List[ResearchSource]:
+        """Search MCP sources, adding web sources only when MCP falls short.
+        
+        Web search fetches and parses whole pages, so it is started only if
+        the MCP search is slower than usual or returns fewer than
+        ``query.max_results`` sources.
+        
+        Args:
+            query: Research query for the web search
+            partial_ok: Whether a sufficient MCP result may cancel a web
+                search already started
+            
+        Returns:
+            MCP sources together with any web sources
+        """
+        mcp_task = asyncio.ensure_future(
+            self._search_mcp_research_sources(query.topic, query.max_results)
+        )
+        start = time.perf_counter()
+        mcp_task.add_done_callback(lambda task: self._record_mcp_search_time(task, start))
+        try:
+            done, _ = await asyncio.wait({mcp_task}, timeout=self._escalation_delay())
+            if done:
+                mcp_sources = mcp_task.result()
+                if len(mcp_sources) >= query.max_results:
+                    return mcp_sources
+                return mcp_sources + await self._search_web_research_sources(query)
+            
+            return await self._collect_sources(
+                [mcp_task, self._search_web_research_sources(query)], query.max_results, partial_ok
+            )
+        finally:
+            mcp_task.cancel()
+    
+    def _record_mcp_search_time(self, task: asyncio.Future, start: float) -> None:
+        """Record how long an MCP search took, if it completed."""
+        if not task.cancelled() and task.exception() is None:
+            self._mcp_search_times.append(time.perf_counter() - start)
+    
+    def _escalation_delay(self) -> float:
+        """Get how long an MCP search may run before web sources are added."""
+        if len(self._mcp_search_times) < self.ESCALATION_MIN_SAMPLES:
+            return self.ESCALATION_DEFAULT_DELAY
+        times = sorted(self._mcp_search_times)
+        return times[int(self.ESCALATION_PERCENTILE * (len(times) - 1))]
+    
+    async def _search_web_research_sources(self, query: ResearchQuery) -> List[ResearchSource]:
+        """Search web sources and convert them to ResearchSource format."""
+        web_results = await self._search_web_sources(query)
+        return [ResearchSource(**result) for result in web_results]
+    
+    async def _search_mcp_research_sources(self, query: str, max_results: int) -> List[ResearchSource]:
+        """Search all MCP servers and convert results to ResearchSource format."""
+        mcp_results = await self.mcp_manager.search_all(
+            query=query,
+            max_results=max_results
+        )
+        
+        return [
+            ResearchSource(
+                url=result.url or "",
+                title=result.title,
+                content=result.content,
+                source_type=f"mcp_{result.source}",
+                timestamp="2024-01-01",
+                relevance_score=result.relevance_score
+            )
+            for result in mcp_results
+        ]
+    
     async def _synthesize_mcp_findings(self, mcp_results: List[MCPSearchResult], query: str) -> str:
         """Synthesize findings from MCP search results."""
         if not mcp_results:
@@ -248,8 +562,8 @@ class Researcher(BaseAgent):
         
         # Prepare content for synthesis
         content_summary = "\n\n".join([
-            f"Source: {result.source}\nTitle: {result.title}\nContent: {result.content[:500]}..."
-            for result in mcp_results
+            f"Source: {result.source}\nTitle: {result.title}\nContent: {self._truncate_tokens(result.content)}..."
+            for result in self._deduplicate_sources(mcp_results)
         ])
         
         prompt = f"""Synthesize the following MCP research findings for a DSS strategist:
@@ -267,13 +581,55 @@ Please provide a comprehensive synthesis that:
 5. Relates findings to DSS strategic priorities
 
 Focus on practical implications for DSS service delivery and policy development."""
+        prompt += _FINDINGS_BLOCK_INSTRUCTION
 
         system_prompt = """You are a DSS Research Specialist synthesizing MCP information for strategic decision-making. 
         Provide clear, actionable insights that can inform policy and operational improvements."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         return response.content
     
+    def _deduplicate_sources(self, sources: List[Any]) -> List[Any]:
+        """Drop near-duplicate sources, keeping the most relevant of each group.
+        
+        Sources are compared by Jaccard similarity of their 5-word shingles.
+        
+        Args:
+            sources: Sources with ``content`` and ``relevance_score`` attributes
+            
+        Returns:
+            Deduplicated sources in their original order
+        """
+        shingles = [self._shingles(source.content) for source in sources]
+        by_relevance = sorted(range(len(sources)), key=lambda i: sources[i].relevance_score, reverse=True)
+        
+        kept: List[int] = []
+        for i in by_relevance:
+            if all(self._jaccard(shingles[i], shingles[j]) <= self.DUPLICATE_SIMILARITY for j in kept):
+                kept.append(i)
+        
+        return [sources[i] for i in sorted(kept)]
+    
+    @staticmethod
+    def _shingles(content: str, size: int = 5) -> set:
+        """Build the set of ``size``-word shingles of lowercased content."""
+        words = content.lower().split()
+        if len(words) <= size:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    
+    @staticmethod
+    def _jaccard(a: set, b: set) -> float:
+        """Jaccard similarity of two shingle sets."""
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+    
+    def _truncate_tokens(self, content: str, max_tokens: Optional[int] = None) -> str:
+        """Truncate content to a number of whitespace-separated tokens."""
+        tokens = content.split()
+        return " ".join(tokens[:max_tokens or self.SOURCE_SUMMARY_TOKENS])
+    
     async def _synthesize_comprehensive_findings(self, sources: List[ResearchSource], query: str) -> str:
         """Synthesize findings from comprehensive research sources."""
         if not sources:
@@ -281,8 +637,8 @@ Focus on practical implications for DSS service delivery and policy development.
         
         # Prepare content for synthesis
         content_summary = "\n\n".join([
-            f"Source Type: {source.source_type}\nTitle: {source.title}\nContent: {source.content[:500]}..."
-            for source in sources
+            f"Source Type: {source.source_type}\nTitle: {source.title}\nContent: {self._truncate_tokens(source.content)}..."
+            for source in self._deduplicate_sources(sources)
         ])
         
         prompt = f"""Synthesize the following comprehensive research findings for a DSS strategist:
@@ -301,11 +657,12 @@ Please provide a comprehensive synthesis that:
 6. Relates findings to DSS strategic priorities
 
 Focus on practical implications for DSS service delivery and policy development."""
+        prompt += _FINDINGS_BLOCK_INSTRUCTION
 
         system_prompt = """You are a DSS Research Specialist synthesizing comprehensive research for strategic decision-making. 
         Provide clear, actionable insights that can inform policy and operational improvements."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         return response.content
     
     async def conduct_web_research(self, query_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -328,16 +685,19 @@ Focus on practical implications for DSS service delivery and policy development.
             
             # Synthesize findings
             synthesis = await self._synthesize_findings(analyzed_sources, query)
+            synthesis, key_findings, recommendations = await self._split_synthesis(
+                synthesis, query
+            )
             
             return {
                 "success": True,
                 "message": "Web research completed",
                 "data": {
-                    "query": query.dict(),
-                    "sources": [source.dict() for source in analyzed_sources],
+                    "query": query.model_dump(mode="json"),
+                    "sources": [source.model_dump(mode="json") for source in analyzed_sources],
                     "synthesis": synthesis,
-                    "key_findings": await self._extract_key_findings(synthesis),
-                    "recommendations": await self._generate_recommendations(synthesis, query)
+                    "key_findings": key_findings,
+                    "recommendations": recommendations
                 },
                 "errors": []
             }
@@ -354,72 +714,142 @@ Focus on practical implications for DSS service delivery and policy development.
         # For now, we'll use a simple approach with predefined sources
         # In a full implementation, you'd integrate with search APIs
         
-        sources = []
         search_terms = " ".join([query.topic] + query.keywords)
-        
+
         # DSS-relevant sources
         dss_sources = [
             "https://www1.nyc.gov/site/dss/index.page",
             "https://www.nyc.gov/site/hra/index.page",
             "https://www.nyc.gov/site/dhs/index.page"
         ]
-        
+
         session = await self._get_session()
-        
-        for source_url in dss_sources:
-            try:
-                async with session.get(source_url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        soup = BeautifulSoup(content, 'html.parser')
-                        
-                        # Extract relevant content
-                        title = soup.find('title')
-                        title_text = title.get_text() if title else "No title"
-                        
-                        # Simple relevance scoring
-                        relevance_score = self._calculate_relevance(content, search_terms)
-                        
-                        sources.append({
-                            "url": source_url,
-                            "title": title_text,
-                            "content": self._extract_main_content(soup),
-                            "source_type": "web",
-                            "timestamp": "2024-01-01",  # Would be actual timestamp
-                            "relevance_score": relevance_score
-                        })
-            except Exception as e:
-                print(f"Error fetching {source_url}: {e}")
+
+        # Fetch all sources concurrently
+        results = await asyncio.gather(
+            *(self._fetch_source(session, source_url, search_terms) for source_url in dss_sources),
+            return_exceptions=True
+        )
+
+        sources = []
+        for source_url, result in zip(dss_sources, results):
+            if isinstance(result, Exception):
+                logger.warning("fetch failed url=%s err=%r", source_url, result)
+                self._fetch_errors[urlparse(source_url).netloc] += 1
                 continue
-        
+            if result is not None:
+                sources.append(result)
+
         return sources
-    
+
+    async def _fetch_source(self, session: aiohttp.ClientSession, source_url: str,
+                            search_terms: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse a single web source.
+
+        Args:
+            session: HTTP session to fetch with
+            source_url: URL of the source
+            search_terms: Space-separated terms used for relevance scoring
+
+        Returns:
+            Source dictionary, or None if the page could not be retrieved
+        """
+        html = await self._fetch_html(session, source_url)
+        if html is None:
+            return None
+
+        # lxml releases the GIL while parsing, so a thread pool keeps
+        # large pages from stalling other in-flight fetches
+        if self._parse_pool is None:
+            self._parse_pool = ThreadPoolExecutor(
+                max_workers=self.PARSE_WORKERS, thread_name_prefix="researcher-parse"
+            )
+        page = await asyncio.get_running_loop().run_in_executor(
+            self._parse_pool, self._parse_page, html, search_terms
+        )
+
+        return {
+            "url": source_url,
+            "title": page["title"],
+            "content": page["content"],
+            "source_type": "web",
+            "timestamp": "2024-01-01",  # Would be actual timestamp
+            "relevance_score": page["relevance_score"]
+        }
+
+    async def _fetch_html(self, session: aiohttp.ClientSession, source_url: str) -> Optional[str]:
+        """Fetch the HTML of a web source, retrying transient failures.
+
+        Connection errors, timeouts and 5xx responses are retried with
+        exponential backoff and jitter. The HTTP limiter is released while
+        backing off so retries do not hold fetch slots.
+
+        Args:
+            session: HTTP session to fetch with
+            source_url: URL of the source
+
+        Returns:
+            Decoded HTML, or None for non-200 or non-HTML responses
+        """
+        http_semaphore = self._get_http_semaphore()
+        for attempt in range(self.FETCH_ATTEMPTS):
+            try:
+                async with http_semaphore, session.get(source_url) as response:
+                    if response.status >= 500:
+                        response.raise_for_status()
+                    if response.status != 200:
+                        return None
+                    if not response.headers.get("Content-Type", "").startswith("text/html"):
+                        return None
+
+                    # Read at most MAX_PAGE_BYTES; only the first 2000 chars are kept anyway
+                    raw = await response.content.read(self.MAX_PAGE_BYTES)
+                    return raw.decode(response.charset or "utf-8", errors="replace")
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.FETCH_ATTEMPTS - 1:
+                    raise
+
+            await asyncio.sleep(
+                self.FETCH_RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, self.FETCH_RETRY_JITTER)
+            )
+
     def _calculate_relevance(self, content: str, search_terms: str) -> float:
         """Calculate relevance score for content."""
-        content_lower = content.lower()
         terms = search_terms.lower().split()
+        if not terms:
+            return 0.0
         
-        score = 0
-        for term in terms:
-            score += content_lower.count(term)
-        
-        return min(score / len(terms), 1.0) if terms else 0.0
+        # One case-insensitive scan over the content for all terms
+        pattern = terms_pattern(tuple(terms))
+        score = sum(1 for _ in pattern.finditer(content))
+        return min(score / len(terms), 1.0)
     
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
-        """Extract main content from HTML."""
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+    def _parse_page(self, html: str, search_terms: str) -> Dict[str, Any]:
+        """Parse an HTML page once and extract its title, content and relevance.
         
-        # Get text content
-        text = soup.get_text()
+        Args:
+            html: Raw HTML of the page
+            search_terms: Space-separated terms used for relevance scoring
+            
+        Returns:
+            Dictionary with title, content and relevance_score
+        """
+        tree = lxml.html.fromstring(html)
+        title = tree.findtext('.//title') or "No title"
         
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # Remove script and style elements
+        for element in tree.xpath('//script|//style'):
+            element.drop_tree()
         
-        return text[:2000]  # Limit content length
+        # Get text content with whitespace collapsed
+        text = _WS_RE.sub(' ', tree.text_content()).strip()
+        
+        return {
+            "title": title,
+            "content": text[:2000],  # Limit content length
+            "relevance_score": self._calculate_relevance(text, search_terms)
+        }
     
     async def _analyze_sources(self, sources: List[Dict[str, Any]], query: ResearchQuery) -> List[ResearchSource]:
         """Analyze and filter sources based on relevance."""
@@ -443,8 +873,8 @@ Focus on practical implications for DSS service delivery and policy development.
         
         # Prepare content for synthesis
         content_summary = "\n\n".join([
-            f"Source: {source.title}\nRelevance: {source.relevance_score}\nContent: {source.content[:500]}..."
-            for source in sources
+            f"Source: {source.title}\nRelevance: {source.relevance_score}\nContent: {self._truncate_tokens(source.content)}..."
+            for source in self._deduplicate_sources(sources)
         ])
         
         prompt = f"""Synthesize the following research findings for a DSS strategist:
@@ -463,13 +893,79 @@ Please provide a comprehensive synthesis that:
 5. Relates findings to DSS strategic priorities
 
 Focus on practical implications for DSS service delivery and policy development."""
+        prompt += _FINDINGS_BLOCK_INSTRUCTION
 
         system_prompt = """You are a DSS Research Specialist synthesizing information for strategic decision-making. 
         Provide clear, actionable insights that can inform policy and operational improvements."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         return response.content
     
+    async def _extract_findings_and_recommendations(self, synthesis: str,
+                                                    query: ResearchQuery) -> Tuple[List[str], List[str]]:
+        """Extract key findings and recommendations from synthesis in one LLM call.
+        
+        Falls back to separate extraction calls if the model does not return
+        the expected JSON object.
+        
+        Args:
+            synthesis: Research synthesis text
+            query: Research query the synthesis answers
+            
+        Returns:
+            Tuple of (key findings, recommendations), each limited to 5 items
+        """
+        prompt = f"""From this research synthesis, extract 3-5 key findings and generate 3-5 specific recommendations for DSS:
+
+{synthesis}
+
+Research Topic: {query.topic}
+
+Findings should be clear, concise statements useful for DSS leadership.
+Recommendations should be specific, actionable, relevant to DSS operations, feasible,
+aligned with the DSS mission, and prioritized by impact and effort.
+
+Respond with a JSON object of the form {{"findings": [...], "recommendations": [...]}}."""
+
+        system_prompt = """You are a DSS Research Specialist extracting findings and recommendations 
+        for DSS leadership. Focus on actionable insights and practical, implementable suggestions."""
+        
+        response = await self._generate(prompt, system_prompt, json_mode=True)
+        
+        parsed = _parse_findings_json(response.content)
+        if parsed is not None:
+            return parsed
+        
+        findings, recommendations = await asyncio.gather(
+            self._extract_key_findings(synthesis),
+            self._generate_recommendations(synthesis, query)
+        )
+        return findings, recommendations
+    
+    async def _split_synthesis(self, synthesis: str,
+                               query: ResearchQuery) -> Tuple[str, List[str], List[str]]:
+        """Split the trailing findings block off a synthesis.
+        
+        Synthesis prompts ask the model to end with a JSON block of findings
+        and recommendations, which saves a separate extraction round-trip.
+        
+        Args:
+            synthesis: Synthesis text, possibly ending with a findings block
+            query: Research query the synthesis answers
+            
+        Returns:
+            Tuple of (synthesis without the block, key findings, recommendations).
+            Falls back to an extraction call if there is no valid block.
+        """
+        match = _FINDINGS_BLOCK_RE.search(synthesis)
+        if match:
+            parsed = _parse_findings_json(match.group(1))
+            if parsed is not None:
+                return synthesis[:match.start()].rstrip(), parsed[0], parsed[1]
+        
+        findings, recommendations = await self._extract_findings_and_recommendations(synthesis, query)
+        return synthesis, findings, recommendations
+    
     async def _extract_key_findings(self, synthesis: str) -> List[str]:
         """Extract key findings from synthesis."""
         prompt = f"""Extract 3-5 key findings from this research synthesis:
@@ -481,11 +977,8 @@ Format each finding as a clear, concise statement that would be useful for DSS l
         system_prompt = """You are extracting key findings for DSS leadership. 
         Focus on actionable insights and strategic implications."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
-        
-        # Parse findings (simple approach - in production you'd use more sophisticated parsing)
-        findings = [line.strip() for line in response.content.split('\n') if line.strip() and not line.startswith('#')]
-        return findings[:5]  # Limit to 5 findings
+        # Stream the findings and stop after 5
+        return await self._generate_list(prompt, system_prompt, limit=5, source=synthesis)
     
     async def _generate_recommendations(self, synthesis: str, query: ResearchQuery) -> List[str]:
         """Generate recommendations based on research findings."""
@@ -505,11 +998,8 @@ Provide recommendations that are:
         system_prompt = """You are a DSS Research Specialist providing recommendations. 
         Focus on practical, implementable suggestions that will improve service delivery."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
-        
-        # Parse recommendations
-        recommendations = [line.strip() for line in response.content.split('\n') if line.strip() and not line.startswith('#')]
-        return recommendations[:5]  # Limit to 5 recommendations
+        # Stream the recommendations and stop after 5
+        return await self._generate_list(prompt, system_prompt, limit=5)
     
     async def analyze_documents(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze documents for insights and patterns.
@@ -524,11 +1014,10 @@ Provide recommendations that are:
             documents = document_data.get("documents", [])
             analysis_type = document_data.get("analysis_type", "general")
             
-            # Analyze each document
-            document_analyses = []
-            for doc in documents:
-                analysis = await self._analyze_single_document(doc, analysis_type)
-                document_analyses.append(analysis)
+            # Analyze all documents concurrently
+            document_analyses = list(await asyncio.gather(
+                *(self._analyze_single_document(doc, analysis_type) for doc in documents)
+            ))
             
             # Synthesize across documents
             cross_document_synthesis = await self._synthesize_document_analyses(document_analyses)
@@ -573,7 +1062,7 @@ Please provide:
         system_prompt = """You are a DSS Document Analyst. 
         Focus on extracting strategic insights and practical implications for DSS operations."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         
         return {
             "title": title,
@@ -590,9 +1079,7 @@ Please provide:
 
 List each theme as a short phrase."""
 
-        response = await self.llm_service.generate_response(prompt)
-        themes = [line.strip() for line in response.content.split('\n') if line.strip()]
-        return themes[:5]
+        return await self._generate_list(prompt, limit=5, source=analysis)
     
     async def _synthesize_document_analyses(self, analyses: List[Dict[str, Any]]) -> str:
         """Synthesize multiple document analyses."""
@@ -617,7 +1104,7 @@ Provide a comprehensive synthesis that identifies:
         system_prompt = """You are synthesizing document analyses for DSS leadership. 
         Focus on strategic insights and actionable recommendations."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         return response.content
     
     async def _extract_document_insights(self, synthesis: str) -> List[str]:
@@ -628,9 +1115,7 @@ Provide a comprehensive synthesis that identifies:
 
 Format as clear, actionable insights for DSS leadership."""
 
-        response = await self.llm_service.generate_response(prompt)
-        insights = [line.strip() for line in response.content.split('\n') if line.strip()]
-        return insights[:5]
+        return await self._generate_list(prompt, limit=5, source=synthesis)
     
     async def synthesize_research(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
         """Synthesize multiple research sources into a comprehensive report.
@@ -655,6 +1140,9 @@ Format as clear, actionable insights for DSS leadership."""
             synthesis = await self._generate_comprehensive_synthesis(
                 combined_content, research_question
             )
+            synthesis, key_findings, recommendations = await self._split_synthesis(
+                synthesis, ResearchQuery(topic=research_question, keywords=[], scope="focused", sources=[])
+            )
             
             return {
                 "success": True,
@@ -662,9 +1150,8 @@ Format as clear, actionable insights for DSS leadership."""
                 "data": {
                     "research_question": research_question,
                     "synthesis": synthesis,
-                    "key_findings": await self._extract_key_findings(synthesis),
-                    "recommendations": await self._generate_recommendations(synthesis, 
-                        ResearchQuery(topic=research_question, keywords=[], scope="focused", sources=[]))
+                    "key_findings": key_findings,
+                    "recommendations": recommendations
                 },
                 "errors": []
             }
@@ -693,11 +1180,12 @@ Please provide:
 5. Areas for Further Research
 
 Focus on practical implications for DSS operations and policy development."""
+        prompt += _FINDINGS_BLOCK_INSTRUCTION
 
         system_prompt = """You are a DSS Research Specialist creating comprehensive reports for leadership. 
         Structure your response clearly and focus on actionable insights."""
         
-        response = await self.llm_service.generate_response(prompt, system_prompt)
+        response = await self._generate(prompt, system_prompt)
         return response.content
     
     async def research_policy_implications(self, policy_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -734,7 +1222,8 @@ Focus on practical policy considerations for DSS implementation."""
             system_prompt = """You are a DSS Policy Research Specialist. 
             Provide comprehensive policy analysis with practical implementation guidance."""
             
-            response = await self.llm_service.generate_response(prompt, system_prompt)
+            response = await self._generate(prompt, system_prompt)
+            key_implications, recommendations = await self._extract_policy_sections(response.content)
             
             return {
                 "success": True,
@@ -743,8 +1232,8 @@ Focus on practical policy considerations for DSS implementation."""
                     "policy_topic": policy_topic,
                     "jurisdiction": jurisdiction,
                     "analysis": response.content,
-                    "key_implications": await self._extract_policy_implications(response.content),
-                    "recommendations": await self._generate_policy_recommendations(response.content)
+                    "key_implications": key_implications,
+                    "recommendations": recommendations
                 },
                 "errors": []
             }
@@ -756,6 +1245,39 @@ Focus on practical policy considerations for DSS implementation."""
                 "errors": [str(e)]
             }
     
+    async def _extract_policy_sections(self, analysis: str) -> Tuple[List[str], List[str]]:
+        """Extract policy implications and recommendations in one LLM call.
+        
+        The analysis is sent once with both instructions. Falls back to
+        separate calls if the response is missing a section.
+        
+        Args:
+            analysis: Policy analysis text
+            
+        Returns:
+            Tuple of (key implications, recommendations), each limited to 5 items
+        """
+        prompt = build_sections_prompt([
+            ("key_implications", "Extract 3-5 key policy implications from this analysis. "
+                                 "Format as clear implications for DSS policy development, one per line."),
+            ("recommendations", "Generate 3-5 specific policy recommendations based on this analysis. "
+                                "Focus on actionable policy changes for DSS, one per line.")
+        ], context=f"Analysis:\n{analysis}")
+        
+        response = await self._generate(prompt)
+        sections = parse_sections(response.content)
+        if "key_implications" in sections and "recommendations" in sections:
+            return (
+                _parse_bulleted(sections["key_implications"], 5),
+                _parse_bulleted(sections["recommendations"], 5)
+            )
+        
+        key_implications, recommendations = await asyncio.gather(
+            self._extract_policy_implications(analysis),
+            self._generate_policy_recommendations(analysis)
+        )
+        return key_implications, recommendations
+    
     async def _extract_policy_implications(self, analysis: str) -> List[str]:
         """Extract key policy implications from analysis."""
         prompt = f"""Extract 3-5 key policy implications from this analysis:
@@ -764,9 +1286,7 @@ Focus on practical policy considerations for DSS implementation."""
 
 Format as clear implications for DSS policy development."""
 
-        response = await self.llm_service.generate_response(prompt)
-        implications = [line.strip() for line in response.content.split('\n') if line.strip()]
-        return implications[:5]
+        return await self._generate_list(prompt, limit=5, source=analysis)
     
     async def _generate_policy_recommendations(self, analysis: str) -> List[str]:
         """Generate policy recommendations from analysis."""
@@ -776,9 +1296,7 @@ Format as clear implications for DSS policy development."""
 
 Focus on actionable policy changes for DSS."""
 
-        response = await self.llm_service.generate_response(prompt)
-        recommendations = [line.strip() for line in response.content.split('\n') if line.strip()]
-        return recommendations[:5]
+        return await self._generate_list(prompt, limit=5)
     
     async def research_best_practices(self, practice_data: Dict[str, Any]) -> Dict[str, Any]:
         """Research best practices for DSS initiatives.
@@ -811,7 +1329,11 @@ Focus on practices that can be adapted to DSS operations."""
             system_prompt = """You are a DSS Best Practices Research Specialist. 
             Identify practical, proven approaches that can improve DSS service delivery."""
             
-            response = await self.llm_service.generate_response(prompt, system_prompt)
+            response = await self._generate(prompt, system_prompt)
+            key_practices, implementation_guide = await asyncio.gather(
+                self._extract_key_practices(response.content),
+                self._generate_implementation_guide(response.content)
+            )
             
             return {
                 "success": True,
@@ -820,8 +1342,8 @@ Focus on practices that can be adapted to DSS operations."""
                     "practice_area": practice_area,
                     "context": context,
                     "best_practices": response.content,
-                    "key_practices": await self._extract_key_practices(response.content),
-                    "implementation_guide": await self._generate_implementation_guide(response.content)
+                    "key_practices": key_practices,
+                    "implementation_guide": implementation_guide
                 },
                 "errors": []
             }
@@ -841,9 +1363,7 @@ Focus on practices that can be adapted to DSS operations."""
 
 Format as actionable practices for DSS implementation."""
 
-        response = await self.llm_service.generate_response(prompt)
-        practices = [line.strip() for line in response.content.split('\n') if line.strip()]
-        return practices[:7]
+        return await self._generate_list(prompt, limit=7, source=content)
     
     async def _generate_implementation_guide(self, content: str) -> str:
         """Generate implementation guide from best practices."""
@@ -858,19 +1378,28 @@ Provide a step-by-step guide for DSS implementation including:
 4. Success metrics
 5. Risk mitigation"""
 
-        response = await self.llm_service.generate_response(prompt)
+        response = await self._generate(prompt)
         return response.content
     
     async def cleanup(self):
         """Clean up resources."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        await self.aclose()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
         await self.mcp_manager.cleanup()
 
     async def research(self, prompt: str) -> str:
-        """A simplified research method for direct prompts."""
+        """A simplified research method for direct prompts.
+        
+        Successful syntheses are memoized by prompt, so repeating a prompt
+        skips the searches and every LLM call behind it.
+        """
         try:
+            cached = await self.research_results.get(prompt)
+            if cached is not None:
+                return cached
+            
             research_data = {
                 "query": prompt,
                 "max_results": 5,
@@ -881,7 +1410,9 @@ Provide a step-by-step guide for DSS implementation including:
             result = await self.conduct_comprehensive_research(research_data)
             
             if result.get("success"):
-                return result.get("data", {}).get("synthesis", "No synthesis available.")
+                synthesis = result.get("data", {}).get("synthesis", "No synthesis available.")
+                await self.research_results.set(prompt, synthesis)
+                return synthesis
             else:
                 return f"Research failed: {result.get('errors', ['Unknown error'])}"
                 
@@ -1,7 +1,26 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Awaitable, Callable, List
+from functools import lru_cache
+import re
 from pydantic import BaseModel
+from config.config import settings
 from core.base_agent import BaseAgent, AgentResponse
-from core.llm_service import LLMService
+from core.llm_service import get_llm_service
+
+_RECOMMENDATION_PREFIX_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+def _kpi_gap(name: str, current: float, target: float) -> float:
+    """Get how far a KPI is short of its target; negative when it beats it."""
+    if name in settings.KPI_LOWER_IS_BETTER:
+        return round(current - target, 4)
+    return round(target - current, 4)
+
+def _split_recommendations(text: str) -> List[str]:
+    """Split bulleted or numbered LLM output into recommendation strings."""
+    return [
+        _RECOMMENDATION_PREFIX_RE.sub("", line).strip()
+        for line in text.splitlines()
+        if line.strip()
+    ]
 
 class KPIAnalysis(BaseModel):
     """Model for KPI analysis response."""
@@ -36,13 +55,26 @@ class RiskAssessment(BaseModel):
 class DSSStrategist(BaseAgent):
     """DSS Strategist agent for analyzing and optimizing DSS operations."""
     
-    def __init__(self):
-        """Initialize the DSS Strategist agent."""
+    def __init__(self, prefetch_follow_ups: bool = False):
+        """Initialize the DSS Strategist agent.
+        
+        Args:
+            prefetch_follow_ups: Whether to warm the LLM cache with likely
+                follow-up analyses in the background after a KPI analysis
+        """
         super().__init__(
             name="DSS Strategist",
             role="Data-informed advisor for senior leaders at NYC DSS"
         )
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
+        self.prefetch_follow_ups = prefetch_follow_ups
+        self._handlers: Dict[str, Callable[[Any], Awaitable[Dict[str, Any]]]] = {
+            "kpi_analysis": self.analyze_kpis,
+            "bottleneck_detection": self.detect_bottlenecks,
+            "initiative_analysis": self.analyze_initiative,
+            "risk_assessment": self.assess_risks,
+            "strategy_analysis": self._strategy_analysis
+        }
     
     async def process_request(self, request: Dict[str, Any]) -> AgentResponse:
         """Process incoming requests and provide strategic guidance.
@@ -56,29 +88,16 @@ class DSSStrategist(BaseAgent):
         try:
             request_type = request.get("type", "")
             
-            if request_type == "kpi_analysis":
-                response = await self.analyze_kpis(request.get("data", {}))
-            elif request_type == "bottleneck_detection":
-                response = await self.detect_bottlenecks(request.get("data", {}))
-            elif request_type == "initiative_analysis":
-                response = await self.analyze_initiative(request.get("data", {}))
-            elif request_type == "risk_assessment":
-                response = await self.assess_risks(request.get("data", {}))
-            elif request_type == "strategy_analysis":
-                # This path handles the direct string-in, string-out for the UI
-                analysis_result = await self.analyze_strategy(request.get("data", ""))
-                return AgentResponse(
-                    success=True,
-                    message="Strategy analysis completed.",
-                    data={"analysis": analysis_result}
-                )
-            else:
+            handler = self._handlers.get(request_type)
+            if handler is None:
                 return AgentResponse(
                     success=False,
                     message="Unknown request type",
                     errors=["Invalid request type specified"]
                 )
             
+            response = await handler(request.get("data", {}))
+            
             return AgentResponse(
                 success=response["success"],
                 message=response["message"],
@@ -93,6 +112,17 @@ class DSSStrategist(BaseAgent):
                 errors=[str(e)]
             )
         
+    async def _strategy_analysis(self, prompt: str) -> Dict[str, Any]:
+        """Wrap analyze_strategy in the standard handler response shape."""
+        # This path handles the direct string-in, string-out for the UI
+        analysis_result = await self.analyze_strategy(prompt or "")
+        return {
+            "success": True,
+            "message": "Strategy analysis completed.",
+            "data": {"analysis": analysis_result},
+            "errors": []
+        }
+    
     async def analyze_strategy(self, prompt: str) -> str:
         """A simplified strategy analysis method for direct prompts."""
         try:
@@ -106,21 +136,57 @@ class DSSStrategist(BaseAgent):
             return f"An unexpected error occurred during strategy analysis: {str(e)}"
         
     async def analyze_kpis(self, kpis: Dict[str, float]) -> Dict[str, Any]:
-        """Analyze KPI metrics and provide insights.
+        """Analyze KPI metrics against their targets and recommend actions.
+        
+        Gaps against settings.KPI_TARGETS are computed here and are positive
+        when a KPI is short of its target; the LLM is only asked for
+        recommendations given those figures. KPIs without a target are
+        reported as untracked. When KPIs are given but none has a target, the
+        LLM analyzes the raw figures instead.
         
         Args:
             kpis: Dictionary of KPI metrics and their values
             
         Returns:
-            Dictionary containing analysis results
+            Dictionary containing a KPIAnalysis per tracked KPI, or the LLM's
+            free-text analysis when no KPI is tracked
         """
         try:
-            analysis = await self.llm_service.analyze_kpis(kpis)
+            targets = settings.KPI_TARGETS
+            gaps = {
+                name: (float(value), targets[name], _kpi_gap(name, float(value), targets[name]))
+                for name, value in kpis.items()
+                if name in targets
+            }
+            if gaps:
+                facts = "\n".join(
+                    f"{name}: current {current:g}, target {target:g}, gap {gap:g}"
+                    for name, (current, target, gap) in gaps.items()
+                )
+                recommendations = await self.llm_service.recommend_kpi_actions(facts, list(gaps))
+                analysis: Any = {
+                    name: KPIAnalysis(
+                        current_value=current,
+                        target=target,
+                        gap=gap,
+                        recommendations=_split_recommendations(recommendations.get(name, ""))
+                    ).model_dump()
+                    for name, (current, target, gap) in gaps.items()
+                }
+            elif kpis:
+                analysis = await self.llm_service.analyze_kpis(kpis)
+            else:
+                analysis = {}
+            if self.prefetch_follow_ups:
+                # Bottleneck and risk reviews usually follow on the same data
+                self.llm_service.prefetch(self.llm_service.analyze_bottlenecks(kpis))
+                self.llm_service.prefetch(self.llm_service.assess_risks(kpis))
             return {
                 "success": True,
                 "message": "KPI analysis completed",
                 "data": {
-                    "analysis": analysis
+                    "analysis": analysis,
+                    "untracked": [name for name in kpis if name not in targets]
                 },
                 "errors": []
             }
@@ -211,4 +277,13 @@ class DSSStrategist(BaseAgent):
                 "message": "Risk assessment failed",
                 "data": {},
                 "errors": [str(e)]
-            } 
\ No newline at end of file
+            } 
+
+@lru_cache(maxsize=1)
+def get_strategist() -> DSSStrategist:
+    """Get the process-wide DSS Strategist with default settings.
+    
+    Returns:
+        Shared DSSStrategist instance
+    """
+    return DSSStrategist()
@@ -1,5 +1,5 @@
-from typing import Dict, Any
-from pydantic import BaseSettings
+from typing import Dict, Any, List, Optional
+from pydantic.v1 import BaseSettings
 
 
 class Settings(BaseSettings):
@@ -17,6 +17,8 @@ class Settings(BaseSettings):
         "service_access": 0.95,  # Target: 95% service accessibility
         "digital_inclusion": 0.80  # Target: 80% digital service adoption
     }
+    # KPIs where a value below target is good, e.g. days taken
+    KPI_LOWER_IS_BETTER: List[str] = ["time_to_benefit"]
     
     # Process Metrics Configuration
     PROCESS_THRESHOLDS: Dict[str, Dict[str, float]] = {
@@ -60,9 +62,21 @@ class Settings(BaseSettings):
         }
     }
     
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_SIZE: int = 1024  # Responses kept in the in-memory LRU cache
+    LLM_SEMANTIC_CACHE_THRESHOLD: Optional[float] = None  # e.g. 0.92; None disables
+    LLM_EMBEDDING_MODEL: str = "nomic-embed-text"
+    
+    # Ollama Configuration
+    # Requests Ollama serves in parallel; LLMService caps in-flight calls to match
+    OLLAMA_NUM_PARALLEL: int = 4
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
+        # Settings are read-only once loaded
+        frozen = True
 
 
 # Create a global settings instance
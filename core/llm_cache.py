@@ -0,0 +1,268 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Tuple, Type
+from collections import OrderedDict
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _dumps_sorted(payload: Dict[str, Any]) -> bytes:
+    """Serialize payload with sorted keys.
+    
+    Uses orjson when available; the stdlib fallback emits the same compact
+    UTF-8 bytes, so keys are identical either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False).encode("utf-8")
+
+
+def _dumps(payload: Any) -> bytes:
+    """Serialize payload to compact UTF-8 JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_cache_key(model: str, prompt: str, system_prompt: Optional[str] = None,
+                   json_mode: bool = False) -> str:
+    """Build the cache key for an LLM request.
+    
+    Args:
+        model: Name of the model serving the request
+        prompt: The input prompt
+        system_prompt: Optional system prompt
+        json_mode: Whether the output is constrained to JSON
+        
+    Returns:
+        SHA-256 hex digest of the request fields
+    """
+    payload = _dumps_sorted(
+        {"model": model, "system": system_prompt, "prompt": prompt, "json": json_mode}
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMCache(Protocol):
+    """Storage backend for LLM responses.
+    
+    Implement this protocol to back the cache with an external store such as
+    Redis; InMemoryLLMCache is the default.
+    """
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the stored response for key, or None on a miss."""
+        ...
+    
+    async def set(self, key: str, value: Any) -> None:
+        """Store a response under key."""
+        ...
+    
+    async def delete(self, key: str) -> None:
+        """Remove the response stored under key, if any."""
+        ...
+
+
+class InMemoryLLMCache:
+    """In-process LRU cache for LLM responses."""
+    
+    def __init__(self, maxsize: int = 1024):
+        """Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of responses kept before evicting the
+                least recently used one
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class DiskLLMCache:
+    """File-backed cache for LLM responses that persists across runs.
+    
+    Each response is stored as ``<directory>/<key>.json`` together with its
+    expiry time. Pydantic models are stored as JSON and rebuilt as ``model``
+    on load; other values must be JSON-serializable.
+    """
+    
+    def __init__(self, directory: str, ttl: Optional[float] = None,
+                 model: Optional[Type[BaseModel]] = None):
+        """Initialize the cache.
+        
+        Args:
+            directory: Directory holding the cached responses
+            ttl: Seconds a response stays valid (default: None, never expires)
+            model: Pydantic model used to rebuild stored responses
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.model = model
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+    
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            await self.delete(key)
+            return None
+        
+        value = entry.get("value")
+        if value is not None and self.model is not None:
+            return self.model.model_validate(value)
+        return value
+    
+    async def set(self, key: str, value: Any) -> None:
+        if isinstance(value, BaseModel):
+            value = value.model_dump(mode="json")
+        entry = {
+            "expires_at": time.time() + self.ttl if self.ttl is not None else None,
+            "value": value
+        }
+        
+        # Write to a temporary file and rename it so readers never see a partial entry
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_dumps(entry))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    async def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class SemanticLLMCache:
+    """Cache returning a stored response for a sufficiently similar prompt.
+    
+    Prompts are compared by cosine similarity of their embeddings. Entries are
+    grouped by namespace (model, system prompt and output mode), so a lookup
+    only scans prompts sent under the same instructions rather than every
+    stored entry.
+    """
+    
+    def __init__(self, embed: Callable[[str], Awaitable[Sequence[float]]],
+                 threshold: float = 0.92, maxsize: int = 1024, embedding_cache_size: int = 4096):
+        """Initialize the cache.
+        
+        Args:
+            embed: Coroutine function returning an embedding for a text
+            threshold: Minimum cosine similarity for a prompt to count as a hit
+            maxsize: Maximum number of entries kept per namespace
+            embedding_cache_size: Maximum number of prompt embeddings memoized
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.embedding_cache_size = embedding_cache_size
+        self._namespaces: Dict[str, "OrderedDict[str, Tuple[List[float], Any]]"] = {}
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+    
+    async def get(self, namespace: str, prompt: str) -> Optional[Any]:
+        """Return the response stored for the most similar prompt, if similar enough.
+        
+        Args:
+            namespace: Group of prompts to compare against
+            prompt: The input prompt
+            
+        Returns:
+            The stored response, or None if no prompt reaches the threshold
+        """
+        entries = self._namespaces.get(namespace)
+        if not entries:
+            return None
+        
+        vector = await self._embedding(prompt)
+        best_key, best_score = None, self.threshold
+        for key, (stored, _) in entries.items():
+            score = sum(a * b for a, b in zip(vector, stored))
+            if score >= best_score:
+                best_key, best_score = key, score
+        
+        if best_key is None:
+            return None
+        entries.move_to_end(best_key)
+        return entries[best_key][1]
+    
+    async def set(self, namespace: str, prompt: str, value: Any) -> None:
+        """Store a response for a prompt.
+        
+        Args:
+            namespace: Group the prompt belongs to
+            prompt: The input prompt
+            value: Response to store
+        """
+        entries = self._namespaces.setdefault(namespace, OrderedDict())
+        entries[prompt] = (await self._embedding(prompt), value)
+        entries.move_to_end(prompt)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+    
+    async def _embedding(self, prompt: str) -> List[float]:
+        """Get the unit-length embedding of a prompt, memoized by prompt text.
+        
+        A miss embeds the prompt on lookup and again on store; memoizing
+        also skips the encoder for template prompts that repeat exactly.
+        """
+        vector = self._embeddings.get(prompt)
+        if vector is not None:
+            self._embeddings.move_to_end(prompt)
+            return vector
+        
+        vector = self._normalize(await self.embed(prompt))
+        self._embeddings[prompt] = vector
+        if len(self._embeddings) > self.embedding_cache_size:
+            self._embeddings.popitem(last=False)
+        return vector
+    
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        """Scale a vector to unit length so dot products are cosine similarities."""
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
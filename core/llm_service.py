@@ -1,62 +1,367 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Awaitable, List, Optional, Set, Tuple
+from contextlib import aclosing
+from functools import cached_property
+import asyncio
+import os
+import re
+import httpx
 import ollama
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from config.config import settings
+from core.llm_cache import LLMCache, InMemoryLLMCache, SemanticLLMCache, make_cache_key
+
+# Analysis prompts keep their static instructions ahead of the variable data
+# so Ollama can reuse the KV cache for the shared prefix across calls.
+KPI_ANALYSIS_SYSTEM_PROMPT = """You are a DSS Strategist analyzing KPI metrics. 
+        Provide clear, actionable insights focused on improving service delivery 
+        and operational efficiency."""
+
+KPI_ANALYSIS_INSTRUCTIONS = """Analyze the KPI metrics in DATA below and provide insights.
+        
+        Consider:
+        1. Current performance levels
+        2. Areas needing improvement
+        3. Potential strategies for optimization
+        4. Impact on service delivery"""
+
+KPI_RECOMMENDATIONS_SYSTEM_PROMPT = """You are a DSS Strategist. Given precomputed gaps below, 
+        suggest recommendations only. The figures are exact; do not restate or 
+        recalculate them."""
+
+BOTTLENECK_ANALYSIS_SYSTEM_PROMPT = """You are a DSS Strategist analyzing process bottlenecks. 
+        Identify key bottlenecks and provide specific, actionable recommendations 
+        for improvement."""
+
+BOTTLENECK_ANALYSIS_INSTRUCTIONS = """Analyze the process data in DATA below to identify bottlenecks.
+        
+        Consider:
+        1. Process flow and dependencies
+        2. Resource utilization
+        3. Queue lengths and wait times
+        4. Error rates and their impact
+        5. Staff allocation and workload"""
+
+INITIATIVE_ANALYSIS_SYSTEM_PROMPT = """You are a DSS Strategist analyzing initiatives. 
+        Provide a comprehensive analysis focusing on strategic value, 
+        implementation feasibility, and potential impact."""
+
+INITIATIVE_ANALYSIS_INSTRUCTIONS = """Analyze the initiative in DATA below.
+        
+        Consider:
+        1. Strategic alignment
+        2. Resource requirements
+        3. Implementation timeline
+        4. Stakeholder impact
+        5. Risk factors
+        6. Success metrics"""
+
+RISK_ASSESSMENT_SYSTEM_PROMPT = """You are a DSS Strategist assessing policy changes. 
+        Identify potential risks and provide specific mitigation strategies 
+        while considering operational impact and stakeholder needs."""
+
+RISK_ASSESSMENT_INSTRUCTIONS = """Assess risks for the policy change in DATA below.
+        
+        Consider:
+        1. Operational impact
+        2. Stakeholder concerns
+        3. Resource implications
+        4. Timeline risks
+        5. Compliance requirements
+        6. Service delivery impact"""
+
+_SECTION_RE = re.compile(r"^===SECTION (\w+)===[ \t]*$", re.MULTILINE)
+
+def build_sections_prompt(sections: List[Tuple[str, str]], context: Optional[str] = None) -> str:
+    """Build one prompt asking for several delimited answers.
+    
+    Args:
+        sections: (name, instruction) pairs; names must be word characters
+        context: Optional text shared by all sections, included once
+        
+    Returns:
+        Prompt text
+    """
+    parts = []
+    if context:
+        parts.append(f"{context}\n")
+    for name, instruction in sections:
+        parts.append(f"### SECTION: {name}\n{instruction}\n")
+    parts.append(
+        "Answer every section above. Start each answer with a line of the form "
+        "===SECTION name=== using the section name, and add nothing outside the sections."
+    )
+    return "\n".join(parts)
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Split a response to build_sections_prompt into its sections.
+    
+    Args:
+        text: Response text with ===SECTION name=== delimiter lines
+        
+    Returns:
+        Dictionary mapping section names to their stripped text
+    """
+    matches = list(_SECTION_RE.finditer(text))
+    return {
+        match.group(1): text[match.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)].strip()
+        for i, match in enumerate(matches)
+    }
+
+_METADATA_FIELDS = (
+    'total_duration', 'load_duration', 'prompt_eval_count',
+    'prompt_eval_duration', 'eval_count', 'eval_duration'
+)
 
 class LLMResponse(BaseModel):
     """Model for LLM response."""
     content: str
-    metadata: Optional[Dict[str, Any]] = None
+    model: Optional[str] = None
+    raw: Optional[Dict[str, Any]] = Field(default=None, exclude=True, repr=False)
+    
+    @cached_property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        """Model name plus Ollama timings and token counts, built on first access."""
+        if self.raw is None:
+            return None
+        return {'model': self.model, **{field: self.raw.get(field) for field in _METADATA_FIELDS}}
 
 class LLMService:
     """Service for interacting with Ollama LLM."""
     
-    def __init__(self, model_name: str = "mistral"):
+    # Seconds an idle pooled connection to Ollama is kept open
+    KEEPALIVE_EXPIRY = 60.0
+    
+    def __init__(self, model_name: str = "mistral", cache: Optional[LLMCache] = None,
+                 cache_enabled: bool = True, semantic_threshold: Optional[float] = None,
+                 embedding_model: str = "nomic-embed-text", max_concurrency: Optional[int] = None):
         """Initialize the LLM service.
         
         Args:
             model_name: Name of the model to use (default: "mistral")
+            cache: Optional response cache backend (default: in-memory LRU)
+            cache_enabled: Whether to cache responses by exact request
+            semantic_threshold: Cosine similarity at which a paraphrased prompt
+                reuses a cached response (default: None, semantic cache off)
+            embedding_model: Ollama model used to embed prompts for the
+                semantic cache
+            max_concurrency: Maximum in-flight Ollama requests (default: the
+                OLLAMA_NUM_PARALLEL environment variable, or 4)
         """
         self.model_name = model_name
+        self.max_concurrency = max_concurrency or int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        self.embedding_model = embedding_model
+        self.cache: Optional[LLMCache] = None
+        self.semantic_cache: Optional[SemanticLLMCache] = None
+        if cache_enabled:
+            self.cache = cache if cache is not None else InMemoryLLMCache()
+            if semantic_threshold is not None:
+                self.semantic_cache = SemanticLLMCache(self.embed, threshold=semantic_threshold)
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        self._client: Optional[ollama.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_client(self) -> ollama.AsyncClient:
+        """Get the Ollama client for the running event loop.
+        
+        One client is kept so its connection pool is reused across calls. It is
+        recreated when the service is used from a new event loop, since pooled
+        connections cannot be shared across loops.
+        """
+        self._bind_loop()
+        return self._client
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the limiter on in-flight Ollama requests for the running event loop.
+        
+        Ollama serves OLLAMA_NUM_PARALLEL requests at once and queues the rest,
+        so sending more only adds tail latency and server memory.
+        """
+        self._bind_loop()
+        return self._semaphore
+    
+    def _bind_loop(self) -> None:
+        """Create the client and limiter for the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._client = ollama.AsyncClient(limits=self._connection_limits())
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._client_loop = loop
         
-    async def generate_response(self, prompt: str, system_prompt: Optional[str] = None) -> LLMResponse:
+    def _connection_limits(self) -> httpx.Limits:
+        """Size the client's connection pool to the concurrency cap.
+        
+        Twice max_concurrency leaves room for embedding and streaming calls
+        alongside the capped chat requests while still bounding the sockets
+        opened against a single local Ollama server.
+        """
+        pool_size = self.max_concurrency * 2
+        return httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=self.KEEPALIVE_EXPIRY
+        )
+    
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt and optional system prompt."""
+        if system_prompt:
+            return [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+        return [{"role": "user", "content": prompt}]
+    
+    async def generate_response(self, prompt: str, system_prompt: Optional[str] = None,
+                                json_mode: bool = False) -> LLMResponse:
         """Generate a response from the LLM.
         
         Args:
             prompt: The input prompt
             system_prompt: Optional system prompt to guide the model's behavior
+            json_mode: Whether to constrain the output to a JSON object
             
         Returns:
             LLMResponse containing the generated content and metadata
         """
         try:
-            # Prepare the messages
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
+            if self.cache is not None:
+                cache_key = make_cache_key(self.model_name, prompt, system_prompt, json_mode)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            if self.semantic_cache is not None:
+                # Everything but the prompt must match for a semantic hit
+                namespace = make_cache_key(self.model_name, "", system_prompt, json_mode)
+                cached = await self.semantic_cache.get(namespace, prompt)
+                if cached is not None:
+                    return cached
+            
+            messages = self._build_messages(prompt, system_prompt)
             
             # Generate response from Ollama
-            response = ollama.chat(
-                model=self.model_name,
-                messages=messages
-            )
+            async with self._get_semaphore():
+                response = await self._get_client().chat(
+                    model=self.model_name,
+                    messages=messages,
+                    format="json" if json_mode else ""
+                )
             
-            return LLMResponse(
+            llm_response = LLMResponse(
                 content=response['message']['content'],
-                metadata={
-                    'model': self.model_name,
-                    'total_duration': response.get('total_duration'),
-                    'load_duration': response.get('load_duration'),
-                    'prompt_eval_count': response.get('prompt_eval_count'),
-                    'prompt_eval_duration': response.get('prompt_eval_duration'),
-                    'eval_count': response.get('eval_count'),
-                    'eval_duration': response.get('eval_duration')
-                }
+                model=self.model_name,
+                raw=response
             )
             
+            if self.cache is not None:
+                await self.cache.set(cache_key, llm_response)
+            if self.semantic_cache is not None:
+                await self.semantic_cache.set(namespace, prompt, llm_response)
+            
+            return llm_response
+            
         except Exception as e:
             raise Exception(f"Error generating response from LLM: {str(e)}")
     
+    def prefetch(self, call: Awaitable[Any]) -> Optional[asyncio.Task]:
+        """Run a likely follow-up LLM call in the background to warm the cache.
+        
+        The call runs under the same concurrency limit as foreground calls.
+        Nobody awaits the result, so failures are ignored. Tasks still pending
+        when the event loop closes are dropped.
+        
+        Args:
+            call: Coroutine making LLM calls through this service
+            
+        Returns:
+            The background task, or None when caching is disabled
+        """
+        if self.cache is None:
+            call.close()
+            return None
+        
+        task = asyncio.ensure_future(call)
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_done)
+        return task
+    
+    def _prefetch_done(self, task: asyncio.Task) -> None:
+        """Forget a finished prefetch task and discard its outcome."""
+        self._prefetch_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+    
+    async def generate_multi(self, sections: List[Tuple[str, str]], context: Optional[str] = None,
+                             system_prompt: Optional[str] = None) -> Dict[str, str]:
+        """Answer several prompts over the same context in a single LLM call.
+        
+        The shared context is evaluated once instead of once per prompt.
+        
+        Args:
+            sections: (name, instruction) pairs to answer
+            context: Optional text shared by all sections
+            system_prompt: Optional system prompt to guide the model's behavior
+            
+        Returns:
+            Dictionary mapping section names to answers; sections the model
+            did not delimit are missing
+        """
+        response = await self.generate_response(build_sections_prompt(sections, context), system_prompt)
+        return parse_sections(response.content)
+    
+    async def embed(self, text: str) -> List[float]:
+        """Embed text with the configured Ollama embedding model.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        async with self._get_semaphore():
+            response = await self._get_client().embeddings(model=self.embedding_model, prompt=text)
+        return response['embedding']
+    
+    async def generate_response_stream(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream a response from the LLM as it is generated.
+        
+        Closing the iterator early closes the underlying request, so callers
+        can stop generation once they have what they need. A cached response
+        is yielded as one chunk; a stream read to the end is cached like
+        ``generate_response``, while one closed early is not.
+        
+        Args:
+            prompt: The input prompt
+            system_prompt: Optional system prompt to guide the model's behavior
+            
+        Yields:
+            Chunks of generated content
+        """
+        try:
+            cache_key = None
+            if self.cache is not None:
+                cache_key = make_cache_key(self.model_name, prompt, system_prompt)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    yield cached.content
+                    return
+            
+            messages = self._build_messages(prompt, system_prompt)
+            parts: List[str] = []
+            async with self._get_semaphore():
+                stream = await self._get_client().chat(
+                    model=self.model_name,
+                    messages=messages,
+                    stream=True
+                )
+                async with aclosing(stream):
+                    async for part in stream:
+                        parts.append(part['message']['content'])
+                        yield parts[-1]
+            
+            if cache_key is not None:
+                await self.cache.set(cache_key, LLMResponse(content="".join(parts), model=self.model_name))
+                    
+        except Exception as e:
+            raise Exception(f"Error streaming response from LLM: {str(e)}")
+    
     async def analyze_kpis(self, kpis: Dict[str, float]) -> str:
         """Analyze KPI data and provide insights.
         
@@ -66,23 +371,31 @@ class LLMService:
         Returns:
             Analysis of the KPI data
         """
-        prompt = f"""Analyze the following KPI metrics and provide insights:
-        {kpis}
+        prompt = f"""{KPI_ANALYSIS_INSTRUCTIONS}
         
-        Consider:
-        1. Current performance levels
-        2. Areas needing improvement
-        3. Potential strategies for optimization
-        4. Impact on service delivery
+        DATA:
+        {kpis}
         """
         
-        system_prompt = """You are a DSS Strategist analyzing KPI metrics. 
-        Provide clear, actionable insights focused on improving service delivery 
-        and operational efficiency."""
-        
-        response = await self.generate_response(prompt, system_prompt)
+        response = await self.generate_response(prompt, KPI_ANALYSIS_SYSTEM_PROMPT)
         return response.content
     
+    async def recommend_kpi_actions(self, kpi_gaps: str, kpi_names: List[str]) -> Dict[str, str]:
+        """Suggest actions for KPI gaps that were computed outside the LLM.
+        
+        Args:
+            kpi_gaps: One line of current value, target and gap per KPI
+            kpi_names: Names of the KPIs to answer for
+            
+        Returns:
+            Dictionary mapping KPI names to bulleted recommendations
+        """
+        sections = [
+            (name, f"List 2-3 recommendations to close the {name} gap, one per line starting with '- '.")
+            for name in kpi_names
+        ]
+        return await self.generate_multi(sections, f"KPI GAPS:\n{kpi_gaps}", KPI_RECOMMENDATIONS_SYSTEM_PROMPT)
+    
     async def analyze_bottlenecks(self, process_data: Dict[str, Any]) -> str:
         """Analyze process data to identify bottlenecks.
         
@@ -92,22 +405,13 @@ class LLMService:
         Returns:
             Analysis of bottlenecks and recommendations
         """
-        prompt = f"""Analyze the following process data to identify bottlenecks:
-        {process_data}
+        prompt = f"""{BOTTLENECK_ANALYSIS_INSTRUCTIONS}
         
-        Consider:
-        1. Process flow and dependencies
-        2. Resource utilization
-        3. Queue lengths and wait times
-        4. Error rates and their impact
-        5. Staff allocation and workload
+        DATA:
+        {process_data}
         """
         
-        system_prompt = """You are a DSS Strategist analyzing process bottlenecks. 
-        Identify key bottlenecks and provide specific, actionable recommendations 
-        for improvement."""
-        
-        response = await self.generate_response(prompt, system_prompt)
+        response = await self.generate_response(prompt, BOTTLENECK_ANALYSIS_SYSTEM_PROMPT)
         return response.content
     
     async def analyze_initiative(self, initiative_data: Dict[str, Any]) -> str:
@@ -119,23 +423,13 @@ class LLMService:
         Returns:
             Analysis of the initiative and recommendations
         """
-        prompt = f"""Analyze the following initiative:
-        {initiative_data}
+        prompt = f"""{INITIATIVE_ANALYSIS_INSTRUCTIONS}
         
-        Consider:
-        1. Strategic alignment
-        2. Resource requirements
-        3. Implementation timeline
-        4. Stakeholder impact
-        5. Risk factors
-        6. Success metrics
+        DATA:
+        {initiative_data}
         """
         
-        system_prompt = """You are a DSS Strategist analyzing initiatives. 
-        Provide a comprehensive analysis focusing on strategic value, 
-        implementation feasibility, and potential impact."""
-        
-        response = await self.generate_response(prompt, system_prompt)
+        response = await self.generate_response(prompt, INITIATIVE_ANALYSIS_SYSTEM_PROMPT)
         return response.content
     
     async def assess_risks(self, policy_data: Dict[str, Any]) -> str:
@@ -147,21 +441,37 @@ class LLMService:
         Returns:
             Risk assessment and mitigation strategies
         """
-        prompt = f"""Assess risks for the following policy change:
-        {policy_data}
+        prompt = f"""{RISK_ASSESSMENT_INSTRUCTIONS}
         
-        Consider:
-        1. Operational impact
-        2. Stakeholder concerns
-        3. Resource implications
-        4. Timeline risks
-        5. Compliance requirements
-        6. Service delivery impact
+        DATA:
+        {policy_data}
         """
         
-        system_prompt = """You are a DSS Strategist assessing policy changes. 
-        Identify potential risks and provide specific mitigation strategies 
-        while considering operational impact and stakeholder needs."""
+        response = await self.generate_response(prompt, RISK_ASSESSMENT_SYSTEM_PROMPT)
+        return response.content
+
+_llm_services: Dict[str, LLMService] = {}
+
+def get_llm_service(model_name: str = "mistral") -> LLMService:
+    """Get the process-wide LLM service for a model.
+    
+    Agents share one service so they share its Ollama connection pool and
+    response cache. The service is configured from ``config.settings``.
+    
+    Args:
+        model_name: Name of the model to use (default: "mistral")
         
-        response = await self.generate_response(prompt, system_prompt)
-        return response.content 
\ No newline at end of file
+    Returns:
+        The shared LLMService for the model
+    """
+    service = _llm_services.get(model_name)
+    if service is None:
+        service = _llm_services[model_name] = LLMService(
+            model_name,
+            cache=InMemoryLLMCache(settings.LLM_CACHE_SIZE),
+            cache_enabled=settings.LLM_CACHE_ENABLED,
+            semantic_threshold=settings.LLM_SEMANTIC_CACHE_THRESHOLD,
+            embedding_model=settings.LLM_EMBEDDING_MODEL,
+            max_concurrency=settings.OLLAMA_NUM_PARALLEL
+        )
+    return service
@@ -0,0 +1,21 @@
+from typing import Tuple
+from functools import lru_cache
+import re
+
+
+@lru_cache(maxsize=128)
+def terms_pattern(terms: Tuple[str, ...]) -> re.Pattern:
+    """Compile one case-insensitive alternation matching any of the terms.
+    
+    Longer terms are tried first, so a term is not cut short by another
+    that is its prefix. Patterns are cached, so scoring many texts against
+    the same query compiles it once.
+    
+    Args:
+        terms: Search terms, matched literally
+        
+    Returns:
+        Compiled pattern
+    """
+    alternatives = sorted(set(terms), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, alternatives)), re.IGNORECASE)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Stage timing for the example scripts.
+Wrap steps in ``stage(name)`` and run a script through this module to get a
+JSON report of wall time per stage, e.g.:
+
+    python examples/_profile.py mcp_research_example --pstats prof.out
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'profile.json')
+
+_stage_seconds: Dict[str, float] = defaultdict(float)
+_stage_calls: Dict[str, int] = defaultdict(int)
+
+@contextlib.asynccontextmanager
+async def stage(name: str) -> AsyncIterator[None]:
+    """Add the wall time spent inside the block to the named stage.
+
+    Stages entered concurrently overlap, so their totals can add up to more
+    than the run's wall time.
+
+    Args:
+        name: Stage name, e.g. "mcp_search_wikipedia"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_seconds[name] += time.perf_counter() - start
+        _stage_calls[name] += 1
+
+def stage_report() -> Dict[str, Any]:
+    """Get the stages recorded so far, slowest first.
+
+    Returns:
+        Mapping of stage name to total seconds and number of calls
+    """
+    return {
+        name: {"seconds": round(seconds, 6), "calls": _stage_calls[name]}
+        for name, seconds in sorted(_stage_seconds.items(), key=lambda item: item[1], reverse=True)
+    }
+
+def run_profiled(main: Callable[[], Awaitable[Any]], report_path: str = DEFAULT_REPORT_PATH,
+                 pstats_path: Optional[str] = None) -> Dict[str, Any]:
+    """Run an example's main() and write its stage report.
+
+    Args:
+        main: Coroutine function to run
+        report_path: Where to write the JSON report
+        pstats_path: Where to save per-function wall-clock stats in pstats
+            format; needs yappi, which unlike cProfile follows coroutines
+            across await points
+
+    Returns:
+        The report that was written
+    """
+    if pstats_path is not None:
+        import yappi
+        yappi.set_clock_type("wall")
+        yappi.start()
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(main())
+    finally:
+        wall_seconds = time.perf_counter() - start
+        if pstats_path is not None:
+            yappi.stop()
+            yappi.get_func_stats().save(pstats_path, type="pstat")
+
+    report = {"wall_seconds": round(wall_seconds, 6), "stages": stage_report()}
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the stages of an example script.")
+    parser.add_argument("example", help="example module to run, e.g. mcp_research_example")
+    parser.add_argument("--output", default=DEFAULT_REPORT_PATH, help="path of the JSON stage report")
+    parser.add_argument("--pstats", help="also save per-function stats here (requires yappi)")
+    args = parser.parse_args()
+
+    # Examples record into the importable module, not this __main__ copy of it
+    from _profile import run_profiled
+    example = importlib.import_module(args.example)
+    report = run_profiled(example.main, args.output, args.pstats)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,109 @@
+"""
+Shared setup for the MCP example scripts.
+The default MCP manager and researcher are built once per process and reused.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+import aiohttp
+from agents.researcher.researcher import Researcher
+from mcp.base_server import json_dumps
+from mcp.mcp_manager import MCPManager
+from mcp.search_cache import SearchCache
+from mcp.wikipedia_server import WikipediaMCPServer
+from mcp.arxiv_server import ArxivMCPServer
+
+# Search results are kept on disk so repeated runs skip the network
+SEARCH_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'mcp', 'search.sqlite3')
+
+# One entry of a research report's source details, followed by a blank line
+SOURCE_DETAILS_ENTRY = """{index}. {title}
+   Source: {source_type}
+   Relevance: {relevance_score:.2f}
+   URL: {url}
+
+"""
+
+_session: Optional[aiohttp.ClientSession] = None
+_search_cache: Optional[SearchCache] = None
+_manager: Optional[MCPManager] = None
+_researcher: Optional[Researcher] = None
+
+def _default_manager() -> MCPManager:
+    """Create the default MCP manager once, without initializing its servers."""
+    global _session, _search_cache, _manager
+    if _manager is None:
+        # Both servers share one connection pool, so keep-alive connections and
+        # resolved hosts are reused across every request the examples make
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, ttl_dns_cache=300,
+                                         keepalive_timeout=60)
+        _session = aiohttp.ClientSession(connector=connector, json_serialize=json_dumps)
+        _search_cache = SearchCache(SEARCH_CACHE_PATH)
+        _manager = MCPManager(search_cache=_search_cache)
+        _manager.register_server("wikipedia", WikipediaMCPServer(session=_session))
+        _manager.register_server("arxiv", ArxivMCPServer(session=_session))
+    return _manager
+
+async def build_default_manager() -> MCPManager:
+    """Get the MCP manager with the Wikipedia and arXiv servers registered.
+
+    The servers are initialized on the first call; later calls return at once.
+
+    Returns:
+        The initialized MCP manager
+    """
+    manager = _default_manager()
+    await manager.initialize()
+    return manager
+
+async def get_researcher() -> Researcher:
+    """Get the researcher searching the default MCP manager.
+
+    Returns:
+        The shared Researcher instance, with its MCP servers initialized
+    """
+    global _researcher
+    if _researcher is None:
+        manager = _default_manager()
+        # Let the servers' startup probes go out, then build the researcher
+        # while they are in flight
+        init_task = asyncio.ensure_future(manager.initialize())
+        await asyncio.sleep(0)
+        _researcher = Researcher(mcp_manager=manager)
+        await init_task
+    return _researcher
+
+async def cleanup() -> None:
+    """Clean up the shared researcher, MCP manager, HTTP session and search cache."""
+    global _session, _search_cache, _manager, _researcher
+    if _researcher is not None:
+        # Also cleans up the MCP manager it searches
+        await _researcher.cleanup()
+    elif _manager is not None:
+        await _manager.cleanup()
+    if _session is not None:
+        await _session.close()
+    if _search_cache is not None:
+        _search_cache.close()
+    _session = _search_cache = _manager = _researcher = None
+
+def format_source_details(sources: List[Dict[str, Any]]) -> str:
+    """Format the source details section of a research report.
+
+    Args:
+        sources: Sources from a research response's data
+
+    Returns:
+        The numbered entries as one string
+    """
+    return "".join(
+        SOURCE_DETAILS_ENTRY.format(
+            index=index,
+            title=source['title'],
+            source_type=source['source_type'],
+            relevance_score=source['relevance_score'],
+            url=source.get('url', 'N/A')
+        )
+        for index, source in enumerate(sources, 1)
+    )
@@ -4,197 +4,244 @@ Domain-based MCP Architecture Example
 Demonstrates agent segmentation by use case with specialized MCP server configurations.
 """
 
+import argparse
 import asyncio
+import json
+import aiohttp
 import sys
 import os
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from typing import TYPE_CHECKING, Any, Dict
+from mcp.base_server import BaseMCPServer
 from mcp.domain_manager import DomainManager, AgentDomain, DEFAULT_DOMAIN_CONFIGS
-from mcp.wikipedia_server import WikipediaMCPServer
-from mcp.arxiv_server import ArxivMCPServer
-from core.llm_service import LLMService
 
-async def demonstrate_domain_architecture():
-    """Demonstrate the domain-based MCP architecture."""
-    print("🏗️  Domain-Based MCP Architecture Demonstration")
-    print("=" * 60)
-    print()
+if TYPE_CHECKING:
+    from mcp.wikipedia_server import WikipediaMCPServer
+    from mcp.arxiv_server import ArxivMCPServer
+
+# Fixed report sections, each printed with a single call
+ARCHITECTURE_HEADER = "\n".join([
+    "🏗️  Domain-Based MCP Architecture Demonstration",
+    "=" * 60,
+    ""
+])
+
+INTEGRATION_HEADER = "\n".join([
+    "\n🤖 Agent Integration with Domain-Based MCP",
+    "=" * 50
+])
+
+STEP7_BANNER = "\n".join([
+    "🎯 Step 7: Agent Segmentation Benefits...",
+    "  ✅ WHY: Different agent groups have tailored toolsets and configurations",
+    "  ✅ HOW: Specialized MCP servers per function/domain",
+    "  ✅ BENEFIT: Cleaner, more maintainable configurations; fewer context collisions",
+    ""
+])
+
+COMPLETION_BANNER = "\n".join([
+    "✅ Domain-Based MCP Architecture Demonstration Complete!",
+    "",
+    "📚 Key Benefits Demonstrated:",
+    "  • Agent segmentation by use case",
+    "  • Domain-specific MCP server configurations",
+    "  • Tailored memory and context management",
+    "  • Security and rate limiting per domain",
+    "  • Cleaner, more maintainable architecture"
+])
+
+class MockBusinessServer(BaseMCPServer):
+    """Stand-in MCP server returning canned business data."""
+    
+    async def _initialize_server(self):
+        pass
+    async def search(self, query: str, max_results: int = 10):
+        return [{"title": "Business Data", "snippet": "Strategic business information"}]
+    async def get_content(self, resource_id: str):
+        return {"title": "Business Content", "content": "Strategic business data"}
+
+class MockDataServer(BaseMCPServer):
+    """Stand-in MCP server returning canned analytics data."""
+    
+    async def _initialize_server(self):
+        pass
+    async def search(self, query: str, max_results: int = 10):
+        return [{"title": "Analytics Data", "snippet": "Data analysis results"}]
+    async def get_content(self, resource_id: str):
+        return {"title": "Analytics Content", "content": "Data analysis content"}
+
+async def demonstrate_domain_architecture(wikipedia_server: "WikipediaMCPServer",
+                                          arxiv_server: "ArxivMCPServer",
+                                          verbose: bool = True) -> Dict[str, Any]:
+    """Demonstrate the domain-based MCP architecture.
+    
+    Args:
+        wikipedia_server: Wikipedia MCP server to register
+        arxiv_server: arXiv MCP server to register
+        verbose: Whether to print the demonstration report
+    
+    Returns:
+        Search results per domain and the health check report
+    """
+    if verbose:
+        print(ARCHITECTURE_HEADER)
     
     # Initialize domain manager
     domain_manager = DomainManager()
     
     # Register domains with their configurations
-    print("📋 Step 1: Registering Agent Domains...")
-    for domain, config in DEFAULT_DOMAIN_CONFIGS.items():
-        domain_manager.register_domain(domain, config)
-        print(f"  ✅ {domain.value}: {config.description}")
-    print()
+    domain_manager.register_domains(DEFAULT_DOMAIN_CONFIGS)
+    if verbose:
+        print("📋 Step 1: Registering Agent Domains...")
+        for domain, config in DEFAULT_DOMAIN_CONFIGS.items():
+            print(f"  ✅ {domain.value}: {config.description}")
+        print()
     
     # Register MCP servers for different domains
-    print("🔧 Step 2: Registering MCP Servers by Domain...")
-    
-    # Wikipedia server - available to research and general domains
-    wikipedia_server = WikipediaMCPServer()
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "wikipedia", wikipedia_server, priority=3
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.GENERAL, "wikipedia", wikipedia_server, priority=2
-    )
-    print("  ✅ Wikipedia server registered for RESEARCH and GENERAL domains")
-    
-    # arXiv server - available to research and general domains
-    arxiv_server = ArxivMCPServer()
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "arxiv", arxiv_server, priority=2
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.GENERAL, "arxiv", arxiv_server, priority=1
-    )
-    print("  ✅ arXiv server registered for RESEARCH and GENERAL domains")
     
     # Mock servers for other domains
-    from mcp.base_server import BaseMCPServer
-    
-    class MockBusinessServer(BaseMCPServer):
-        async def _initialize_server(self):
-            pass
-        async def search(self, query: str, max_results: int = 10):
-            return [{"title": "Business Data", "snippet": "Strategic business information"}]
-        async def get_content(self, resource_id: str):
-            return {"title": "Business Content", "content": "Strategic business data"}
-    
-    class MockDataServer(BaseMCPServer):
-        async def _initialize_server(self):
-            pass
-        async def search(self, query: str, max_results: int = 10):
-            return [{"title": "Analytics Data", "snippet": "Data analysis results"}]
-        async def get_content(self, resource_id: str):
-            return {"title": "Analytics Content", "content": "Data analysis content"}
-    
-    # Register mock servers for strategic and data analysis domains
     business_server = MockBusinessServer("Business MCP Server", "Business data access")
     data_server = MockDataServer("Data MCP Server", "Data analysis access")
     
-    domain_manager.register_server_for_domain(
-        AgentDomain.STRATEGIC, "business_db", business_server, priority=3
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.DATA_ANALYSIS, "analytics_db", data_server, priority=3
-    )
-    print("  ✅ Mock servers registered for STRATEGIC and DATA_ANALYSIS domains")
-    print()
+    domain_manager.register_servers([
+        # Wikipedia and arXiv - available to research and general domains
+        (AgentDomain.RESEARCH, "wikipedia", wikipedia_server, 3),
+        (AgentDomain.GENERAL, "wikipedia", wikipedia_server, 2),
+        (AgentDomain.RESEARCH, "arxiv", arxiv_server, 2),
+        (AgentDomain.GENERAL, "arxiv", arxiv_server, 1),
+        # Mock servers for strategic and data analysis domains
+        (AgentDomain.STRATEGIC, "business_db", business_server, 3),
+        (AgentDomain.DATA_ANALYSIS, "analytics_db", data_server, 3)
+    ])
+    if verbose:
+        print("🔧 Step 2: Registering MCP Servers by Domain...")
+        print("  ✅ Wikipedia server registered for RESEARCH and GENERAL domains")
+        print("  ✅ arXiv server registered for RESEARCH and GENERAL domains")
+        print("  ✅ Mock servers registered for STRATEGIC and DATA_ANALYSIS domains")
+        print()
     
     # Initialize all domains
-    print("🚀 Step 3: Initializing Domain Managers...")
+    if verbose:
+        print("🚀 Step 3: Initializing Domain Managers...", flush=True)
     await domain_manager.initialize_all()
-    print("  ✅ All domain managers initialized")
-    print()
+    if verbose:
+        print("  ✅ All domain managers initialized")
+        print()
     
     # Demonstrate domain-specific searches
-    print("🔍 Step 4: Demonstrating Domain-Specific Searches...")
-    
-    # Research domain search
-    print("  📚 RESEARCH Domain Search:")
-    research_results = await domain_manager.search_domain(
-        AgentDomain.RESEARCH, 
-        "Model Context Protocol", 
-        max_results=3
-    )
-    print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.RESEARCH)}")
-    print(f"    Results found: {len(research_results)}")
-    for result in research_results[:2]:
-        print(f"    - {result.title} (from {result.source})")
-    print()
-    
-    # Strategic domain search
-    print("  🎯 STRATEGIC Domain Search:")
-    strategic_results = await domain_manager.search_domain(
-        AgentDomain.STRATEGIC, 
-        "business strategy", 
-        max_results=3
-    )
-    print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.STRATEGIC)}")
-    print(f"    Results found: {len(strategic_results)}")
-    for result in strategic_results:
-        print(f"    - {result.title} (from {result.source})")
-    print()
-    
-    # Data analysis domain search
-    print("  📊 DATA_ANALYSIS Domain Search:")
-    data_results = await domain_manager.search_domain(
-        AgentDomain.DATA_ANALYSIS, 
-        "data analysis", 
-        max_results=3
+    if verbose:
+        print("🔍 Step 4: Demonstrating Domain-Specific Searches...", flush=True)
+    
+    # Run the domain searches concurrently; output is printed once all complete
+    research_results, strategic_results, data_results = await asyncio.gather(
+        domain_manager.search_domain(AgentDomain.RESEARCH, "Model Context Protocol", max_results=3),
+        domain_manager.search_domain(AgentDomain.STRATEGIC, "business strategy", max_results=3),
+        domain_manager.search_domain(AgentDomain.DATA_ANALYSIS, "data analysis", max_results=3)
     )
-    print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.DATA_ANALYSIS)}")
-    print(f"    Results found: {len(data_results)}")
-    for result in data_results:
-        print(f"    - {result.title} (from {result.source})")
-    print()
     
-    # Demonstrate domain configurations
-    print("⚙️  Step 5: Domain Configuration Analysis...")
+    demo_domains = [AgentDomain.RESEARCH, AgentDomain.STRATEGIC, AgentDomain.DATA_ANALYSIS]
     
-    for domain in [AgentDomain.RESEARCH, AgentDomain.STRATEGIC, AgentDomain.DATA_ANALYSIS]:
-        config = domain_manager.get_domain_config(domain)
-        if config:
-            print(f"  📋 {domain.value.upper()} Domain:")
-            print(f"    Description: {config.description}")
-            print(f"    Allowed Sources: {config.allowed_sources}")
-            print(f"    Security Level: {config.security_level}")
-            print(f"    Rate Limits: {config.rate_limits}")
-            print(f"    Memory Config: {config.memory_config}")
-            print()
+    if verbose:
+        # Research domain search
+        print("  📚 RESEARCH Domain Search:")
+        print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.RESEARCH)}")
+        print(f"    Results found: {len(research_results)}")
+        for result in research_results[:2]:
+            print(f"    - {result.title} (from {result.source})")
+        print()
+        
+        # Strategic domain search
+        print("  🎯 STRATEGIC Domain Search:")
+        print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.STRATEGIC)}")
+        print(f"    Results found: {len(strategic_results)}")
+        for result in strategic_results:
+            print(f"    - {result.title} (from {result.source})")
+        print()
+        
+        # Data analysis domain search
+        print("  📊 DATA_ANALYSIS Domain Search:")
+        print(f"    Sources available: {domain_manager.get_domain_sources(AgentDomain.DATA_ANALYSIS)}")
+        print(f"    Results found: {len(data_results)}")
+        for result in data_results:
+            print(f"    - {result.title} (from {result.source})")
+        print()
+        
+        # Demonstrate domain configurations
+        print("⚙️  Step 5: Domain Configuration Analysis...")
+        
+        configs = {domain: domain_manager.get_domain_config(domain) for domain in demo_domains}
+        for domain in demo_domains:
+            config = configs[domain]
+            if config:
+                print(f"  📋 {domain.value.upper()} Domain:")
+                print(f"    Description: {config.description}")
+                print(f"    Allowed Sources: {config.allowed_sources}")
+                print(f"    Security Level: {config.security_level}")
+                print(f"    Rate Limits: {config.rate_limits}")
+                print(f"    Memory Config: {config.memory_config}")
+                print()
     
     # Demonstrate health checks
-    print("🏥 Step 6: Domain Health Checks...")
+    if verbose:
+        print("🏥 Step 6: Domain Health Checks...", flush=True)
     health_status = await domain_manager.health_check_all()
     
-    for domain_name, status in health_status["domains"].items():
-        print(f"  🔍 {domain_name.upper()}: {status.get('manager_status', 'unknown')}")
-        if 'servers' in status:
-            for server_name, server_status in status['servers'].items():
-                print(f"    - {server_name}: {server_status.get('status', 'unknown')}")
-    print()
-    
-    # Demonstrate agent segmentation benefits
-    print("🎯 Step 7: Agent Segmentation Benefits...")
-    print("  ✅ WHY: Different agent groups have tailored toolsets and configurations")
-    print("  ✅ HOW: Specialized MCP servers per function/domain")
-    print("  ✅ BENEFIT: Cleaner, more maintainable configurations; fewer context collisions")
-    print()
-    
-    # Show domain server priorities
-    print("📈 Step 8: Domain Server Priorities...")
-    for domain in [AgentDomain.RESEARCH, AgentDomain.STRATEGIC, AgentDomain.DATA_ANALYSIS]:
-        servers = domain_manager.get_domain_servers(domain)
-        print(f"  🎯 {domain.value.upper()} Domain Servers (by priority):")
-        for server in servers:
-            print(f"    - {server.server_name} (priority: {server.priority})")
+    if verbose:
+        for domain_name, status in health_status["domains"].items():
+            print(f"  🔍 {domain_name.upper()}: {status.get('manager_status', 'unknown')}")
+            if 'servers' in status:
+                for server_name, server_status in status['servers'].items():
+                    print(f"    - {server_name}: {server_status.get('status', 'unknown')}")
         print()
+        
+        # Demonstrate agent segmentation benefits
+        print(STEP7_BANNER)
+        
+        # Show domain server priorities
+        print("📈 Step 8: Domain Server Priorities...")
+        for domain in demo_domains:
+            servers = domain_manager.get_domain_servers(domain)
+            print(f"  🎯 {domain.value.upper()} Domain Servers (by priority):")
+            for server in servers:
+                print(f"    - {server.server_name} (priority: {server.priority})")
+            print()
     
     # Cleanup
-    print("🧹 Step 9: Cleanup...")
+    if verbose:
+        print("🧹 Step 9: Cleanup...", flush=True)
     await domain_manager.cleanup_all()
-    print("  ✅ All domain managers cleaned up")
-    print()
-    
-    print("✅ Domain-Based MCP Architecture Demonstration Complete!")
-    print()
-    print("📚 Key Benefits Demonstrated:")
-    print("  • Agent segmentation by use case")
-    print("  • Domain-specific MCP server configurations")
-    print("  • Tailored memory and context management")
-    print("  • Security and rate limiting per domain")
-    print("  • Cleaner, more maintainable architecture")
+    if verbose:
+        print("  ✅ All domain managers cleaned up")
+        print()
+        
+        print(COMPLETION_BANNER)
+    
+    return {
+        "searches": {
+            domain.value: [result.model_dump(mode="json") for result in results]
+            for domain, results in zip(demo_domains, (research_results, strategic_results, data_results))
+        },
+        "health": health_status
+    }
 
-async def demonstrate_agent_integration():
-    """Demonstrate how agents would integrate with domain-based MCP."""
-    print("\n🤖 Agent Integration with Domain-Based MCP")
-    print("=" * 50)
+async def demonstrate_agent_integration(wikipedia_server: "WikipediaMCPServer",
+                                        arxiv_server: "ArxivMCPServer",
+                                        verbose: bool = True) -> Dict[str, Any]:
+    """Demonstrate how agents would integrate with domain-based MCP.
+    
+    Args:
+        wikipedia_server: Wikipedia MCP server to register
+        arxiv_server: arXiv MCP server to register
+        verbose: Whether to print the demonstration report
+    
+    Returns:
+        The research query and its results
+    """
+    if verbose:
+        print(INTEGRATION_HEADER, flush=True)
     
     # Initialize domain manager
     domain_manager = DomainManager()
@@ -204,20 +251,16 @@ async def demonstrate_agent_integration():
     domain_manager.register_domain(AgentDomain.RESEARCH, research_config)
     
     # Register servers for research domain
-    wikipedia_server = WikipediaMCPServer()
-    arxiv_server = ArxivMCPServer()
-    
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "wikipedia", wikipedia_server, priority=3
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "arxiv", arxiv_server, priority=2
-    )
+    domain_manager.register_servers([
+        (AgentDomain.RESEARCH, "wikipedia", wikipedia_server, 3),
+        (AgentDomain.RESEARCH, "arxiv", arxiv_server, 2)
+    ])
     
     await domain_manager.initialize_all()
     
     # Simulate researcher agent using domain-specific MCP
-    print("🔬 Simulating Researcher Agent with Domain-Specific MCP...")
+    if verbose:
+        print("🔬 Simulating Researcher Agent with Domain-Specific MCP...", flush=True)
     
     # Research query
     query = "Model Context Protocol configuration"
@@ -229,21 +272,65 @@ async def demonstrate_agent_integration():
         max_results=5
     )
     
-    print(f"  📝 Query: {query}")
-    print(f"  🎯 Domain: {AgentDomain.RESEARCH.value}")
-    print(f"  📊 Results: {len(results)}")
-    print(f"  🔧 Available Sources: {domain_manager.get_domain_sources(AgentDomain.RESEARCH)}")
-    
-    # Show domain configuration
-    config = domain_manager.get_domain_config(AgentDomain.RESEARCH)
-    if config:
-        print(f"  ⚙️  Context Rules: {config.context_rules}")
-        print(f"  🚦 Rate Limits: {config.rate_limits}")
-        print(f"  🔒 Security Level: {config.security_level}")
+    if verbose:
+        print(f"  📝 Query: {query}")
+        print(f"  🎯 Domain: {AgentDomain.RESEARCH.value}")
+        print(f"  📊 Results: {len(results)}")
+        print(f"  🔧 Available Sources: {domain_manager.get_domain_sources(AgentDomain.RESEARCH)}")
+        
+        # Show domain configuration
+        config = domain_manager.get_domain_config(AgentDomain.RESEARCH)
+        if config:
+            print(f"  ⚙️  Context Rules: {config.context_rules}")
+            print(f"  🚦 Rate Limits: {config.rate_limits}")
+            print(f"  🔒 Security Level: {config.security_level}")
     
     await domain_manager.cleanup_all()
-    print("  ✅ Agent integration demonstration complete")
+    if verbose:
+        print("  ✅ Agent integration demonstration complete")
+    
+    return {"query": query, "results": [result.model_dump(mode="json") for result in results]}
+
+async def main(verbose: bool = True) -> Dict[str, Any]:
+    """Run both demonstrations on one shared HTTP connection pool.
+    
+    Args:
+        verbose: Whether to print the demonstration report
+        
+    Returns:
+        Results of both demonstrations
+    """
+    # Imported here so loading the module skips the HTML/XML parsing stack
+    from mcp.wikipedia_server import WikipediaMCPServer
+    from mcp.arxiv_server import ArxivMCPServer
+    
+    # Wikipedia and arXiv requests reuse keep-alive connections across both demos
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60, enable_cleanup_closed=True)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        wikipedia_server = WikipediaMCPServer(session=session)
+        arxiv_server = ArxivMCPServer(session=session)
+        
+        return {
+            "domain_architecture": await demonstrate_domain_architecture(wikipedia_server, arxiv_server, verbose),
+            "agent_integration": await demonstrate_agent_integration(wikipedia_server, arxiv_server, verbose)
+        }
 
 if __name__ == "__main__":
-    asyncio.run(demonstrate_domain_architecture())
-    asyncio.run(demonstrate_agent_integration()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Demonstrate the domain-based MCP architecture.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="run the demonstrations without printing them")
+    output.add_argument("--json", action="store_true", help="print the search and health results as JSON")
+    args = parser.parse_args()
+    
+    # Buffer the report even on a terminal; progress lines before slow steps flush explicitly
+    sys.stdout.reconfigure(line_buffering=False)
+    try:
+        # uvloop is optional; when installed it runs the event loop instead of asyncio's
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
+    results = run(main(verbose=not (args.quiet or args.json)))
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
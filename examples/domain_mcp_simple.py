@@ -11,8 +11,43 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from typing import List, NamedTuple
 from mcp.domain_manager import DomainManager, AgentDomain, DEFAULT_DOMAIN_CONFIGS
 
+class Scenario(NamedTuple):
+    """A use case scenario shown for one agent domain."""
+    domain: AgentDomain
+    scenario: str
+    sources: List[str]
+    benefits: List[str]
+
+SCENARIOS = [
+    Scenario(
+        AgentDomain.RESEARCH,
+        "Academic research on MCP configuration",
+        ["wikipedia", "arxiv", "web_search", "academic_db"],
+        ["Access to academic papers", "Comprehensive web search", "Long context for synthesis"]
+    ),
+    Scenario(
+        AgentDomain.STRATEGIC,
+        "Business strategy analysis",
+        ["business_db", "policy_db", "financial_data", "market_research"],
+        ["High security", "Business-focused data", "Policy insights"]
+    ),
+    Scenario(
+        AgentDomain.DATA_ANALYSIS,
+        "Data analysis and reporting",
+        ["postgres", "mongodb", "analytics_db", "data_warehouse"],
+        ["High rate limits", "Large context windows", "Database access"]
+    ),
+    Scenario(
+        AgentDomain.WRITER,
+        "Content creation and writing",
+        ["style_guides", "content_db", "templates", "reference_materials"],
+        ["Style consistency", "Template access", "Reference materials"]
+    )
+]
+
 async def demonstrate_domain_architecture():
     """Demonstrate the domain-based MCP architecture."""
     print("🏗️  Domain-Based MCP Architecture for Agent Segmentation")
@@ -24,16 +59,20 @@ async def demonstrate_domain_architecture():
     
     # Register domains with their configurations
     print("📋 Step 1: Registering Agent Domains...")
+    domain_manager.register_domains(DEFAULT_DOMAIN_CONFIGS)
     for domain, config in DEFAULT_DOMAIN_CONFIGS.items():
-        domain_manager.register_domain(domain, config)
         print(f"  ✅ {domain.value}: {config.description}")
     print()
     
+    # Look up each demonstrated domain's configuration once for the steps below
+    domains = [AgentDomain.RESEARCH, AgentDomain.STRATEGIC, AgentDomain.DATA_ANALYSIS, AgentDomain.WRITER]
+    configs = {domain: domain_manager.get_domain_config(domain) for domain in domains}
+    
     # Demonstrate domain configurations
     print("⚙️  Step 2: Domain Configuration Analysis...")
     
-    for domain in [AgentDomain.RESEARCH, AgentDomain.STRATEGIC, AgentDomain.DATA_ANALYSIS, AgentDomain.WRITER]:
-        config = domain_manager.get_domain_config(domain)
+    for domain in domains:
+        config = configs[domain]
         if config:
             print(f"  📋 {domain.value.upper()} Domain:")
             print(f"    Description: {config.description}")
@@ -64,55 +103,34 @@ async def demonstrate_domain_architecture():
     print("  Domain | Security | Rate Limit | Context Length | Cache Duration")
     print("  -------|----------|------------|----------------|----------------")
     
-    for domain, name in domains_to_compare:
-        config = domain_manager.get_domain_config(domain)
-        if config:
-            security = config.security_level
-            rate_limit = config.rate_limits.get("requests_per_minute", "N/A")
-            context_length = config.context_rules.get("max_context_length", "N/A")
-            cache_duration = config.memory_config.get("cache_duration", "N/A")
-            
-            print(f"  {name:7} | {security:8} | {rate_limit:10} | {context_length:14} | {cache_duration:14}")
+    rows = [
+        (
+            name,
+            config.security_level,
+            config.rate_limits.get("requests_per_minute", "N/A"),
+            config.context_rules.get("max_context_length", "N/A"),
+            config.memory_config.get("cache_duration", "N/A")
+        )
+        for domain, name in domains_to_compare
+        if (config := configs[domain])
+    ]
+    print("\n".join(
+        f"  {name:7} | {security:8} | {rate_limit:10} | {context_length:14} | {cache_duration:14}"
+        for name, security, rate_limit, context_length, cache_duration in rows
+    ))
     print()
     
     # Demonstrate use case scenarios
     print("🔍 Step 5: Use Case Scenarios...")
     
-    scenarios = [
-        {
-            "domain": AgentDomain.RESEARCH,
-            "scenario": "Academic research on MCP configuration",
-            "sources": ["wikipedia", "arxiv", "web_search", "academic_db"],
-            "benefits": ["Access to academic papers", "Comprehensive web search", "Long context for synthesis"]
-        },
-        {
-            "domain": AgentDomain.STRATEGIC,
-            "scenario": "Business strategy analysis",
-            "sources": ["business_db", "policy_db", "financial_data", "market_research"],
-            "benefits": ["High security", "Business-focused data", "Policy insights"]
-        },
-        {
-            "domain": AgentDomain.DATA_ANALYSIS,
-            "scenario": "Data analysis and reporting",
-            "sources": ["postgres", "mongodb", "analytics_db", "data_warehouse"],
-            "benefits": ["High rate limits", "Large context windows", "Database access"]
-        },
-        {
-            "domain": AgentDomain.WRITER,
-            "scenario": "Content creation and writing",
-            "sources": ["style_guides", "content_db", "templates", "reference_materials"],
-            "benefits": ["Style consistency", "Template access", "Reference materials"]
-        }
-    ]
-    
-    for scenario in scenarios:
-        domain = scenario["domain"]
-        config = domain_manager.get_domain_config(domain)
+    for scenario in SCENARIOS:
+        domain = scenario.domain
+        config = configs[domain]
         if config:
-            print(f"  🎯 {scenario['scenario']}:")
+            print(f"  🎯 {scenario.scenario}:")
             print(f"    Domain: {domain.value}")
-            print(f"    Sources: {scenario['sources']}")
-            print(f"    Benefits: {', '.join(scenario['benefits'])}")
+            print(f"    Sources: {scenario.sources}")
+            print(f"    Benefits: {', '.join(scenario.benefits)}")
             print(f"    Security: {config.security_level}")
             print(f"    Rate Limit: {config.rate_limits.get('requests_per_minute', 'N/A')}/min")
             print()
@@ -150,4 +168,6 @@ async def demonstrate_domain_architecture():
     print("  • Enhanced security through domain isolation")
 
 if __name__ == "__main__":
+    # Buffer the report even on a terminal instead of writing it line by line
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(demonstrate_domain_architecture()) 
\ No newline at end of file
@@ -1,10 +1,23 @@
+import argparse
 import asyncio
-from agents.strategist.dss_strategist import DSSStrategist
+import json
+import sys
+from typing import Dict
+from agents.strategist.dss_strategist import get_strategist
+from core.base_agent import AgentResponse
 
 
-async def main():
+async def main(verbose: bool = True) -> Dict[str, AgentResponse]:
+    """Run the example requests.
+    
+    Args:
+        verbose: Whether to print each response as it is reported
+        
+    Returns:
+        Agent responses keyed by request name
+    """
     # Initialize the DSS Strategist agent
-    strategist = DSSStrategist()
+    strategist = get_strategist()
     
     # Example 1: KPI Analysis
     kpi_request = {
@@ -16,10 +29,6 @@ async def main():
         }
     }
     
-    kpi_response = await strategist.process_request(kpi_request)
-    print("\nKPI Analysis Results:")
-    print(kpi_response.dict())
-    
     # Example 2: Bottleneck Detection
     bottleneck_request = {
         "type": "bottleneck_detection",
@@ -37,10 +46,6 @@ async def main():
         }
     }
     
-    bottleneck_response = await strategist.process_request(bottleneck_request)
-    print("\nBottleneck Analysis Results:")
-    print(bottleneck_response.dict())
-    
     # Example 3: Risk Assessment
     risk_request = {
         "type": "risk_assessment",
@@ -52,10 +57,6 @@ async def main():
         }
     }
     
-    risk_response = await strategist.process_request(risk_request)
-    print("\nRisk Assessment Results:")
-    print(risk_response.dict())
-    
     # Example 4: Initiative Analysis
     initiative_request = {
         "type": "initiative_analysis",
@@ -67,10 +68,52 @@ async def main():
         }
     }
     
-    initiative_response = await strategist.process_request(initiative_request)
-    print("\nInitiative Analysis Results:")
-    print(initiative_response.dict())
+    # The requests are independent, so run them concurrently
+    kpi_response, bottleneck_response, risk_response, initiative_response = await asyncio.gather(
+        strategist.process_request(kpi_request),
+        strategist.process_request(bottleneck_request),
+        strategist.process_request(risk_request),
+        strategist.process_request(initiative_request)
+    )
+    
+    responses = {
+        "kpi": kpi_response,
+        "bottleneck": bottleneck_response,
+        "risk": risk_response,
+        "initiative": initiative_response
+    }
+    
+    if verbose:
+        print("\nKPI Analysis Results:")
+        print(kpi_response.model_dump_json(indent=2))
+        
+        print("\nBottleneck Analysis Results:")
+        print(bottleneck_response.model_dump_json(indent=2))
+        
+        print("\nRisk Assessment Results:")
+        print(risk_response.model_dump_json(indent=2))
+        
+        print("\nInitiative Analysis Results:")
+        print(initiative_response.model_dump_json(indent=2))
+    
+    return responses
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the DSS Strategist example requests.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="run the requests without printing them")
+    output.add_argument("--json", action="store_true", help="print all responses as one JSON document")
+    args = parser.parse_args()
+    
+    try:
+        # uvloop is optional; when installed it runs the event loop instead of asyncio's
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
+    responses = run(main(verbose=not (args.quiet or args.json)))
+    if args.json:
+        json.dump({name: response.model_dump(mode="json") for name, response in responses.items()},
+                  sys.stdout, indent=2)
+        print()
@@ -1,39 +1,67 @@
 import asyncio
+import io
 import json
+import sys
+from _profile import stage
+from _shared import build_default_manager, cleanup, get_researcher
 from agents.researcher.researcher import Researcher
+from core.base_agent import AgentResponse
 from mcp.mcp_manager import MCPManager
-from mcp.wikipedia_server import WikipediaMCPServer
-from mcp.arxiv_server import ArxivMCPServer
 
-async def setup_mcp_servers():
-    """Set up and register MCP servers."""
-    print("🔧 Setting up MCP Servers...")
-    
-    mcp_manager = MCPManager()
-    
-    # Register Wikipedia MCP server
-    wikipedia_server = WikipediaMCPServer()
-    mcp_manager.register_server("wikipedia", wikipedia_server)
-    
-    # Register arXiv MCP server
-    arxiv_server = ArxivMCPServer()
-    mcp_manager.register_server("arxiv", arxiv_server)
-    
-    # Initialize all servers
-    await mcp_manager.initialize()
+# Reports printed for successful research responses, filled in by _report()
+MCP_RESEARCH_REPORT = """✅ MCP research completed successfully!
+📊 Found {sources} sources
+🔗 MCP sources: {mcp_servers}
+📝 Synthesis: {synthesis}...
+🎯 Key findings: {key_findings} identified
+💡 Recommendations: {recommendations} generated
+"""
+COMPREHENSIVE_RESEARCH_REPORT = """✅ Comprehensive research completed successfully!
+📊 Found {sources} total sources
+🌐 Web sources: {web_sources}
+🔗 MCP sources: {mcp_sources}
+📝 Synthesis: {synthesis}...
+🎯 Key findings: {key_findings} identified
+💡 Recommendations: {recommendations} generated
+"""
+SOURCE_RESEARCH_REPORT = """✅ {label} research completed successfully!
+📊 Found {sources} {label} sources
+📝 Synthesis: {synthesis}...
+🎯 Key findings: {key_findings} identified
+"""
+
+def _report(response: AgentResponse, template: str, label: str) -> str:
+    """Format the report for a research response.
     
-    print(f"✅ MCP Servers initialized: {mcp_manager.get_available_sources()}")
-    return mcp_manager
+    Args:
+        response: Response from the researcher
+        template: Report for a successful response
+        label: Name of the research, used in the report and on failure
+        
+    Returns:
+        The report text
+    """
+    if not response.success:
+        return f"❌ {label} research failed: {response.errors}\n"
+    
+    data = response.data
+    breakdown = data.get('source_breakdown', {})
+    return template.format_map({
+        "label": label,
+        "sources": len(data['sources']),
+        "mcp_servers": data.get('mcp_sources'),
+        "web_sources": breakdown.get('web_sources'),
+        "mcp_sources": breakdown.get('mcp_sources'),
+        "synthesis": data['synthesis'][:200],
+        "key_findings": len(data['key_findings']),
+        "recommendations": len(data.get('recommendations', []))
+    })
 
-async def test_mcp_research():
+async def test_mcp_research(researcher: Researcher) -> str:
     """Test MCP research functionality."""
-    print("\n🔍 Testing MCP Research...")
-    
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
-    
-    # Create researcher with MCP integration
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n🔍 Testing MCP Research...", file=out)
     
     # Test MCP research
     mcp_request = {
@@ -45,30 +73,18 @@ async def test_mcp_research():
         }
     }
     
-    response = await researcher.process_request(mcp_request)
+    async with stage("mcp_research"):
+        response = await researcher.process_request(mcp_request)
     
-    if response.success:
-        print("✅ MCP research completed successfully!")
-        print(f"📊 Found {len(response.data['sources'])} sources")
-        print(f"🔗 MCP sources: {response.data['mcp_sources']}")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated")
-    else:
-        print(f"❌ MCP research failed: {response.errors}")
+    out.write(_report(response, MCP_RESEARCH_REPORT, "MCP"))
     
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_comprehensive_research():
+async def test_comprehensive_research(researcher: Researcher) -> str:
     """Test comprehensive research (web + MCP)."""
-    print("\n🌐 Testing Comprehensive Research (Web + MCP)...")
-    
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
-    
-    # Create researcher with MCP integration
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n🌐 Testing Comprehensive Research (Web + MCP)...", file=out)
     
     # Test comprehensive research
     comprehensive_request = {
@@ -77,35 +93,24 @@ async def test_comprehensive_research():
             "query": "DSS service delivery optimization",
             "max_results": 3,
             "include_web": True,
-            "include_mcp": True
+            "include_mcp": True,
+            # Only add web sources if the MCP search is slow or comes up short
+            "adaptive": True
         }
     }
     
-    response = await researcher.process_request(comprehensive_request)
+    async with stage("comprehensive_research"):
+        response = await researcher.process_request(comprehensive_request)
     
-    if response.success:
-        print("✅ Comprehensive research completed successfully!")
-        print(f"📊 Found {len(response.data['sources'])} total sources")
-        print(f"🌐 Web sources: {response.data['source_breakdown']['web_sources']}")
-        print(f"🔗 MCP sources: {response.data['source_breakdown']['mcp_sources']}")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated")
-    else:
-        print(f"❌ Comprehensive research failed: {response.errors}")
+    out.write(_report(response, COMPREHENSIVE_RESEARCH_REPORT, "Comprehensive"))
     
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_wikipedia_specific():
+async def test_wikipedia_specific(researcher: Researcher) -> str:
     """Test Wikipedia-specific research."""
-    print("\n📚 Testing Wikipedia-Specific Research...")
-    
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
-    
-    # Create researcher with MCP integration
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n📚 Testing Wikipedia-Specific Research...", file=out)
     
     # Test Wikipedia research
     wikipedia_request = {
@@ -117,28 +122,18 @@ async def test_wikipedia_specific():
         }
     }
     
-    response = await researcher.process_request(wikipedia_request)
+    async with stage("mcp_search_wikipedia"):
+        response = await researcher.process_request(wikipedia_request)
     
-    if response.success:
-        print("✅ Wikipedia research completed successfully!")
-        print(f"📊 Found {len(response.data['sources'])} Wikipedia sources")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-    else:
-        print(f"❌ Wikipedia research failed: {response.errors}")
+    out.write(_report(response, SOURCE_RESEARCH_REPORT, "Wikipedia"))
     
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_arxiv_specific():
+async def test_arxiv_specific(researcher: Researcher) -> str:
     """Test arXiv-specific research."""
-    print("\n📄 Testing arXiv-Specific Research...")
-    
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
-    
-    # Create researcher with MCP integration
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n📄 Testing arXiv-Specific Research...", file=out)
     
     # Test arXiv research
     arxiv_request = {
@@ -150,48 +145,38 @@ async def test_arxiv_specific():
         }
     }
     
-    response = await researcher.process_request(arxiv_request)
+    async with stage("mcp_search_arxiv"):
+        response = await researcher.process_request(arxiv_request)
     
-    if response.success:
-        print("✅ arXiv research completed successfully!")
-        print(f"📊 Found {len(response.data['sources'])} arXiv sources")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-    else:
-        print(f"❌ arXiv research failed: {response.errors}")
+    out.write(_report(response, SOURCE_RESEARCH_REPORT, "arXiv"))
     
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_mcp_health_check():
+async def test_mcp_health_check(mcp_manager: MCPManager) -> str:
     """Test MCP server health checks."""
-    print("\n🏥 Testing MCP Health Checks...")
-    
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n🏥 Testing MCP Health Checks...", file=out)
     
     # Check health status
-    health_status = await mcp_manager.health_check()
+    async with stage("mcp_health_check"):
+        health_status = await mcp_manager.health_check()
     
-    print("✅ MCP Health Check Results:")
-    print(f"📊 Manager Status: {health_status['manager_status']}")
-    print("🔗 Server Status:")
+    print("✅ MCP Health Check Results:", file=out)
+    print(f"📊 Manager Status: {health_status['manager_status']}", file=out)
+    print("🔗 Server Status:", file=out)
     for server_name, status in health_status['servers'].items():
-        print(f"  - {server_name}: {status.get('status', 'unknown')}")
+        print(f"  - {server_name}: {status.get('status', 'unknown')}", file=out)
     
-    await mcp_manager.cleanup()
+    return out.getvalue()
 
-async def test_mcp_integration_with_strategist():
+async def test_mcp_integration_with_strategist(researcher: Researcher) -> str:
     """Test MCP research integration with the Strategist agent."""
-    print("\n🤝 Testing MCP-Strategist Integration...")
+    out = io.StringIO()
+    print("\n🤝 Testing MCP-Strategist Integration...", file=out)
     
     from agents.strategist.dss_strategist import DSSStrategist
     
-    # Set up MCP servers
-    mcp_manager = await setup_mcp_servers()
-    
-    # Create agents
-    researcher = Researcher()
     strategist = DSSStrategist()
     
     # Conduct MCP research
@@ -204,10 +189,11 @@ async def test_mcp_integration_with_strategist():
         }
     }
     
-    research_response = await researcher.process_request(mcp_request)
+    async with stage("strategist_research"):
+        research_response = await researcher.process_request(mcp_request)
     
     if research_response.success:
-        print("✅ MCP research completed for strategist")
+        print("✅ MCP research completed for strategist", file=out)
         
         # Use research findings to inform strategic analysis
         kpi_data = {
@@ -222,35 +208,57 @@ async def test_mcp_integration_with_strategist():
             "data": kpi_data
         }
         
-        strategy_response = await strategist.process_request(strategy_request)
+        async with stage("strategist_analysis"):
+            strategy_response = await strategist.process_request(strategy_request)
         
         if strategy_response.success:
-            print("✅ Strategic analysis completed using MCP research data")
-            print(f"📊 Strategy insights: {strategy_response.data['analysis'][:200]}...")
-            print(f"🔗 MCP sources used: {kpi_data['mcp_sources']}")
+            print("✅ Strategic analysis completed using MCP research data", file=out)
+            print(f"📊 Strategy insights: {str(strategy_response.data['analysis'])[:200]}...", file=out)
+            print(f"🔗 MCP sources used: {kpi_data['mcp_sources']}", file=out)
         else:
-            print(f"❌ Strategic analysis failed: {strategy_response.errors}")
+            print(f"❌ Strategic analysis failed: {strategy_response.errors}", file=out)
     else:
-        print(f"❌ MCP research failed: {research_response.errors}")
+        print(f"❌ MCP research failed: {research_response.errors}", file=out)
     
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    return out.getvalue()
 
 async def main():
     """Run all MCP integration tests."""
-    print("🚀 Starting MCP Integration Tests\n")
+    print("🚀 Starting MCP Integration Tests\n", flush=True)
     
-    # Test individual MCP functionalities
-    await test_mcp_research()
-    await test_comprehensive_research()
-    await test_wikipedia_specific()
-    await test_arxiv_specific()
-    await test_mcp_health_check()
+    # One set of initialized servers and one researcher serve every test
+    print("🔧 Setting up MCP Servers...")
+    # The MCP servers start up while the researcher is built
+    async with stage("setup"):
+        researcher = await get_researcher()
+        mcp_manager = await build_default_manager()
+    print(f"✅ MCP Servers initialized: {mcp_manager.get_available_sources()}")
     
-    # Test integration with other agents
-    await test_mcp_integration_with_strategist()
+    try:
+        # The individual MCP tests are independent, so run them concurrently
+        reports = await asyncio.gather(
+            test_mcp_research(researcher),
+            test_comprehensive_research(researcher),
+            test_wikipedia_specific(researcher),
+            test_arxiv_specific(researcher),
+            test_mcp_health_check(mcp_manager),
+            return_exceptions=True
+        )
+        for report in reports:
+            if isinstance(report, Exception):
+                print(f"\n❌ Test raised an error: {report!r}")
+            else:
+                print(report, end="")
+        
+        # Test integration with other agents
+        print(await test_mcp_integration_with_strategist(researcher), end="")
+    finally:
+        await cleanup()
     
     print("\n🎉 All MCP Integration tests completed!")
 
 if __name__ == "__main__":
+    # Each test's report is written in one piece, so block-buffer stdout
+    # rather than issuing a write per line on a terminal
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main()) 
\ No newline at end of file
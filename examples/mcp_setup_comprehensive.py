@@ -1,8 +1,5 @@
 import asyncio
-from agents.researcher.researcher import Researcher
-from mcp.mcp_manager import MCPManager
-from mcp.wikipedia_server import WikipediaMCPServer
-from mcp.arxiv_server import ArxivMCPServer
+from _shared import build_default_manager, cleanup, format_source_details, get_researcher
 
 async def research_mcp_setup_comprehensive():
     """Comprehensive research on MCP setup using both web and MCP sources."""
@@ -11,15 +8,11 @@ async def research_mcp_setup_comprehensive():
     
     # Set up MCP servers
     print("🔧 Setting up MCP Servers...")
-    mcp_manager = MCPManager()
-    mcp_manager.register_server("wikipedia", WikipediaMCPServer())
-    mcp_manager.register_server("arxiv", ArxivMCPServer())
-    await mcp_manager.initialize()
+    # Create researcher; the MCP servers start up while it is built
+    researcher = await get_researcher()
+    mcp_manager = await build_default_manager()
     print(f"✅ MCP Servers initialized: {mcp_manager.get_available_sources()}")
 
-    # Create researcher
-    researcher = Researcher()
-
     # Define the comprehensive research query
     comprehensive_request = {
         "type": "comprehensive_research",
@@ -61,19 +54,13 @@ async def research_mcp_setup_comprehensive():
         print("\n" + "=" * 80)
         print("📚 SOURCE DETAILS")
         print("=" * 80)
-        for i, source in enumerate(response.data['sources'], 1):
-            print(f"{i}. {source['title']}")
-            print(f"   Source: {source['source_type']}")
-            print(f"   Relevance: {source['relevance_score']:.2f}")
-            print(f"   URL: {source.get('url', 'N/A')}")
-            print()
+        print(format_source_details(response.data['sources']), end="")
             
     else:
         print(f"❌ Comprehensive research failed: {response.errors}")
 
     # Cleanup
-    await mcp_manager.cleanup()
-    await researcher.cleanup()
+    await cleanup()
     print("🧹 Cleanup completed")
 
 if __name__ == "__main__":
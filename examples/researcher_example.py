@@ -1,12 +1,13 @@
 import asyncio
+import io
 import json
 from agents.researcher.researcher import Researcher
 
-async def test_web_research():
+async def test_web_research(researcher: Researcher) -> str:
     """Test web research functionality."""
-    print("🔍 Testing Web Research...")
-    
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("🔍 Testing Web Research...", file=out)
     
     # Test web research for DSS-related topic
     research_request = {
@@ -23,21 +24,21 @@ async def test_web_research():
     response = await researcher.process_request(research_request)
     
     if response.success:
-        print("✅ Web research completed successfully!")
-        print(f"📊 Found {len(response.data['sources'])} relevant sources")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated")
+        print("✅ Web research completed successfully!", file=out)
+        print(f"📊 Found {len(response.data['sources'])} relevant sources", file=out)
+        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...", file=out)
+        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified", file=out)
+        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated", file=out)
     else:
-        print(f"❌ Web research failed: {response.errors}")
+        print(f"❌ Web research failed: {response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_document_analysis():
+async def test_document_analysis(researcher: Researcher) -> str:
     """Test document analysis functionality."""
-    print("\n📄 Testing Document Analysis...")
-    
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n📄 Testing Document Analysis...", file=out)
     
     # Sample documents for analysis
     documents = [
@@ -73,20 +74,20 @@ async def test_document_analysis():
     response = await researcher.process_request(analysis_request)
     
     if response.success:
-        print("✅ Document analysis completed successfully!")
-        print(f"📊 Analyzed {len(response.data['individual_analyses'])} documents")
-        print(f"🔍 Cross-document synthesis: {response.data['cross_document_synthesis'][:200]}...")
-        print(f"💡 Key insights: {len(response.data['key_insights'])} identified")
+        print("✅ Document analysis completed successfully!", file=out)
+        print(f"📊 Analyzed {len(response.data['individual_analyses'])} documents", file=out)
+        print(f"🔍 Cross-document synthesis: {response.data['cross_document_synthesis'][:200]}...", file=out)
+        print(f"💡 Key insights: {len(response.data['key_insights'])} identified", file=out)
     else:
-        print(f"❌ Document analysis failed: {response.errors}")
+        print(f"❌ Document analysis failed: {response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_policy_research():
+async def test_policy_research(researcher: Researcher) -> str:
     """Test policy research functionality."""
-    print("\n📋 Testing Policy Research...")
-    
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n📋 Testing Policy Research...", file=out)
     
     policy_request = {
         "type": "policy_research",
@@ -99,22 +100,22 @@ async def test_policy_research():
     response = await researcher.process_request(policy_request)
     
     if response.success:
-        print("✅ Policy research completed successfully!")
-        print(f"📊 Policy topic: {response.data['policy_topic']}")
-        print(f"🏛️ Jurisdiction: {response.data['jurisdiction']}")
-        print(f"📝 Analysis: {response.data['analysis'][:200]}...")
-        print(f"⚖️ Key implications: {len(response.data['key_implications'])} identified")
-        print(f"💡 Policy recommendations: {len(response.data['recommendations'])} generated")
+        print("✅ Policy research completed successfully!", file=out)
+        print(f"📊 Policy topic: {response.data['policy_topic']}", file=out)
+        print(f"🏛️ Jurisdiction: {response.data['jurisdiction']}", file=out)
+        print(f"📝 Analysis: {response.data['analysis'][:200]}...", file=out)
+        print(f"⚖️ Key implications: {len(response.data['key_implications'])} identified", file=out)
+        print(f"💡 Policy recommendations: {len(response.data['recommendations'])} generated", file=out)
     else:
-        print(f"❌ Policy research failed: {response.errors}")
+        print(f"❌ Policy research failed: {response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_best_practices_research():
+async def test_best_practices_research(researcher: Researcher) -> str:
     """Test best practices research functionality."""
-    print("\n⭐ Testing Best Practices Research...")
-    
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n⭐ Testing Best Practices Research...", file=out)
     
     practices_request = {
         "type": "best_practices_research",
@@ -127,22 +128,22 @@ async def test_best_practices_research():
     response = await researcher.process_request(practices_request)
     
     if response.success:
-        print("✅ Best practices research completed successfully!")
-        print(f"📊 Practice area: {response.data['practice_area']}")
-        print(f"🏢 Context: {response.data['context']}")
-        print(f"📝 Best practices: {response.data['best_practices'][:200]}...")
-        print(f"🎯 Key practices: {len(response.data['key_practices'])} identified")
-        print(f"📋 Implementation guide: {len(response.data['implementation_guide'])} characters")
+        print("✅ Best practices research completed successfully!", file=out)
+        print(f"📊 Practice area: {response.data['practice_area']}", file=out)
+        print(f"🏢 Context: {response.data['context']}", file=out)
+        print(f"📝 Best practices: {response.data['best_practices'][:200]}...", file=out)
+        print(f"🎯 Key practices: {len(response.data['key_practices'])} identified", file=out)
+        print(f"📋 Implementation guide: {len(response.data['implementation_guide'])} characters", file=out)
     else:
-        print(f"❌ Best practices research failed: {response.errors}")
+        print(f"❌ Best practices research failed: {response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_research_synthesis():
+async def test_research_synthesis(researcher: Researcher) -> str:
     """Test research synthesis functionality."""
-    print("\n🔬 Testing Research Synthesis...")
-    
-    researcher = Researcher()
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n🔬 Testing Research Synthesis...", file=out)
     
     # Sample research sources
     sources = [
@@ -171,24 +172,25 @@ async def test_research_synthesis():
     response = await researcher.process_request(synthesis_request)
     
     if response.success:
-        print("✅ Research synthesis completed successfully!")
-        print(f"🔍 Research question: {response.data['research_question']}")
-        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...")
-        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified")
-        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated")
+        print("✅ Research synthesis completed successfully!", file=out)
+        print(f"🔍 Research question: {response.data['research_question']}", file=out)
+        print(f"📝 Synthesis: {response.data['synthesis'][:200]}...", file=out)
+        print(f"🎯 Key findings: {len(response.data['key_findings'])} identified", file=out)
+        print(f"💡 Recommendations: {len(response.data['recommendations'])} generated", file=out)
     else:
-        print(f"❌ Research synthesis failed: {response.errors}")
+        print(f"❌ Research synthesis failed: {response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
-async def test_researcher_integration():
+async def test_researcher_integration(researcher: Researcher) -> str:
     """Test integration between Researcher and Strategist agents."""
-    print("\n🤝 Testing Researcher-Strategist Integration...")
+    # Collected so concurrent tests do not interleave their output
+    out = io.StringIO()
+    print("\n🤝 Testing Researcher-Strategist Integration...", file=out)
     
-    from agents.strategist.dss_strategist import DSSStrategist
+    from agents.strategist.dss_strategist import get_strategist
     
-    researcher = Researcher()
-    strategist = DSSStrategist()
+    strategist = get_strategist()
     
     # First, conduct research
     research_request = {
@@ -205,7 +207,7 @@ async def test_researcher_integration():
     research_response = await researcher.process_request(research_request)
     
     if research_response.success:
-        print("✅ Research completed for strategist")
+        print("✅ Research completed for strategist", file=out)
         
         # Use research findings to inform strategic analysis
         kpi_data = {
@@ -222,28 +224,41 @@ async def test_researcher_integration():
         strategy_response = await strategist.process_request(strategy_request)
         
         if strategy_response.success:
-            print("✅ Strategic analysis completed using research data")
-            print(f"📊 Strategy insights: {strategy_response.data['analysis'][:200]}...")
+            print("✅ Strategic analysis completed using research data", file=out)
+            print(f"📊 Strategy insights: {str(strategy_response.data['analysis'])[:200]}...", file=out)
         else:
-            print(f"❌ Strategic analysis failed: {strategy_response.errors}")
+            print(f"❌ Strategic analysis failed: {strategy_response.errors}", file=out)
     else:
-        print(f"❌ Research failed: {research_response.errors}")
+        print(f"❌ Research failed: {research_response.errors}", file=out)
     
-    await researcher.cleanup()
+    return out.getvalue()
 
 async def main():
     """Run all researcher tests."""
     print("🚀 Starting Researcher Agent Tests\n")
     
-    # Test individual functionalities
-    await test_web_research()
-    await test_document_analysis()
-    await test_policy_research()
-    await test_best_practices_research()
-    await test_research_synthesis()
-    
-    # Test integration
-    await test_researcher_integration()
+    # One researcher, and its pooled HTTP session, serves every test
+    researcher = Researcher()
+    try:
+        # The individual tests are independent, so run them concurrently
+        reports = await asyncio.gather(
+            test_web_research(researcher),
+            test_document_analysis(researcher),
+            test_policy_research(researcher),
+            test_best_practices_research(researcher),
+            test_research_synthesis(researcher),
+            return_exceptions=True
+        )
+        for report in reports:
+            if isinstance(report, Exception):
+                print(f"\n❌ Test raised an error: {report!r}")
+            else:
+                print(report, end="")
+        
+        # Test integration
+        print(await test_researcher_integration(researcher), end="")
+    finally:
+        await researcher.cleanup()
     
     print("\n🎉 All Researcher Agent tests completed!")
 
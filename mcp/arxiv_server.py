@@ -3,16 +3,38 @@ arXiv MCP Server implementation.
 Provides access to academic papers through the arXiv API.
 """
 
+import asyncio
+import io
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
 from pydantic import BaseModel
+import aiohttp
+from core.text_search import terms_pattern
 from .base_server import BaseMCPServer, MCPResource
 from datetime import datetime
-import xml.etree.ElementTree as ET
+from lxml import etree
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Atom tags in Clark notation, so lookups compare tags without resolving prefixes
+ATOM = '{http://www.w3.org/2005/Atom}'
+TAG_ENTRY = ATOM + 'entry'
+TAG_TITLE = ATOM + 'title'
+TAG_NAME = ATOM + 'name'
+TAG_SUMMARY = ATOM + 'summary'
+TAG_ID = ATOM + 'id'
+TAG_LINK = ATOM + 'link'
+TAG_PUBLISHED = ATOM + 'published'
+
+# arXiv throttles bursts, so cap in-flight queries well below the base default
+DEFAULT_ARXIV_MAX_CONCURRENCY = 3
+
 class ArxivSearchResult(BaseModel):
     """Model for arXiv search results."""
     title: str
@@ -38,13 +60,61 @@ class ArxivPaper(BaseModel):
 class ArxivMCPServer(BaseMCPServer):
     """MCP server for arXiv content access."""
     
-    def __init__(self):
-        """Initialize the arXiv MCP server."""
+    # arXiv is rate limited, and identical in-flight requests are coalesced,
+    # so a hedged duplicate would never go out faster than the original
+    HEDGE_SEARCHES = False
+    
+    # Seconds a search result stays reusable
+    SEARCH_CACHE_TTL = 3600.0
+    # Seconds fetched paper metadata stays reusable
+    CONTENT_CACHE_TTL = 24 * 3600.0
+    # Maximum number of entries in each cache
+    CACHE_SIZE = 512
+    # Threads parsing Atom feeds off the event loop
+    PARSE_WORKERS = 2
+    # Fixed resource listing, validated once rather than on every call
+    _STATIC_RESOURCES = (
+        MCPResource(
+            uri="arxiv://recent",
+            name="Recent Papers",
+            description="Recently published arXiv papers",
+            mime_type="application/json"
+        ),
+        MCPResource(
+            uri="arxiv://popular",
+            name="Popular Papers",
+            description="Popular arXiv papers",
+            mime_type="application/json"
+        )
+    )
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None,
+                 max_concurrent_requests: Optional[int] = None,
+                 min_request_interval: Optional[float] = None):
+        """Initialize the arXiv MCP server.
+        
+        Args:
+            session: Optional HTTP session shared with other MCP servers
+            max_concurrent_requests: Maximum in-flight arXiv queries (default:
+                the ARXIV_MAX_CONCURRENCY environment variable, or 3)
+            min_request_interval: Minimum seconds between query starts
+                (default: the ARXIV_MIN_REQUEST_INTERVAL environment variable,
+                or 0; arXiv's API policy asks for 3)
+        """
         super().__init__(
             name="arXiv MCP Server",
-            description="Provides access to arXiv academic papers and search functionality"
+            description="Provides access to arXiv academic papers and search functionality",
+            session=session,
+            max_concurrent_requests=max_concurrent_requests or int(
+                os.getenv("ARXIV_MAX_CONCURRENCY", str(DEFAULT_ARXIV_MAX_CONCURRENCY))),
+            min_request_interval=(min_request_interval if min_request_interval is not None
+                                  else float(os.getenv("ARXIV_MIN_REQUEST_INTERVAL", "0")))
         )
         self.base_url = "http://export.arxiv.org/api/query"
+        self._search_cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._content_cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
         
     async def _initialize_server(self):
         """Initialize arXiv-specific resources."""
@@ -55,7 +125,7 @@ class ArxivMCPServer(BaseMCPServer):
                 "start": 0,
                 "max_results": 1
             }
-            await self._make_request(self.base_url, params=test_params)
+            await self._make_raw_request(self.base_url, params=test_params)
             logger.info("arXiv API connection successful")
         except Exception as e:
             logger.warning(f"arXiv API connection test failed: {e}")
@@ -70,6 +140,16 @@ class ArxivMCPServer(BaseMCPServer):
         Returns:
             List of search results
         """
+        key = (query, max_results)
+        cached = self._cache_get(self._search_cache, key, self.SEARCH_CACHE_TTL)
+        if cached is not None:
+            return list(cached)
+        
+        return list(await self._coalesced(("search",) + key,
+                                          lambda: self._search_uncached(query, max_results)))
+    
+    async def _search_uncached(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Run an arXiv search against the API and cache its results."""
         try:
             params = {
                 "search_query": query,
@@ -79,13 +159,13 @@ class ArxivMCPServer(BaseMCPServer):
                 "sortOrder": "descending"
             }
             
-            response = await self._make_request(
+            response = await self._make_raw_request(
                 url=self.base_url,
                 params=params
             )
             
             # Parse XML response
-            results = self._parse_arxiv_response(response)
+            results = await self._parse_in_pool(response)
             
             # Calculate relevance scores
             for result in results:
@@ -93,6 +173,9 @@ class ArxivMCPServer(BaseMCPServer):
                     result["title"] + " " + result["abstract"], query
                 )
             
+            # Empty results are not cached, since a failed request also yields none
+            if results:
+                self._cache_put(self._search_cache, (query, max_results), results)
             return results
             
         except Exception as e:
@@ -108,88 +191,188 @@ class ArxivMCPServer(BaseMCPServer):
         Returns:
             Paper content or None if not found
         """
+        return (await self.get_contents([resource_id])).get(resource_id)
+    
+    async def get_contents(self, resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the content of several arXiv papers in one API call.
+        
+        Args:
+            resource_ids: arXiv IDs (e.g., ["2103.12345", "2104.00001v2"])
+            
+        Returns:
+            Paper content by requested ID; IDs that were not found are left out
+        """
+        contents: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for resource_id in dict.fromkeys(resource_ids):
+            cached = self._cache_get(self._content_cache, resource_id, self.CONTENT_CACHE_TTL)
+            if cached is not None:
+                contents[resource_id] = cached
+            else:
+                missing.append(resource_id)
+        if missing:
+            contents.update(await self._coalesced(("contents",) + tuple(missing),
+                                                  lambda: self._fetch_contents(missing)))
+        return contents
+    
+    async def _fetch_contents(self, missing: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch papers from the API in one query and cache each one found."""
+        contents: Dict[str, Dict[str, Any]] = {}
         try:
-            # Search for the specific paper
+            # arXiv looks up a comma-separated id_list in a single query
             params = {
-                "id_list": resource_id,
+                "id_list": ",".join(missing),
                 "start": 0,
-                "max_results": 1
+                "max_results": len(missing)
             }
             
-            response = await self._make_request(
+            response = await self._make_raw_request(
                 url=self.base_url,
                 params=params
             )
             
             # Parse XML response
-            papers = self._parse_arxiv_response(response)
+            papers = {
+                self._base_id(paper["arxiv_id"]): paper
+                for paper in await self._parse_in_pool(response)
+                if paper.get("arxiv_id")
+            }
             
-            if papers:
-                paper = papers[0]
-                return {
+            for resource_id in missing:
+                paper = papers.get(self._base_id(resource_id))
+                if paper is None:
+                    continue
+                content = {
                     "title": paper["title"],
                     "authors": paper["authors"],
                     "abstract": paper["abstract"],
                     "arxiv_id": paper["arxiv_id"],
                     "categories": paper["categories"],
-                    "published_date": paper["published_date"],
+                    "published_date": paper.get("published_date"),
                     "pdf_url": f"https://arxiv.org/pdf/{paper['arxiv_id']}",
                     "doi": paper.get("doi")
                 }
-            
-            return None
+                self._cache_put(self._content_cache, resource_id, content)
+                contents[resource_id] = content
             
         except Exception as e:
-            logger.error(f"Failed to get arXiv content for {resource_id}: {e}")
+            logger.error(f"Failed to get arXiv content for {', '.join(missing)}: {e}")
+        
+        return contents
+    
+    async def _coalesced(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch, or wait for the identical fetch already in flight.
+        
+        Args:
+            key: Identifies the request, e.g. ("search", query, max_results)
+            fetch: Starts the request when none is in flight for key
+            
+        Returns:
+            The fetch's result, shared by every concurrent caller
+        """
+        request = self._inflight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(fetch())
+            self._inflight[key] = request
+            request.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others' request
+        return await asyncio.shield(request)
+    
+    @staticmethod
+    def _base_id(arxiv_id: str) -> str:
+        """Strip the archive prefix and version suffix so IDs from requests and feeds compare equal."""
+        return re.sub(r"v\d+$", "", arxiv_id.split('/')[-1])
+    
+    def _cache_get(self, cache: "OrderedDict[Hashable, tuple]", key: Hashable,
+                   ttl: float) -> Optional[Any]:
+        """Get a cached value, dropping it if older than ttl seconds."""
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        stored_at, value = cached
+        if time.monotonic() - stored_at >= ttl:
+            del cache[key]
             return None
+        cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, cache: "OrderedDict[Hashable, tuple]", key: Hashable, value: Any):
+        """Cache a value, evicting the least recently used entry when full."""
+        cache[key] = (time.monotonic(), value)
+        cache.move_to_end(key)
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
     
-    def _parse_arxiv_response(self, response: str) -> List[Dict[str, Any]]:
-        """Parse arXiv XML response."""
+    def cache_clear(self):
+        """Drop all cached search results and paper metadata."""
+        self._search_cache.clear()
+        self._content_cache.clear()
+    
+    async def _parse_in_pool(self, response: bytes) -> List[Dict[str, Any]]:
+        """Parse an arXiv response on the parse pool.
+        
+        Large feeds take long enough to parse that doing it on the event loop
+        would stall every other in-flight request.
+        """
+        if self._parse_pool is None:
+            self._parse_pool = ThreadPoolExecutor(
+                max_workers=self.PARSE_WORKERS, thread_name_prefix="arxiv-xml"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._parse_pool, self._parse_arxiv_response, response
+        )
+    
+    def _parse_arxiv_response(self, response: bytes) -> List[Dict[str, Any]]:
+        """Parse arXiv XML response.
+        
+        Entries are streamed with lxml's iterparse and cleared once read, so
+        memory stays flat however many results the feed holds.
+        """
         try:
-            root = ET.fromstring(response)
-            
-            # Define namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
             results = []
-            for entry in root.findall('.//atom:entry', ns):
+            for _, entry in etree.iterparse(io.BytesIO(response), tag=TAG_ENTRY):
                 paper = {}
                 
                 # Extract title
-                title_elem = entry.find('atom:title', ns)
+                title_elem = entry.find(TAG_TITLE)
                 if title_elem is not None:
                     paper["title"] = title_elem.text.strip()
                 
                 # Extract authors
                 authors = []
-                for author in entry.findall('.//atom:name', ns):
+                for author in entry.iter(TAG_NAME):
                     if author.text:
                         authors.append(author.text.strip())
                 paper["authors"] = authors
                 
                 # Extract abstract
-                summary_elem = entry.find('atom:summary', ns)
+                summary_elem = entry.find(TAG_SUMMARY)
                 if summary_elem is not None:
                     paper["abstract"] = summary_elem.text.strip()
                 
                 # Extract arXiv ID
-                id_elem = entry.find('atom:id', ns)
+                id_elem = entry.find(TAG_ID)
                 if id_elem is not None:
                     paper["arxiv_id"] = id_elem.text.split('/')[-1]
                 
                 # Extract categories
                 categories = []
-                for link in entry.findall('.//atom:link', ns):
+                for link in entry.iter(TAG_LINK):
                     if link.get('title') == 'pdf':
                         categories.append(link.get('title', ''))
                 paper["categories"] = categories
                 
                 # Extract dates
-                published_elem = entry.find('atom:published', ns)
+                published_elem = entry.find(TAG_PUBLISHED)
                 if published_elem is not None:
                     paper["published_date"] = published_elem.text
                 
                 results.append(paper)
+                
+                # Free the parsed entry and the siblings already read before it
+                entry.clear()
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
             
             return results
             
@@ -200,28 +383,22 @@ class ArxivMCPServer(BaseMCPServer):
     def _calculate_relevance(self, text: str, query: str) -> float:
         """Calculate relevance score for search result."""
         query_terms = query.lower().split()
-        text_lower = text.lower()
-        
-        score = 0
-        for term in query_terms:
-            if term in text_lower:
-                score += 1
+        if not query_terms:
+            return 0.0
         
-        return min(score / len(query_terms), 1.0) if query_terms else 0.0
+        # One case-insensitive scan over the text for all terms, counting
+        # every occurrence; the pattern is compiled once per query
+        pattern = terms_pattern(tuple(query_terms))
+        score = sum(1 for _ in pattern.finditer(text))
+        return min(score / len(query_terms), 1.0)
+    
+    async def cleanup(self):
+        """Clean up server resources, including the parse pool."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
+        await super().cleanup()
     
     async def list_resources(self, query: Optional[str] = None) -> List[MCPResource]:
         """List available arXiv resources."""
-        return [
-            MCPResource(
-                uri="arxiv://recent",
-                name="Recent Papers",
-                description="Recently published arXiv papers",
-                mime_type="application/json"
-            ),
-            MCPResource(
-                uri="arxiv://popular",
-                name="Popular Papers",
-                description="Popular arXiv papers",
-                mime_type="application/json"
-            )
-        ] 
\ No newline at end of file
+        return list(self._STATIC_RESOURCES)
@@ -6,16 +6,34 @@ Provides the foundation for Wikipedia, arXiv, and other MCP servers.
 import asyncio
 import json
 import logging
+import random
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Union
 from pydantic import BaseModel, Field
 import aiohttp
 from datetime import datetime
 
+try:
+    from orjson import dumps as _orjson_dumps, loads as json_loads
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    from json import dumps as json_dumps, loads as json_loads
+else:
+    def json_dumps(obj: Any) -> str:
+        """Serialize a request body to a JSON string with orjson."""
+        return _orjson_dumps(obj).decode("utf-8")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 64  # In-flight requests per server
+MAX_REQUEST_ATTEMPTS = 5
+RETRY_BACKOFF_BASE = 0.5  # seconds, doubled on each retry
+RETRY_BACKOFF_MAX = 10.0
+RETRY_JITTER = 0.25  # seconds of random delay added so retries do not arrive in lockstep
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 class MCPRequest(BaseModel):
     """Base model for MCP requests."""
     method: str
@@ -40,26 +58,71 @@ class MCPResource(BaseModel):
 class BaseMCPServer(ABC):
     """Base class for MCP servers providing external data access."""
     
-    def __init__(self, name: str, description: str):
+    # Whether the manager may send duplicate searches to cut tail latency
+    HEDGE_SEARCHES = True
+    
+    def __init__(self, name: str, description: str,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+                 min_request_interval: float = 0.0):
         """Initialize the MCP server.
         
         Args:
             name: Name of the MCP server
             description: Description of the server's capabilities
+            session: Optional HTTP session shared with other servers so their
+                requests reuse pooled keep-alive connections. The caller owns
+                it and closes it; by default the server creates its own.
+            max_concurrent_requests: Maximum number of requests this server
+                has in flight at once; further requests wait their turn
+            min_request_interval: Minimum seconds between the starts of two
+                requests, for APIs that publish a rate policy (default: 0,
+                no spacing)
         """
         self.name = name
         self.description = description
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.is_initialized = False
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._min_request_interval = min_request_interval
+        self._next_request_at = 0.0
+        # Set from Retry-After so every request to the API pauses, not just the throttled one
+        self._resume_at = 0.0
         
     async def initialize(self):
-        """Initialize the MCP server and create HTTP session."""
+        """Initialize the MCP server and create HTTP session.
+        
+        An owned session keeps connections alive and caches DNS lookups, so
+        repeat requests to the API reuse the TCP/TLS connection.
+        """
         if not self.is_initialized:
-            self.session = aiohttp.ClientSession()
+            if self.session is None:
+                connector = aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=True
+                )
+                self.session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=30, connect=5, sock_read=25),
+                    json_serialize=json_dumps
+                )
             await self._initialize_server()
             self.is_initialized = True
             logger.info(f"Initialized MCP server: {self.name}")
     
+    @property
+    def allows_hedging(self) -> bool:
+        """Whether searches of this server may be hedged.
+        
+        Servers that space their requests for a rate policy are never hedged,
+        since a duplicate request would only add load to a throttled API.
+        """
+        return self.HEDGE_SEARCHES and self._min_request_interval <= 0
+    
     @abstractmethod
     async def _initialize_server(self):
         """Initialize server-specific resources."""
@@ -116,7 +179,7 @@ class BaseMCPServer(ABC):
     
     async def cleanup(self):
         """Clean up server resources."""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
         self.is_initialized = False
@@ -126,7 +189,7 @@ class BaseMCPServer(ABC):
                           headers: Optional[Dict[str, str]] = None,
                           params: Optional[Dict[str, Any]] = None,
                           data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make HTTP request with error handling.
+        """Make HTTP request to a JSON API with error handling.
         
         Args:
             url: Request URL
@@ -138,25 +201,108 @@ class BaseMCPServer(ABC):
         Returns:
             Response data
             
+        Raises:
+            Exception: If request fails
+        """
+        return json_loads(await self._make_raw_request(url, method, headers, params, data))
+    
+    async def _make_raw_request(self, url: str, method: str = "GET",
+                                headers: Optional[Dict[str, str]] = None,
+                                params: Optional[Dict[str, Any]] = None,
+                                data: Optional[Dict[str, Any]] = None) -> bytes:
+        """Make HTTP request with error handling and return the raw body.
+        
+        Use this for XML or HTML responses, which parsers read straight from
+        bytes without decoding to str first.
+        
+        Requests are capped at ``max_concurrent_requests`` in flight and
+        started at least ``min_request_interval`` apart. Throttled (429) and
+        5xx responses, server disconnects and timeouts are retried with
+        exponential backoff, honoring the Retry-After header when present.
+        Other connection errors, such as an unreachable host, are raised at
+        once.
+        
+        Args:
+            url: Request URL
+            method: HTTP method
+            headers: Request headers
+            params: Query parameters
+            data: Request data
+            
+        Returns:
+            Response body
+            
         Raises:
             Exception: If request fails
         """
         if not self.session:
             raise Exception("MCP server not initialized")
         
-        try:
-            async with self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=data
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except Exception as e:
-            logger.error(f"Request failed for {url}: {str(e)}")
-            raise
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            final_attempt = attempt == MAX_REQUEST_ATTEMPTS - 1
+            pause = self._resume_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            
+            try:
+                async with self._request_semaphore:
+                    await self._wait_for_request_slot()
+                    async with self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        json=data
+                    ) as response:
+                        if response.status in RETRYABLE_STATUSES and not final_attempt:
+                            delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                            logger.warning(f"Request to {url} returned {response.status}, "
+                                           f"retrying in {delay:.1f}s")
+                            if response.status == 429:
+                                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                        else:
+                            response.raise_for_status()
+                            return await response.read()
+            except (aiohttp.ServerDisconnectedError, asyncio.TimeoutError) as e:
+                if final_attempt:
+                    logger.error(f"Request failed for {url}: {str(e)}")
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e!r}), retrying in {delay:.1f}s")
+            except Exception as e:
+                logger.error(f"Request failed for {url}: {str(e)}")
+                raise
+            
+            await asyncio.sleep(delay)
+    
+    async def _wait_for_request_slot(self):
+        """Wait until ``min_request_interval`` has passed since the last request started."""
+        if self._min_request_interval <= 0:
+            return
+        now = time.monotonic()
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        start_at = max(now, self._next_request_at)
+        self._next_request_at = start_at + self._min_request_interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+    
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the wait before retrying a request.
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            retry_after: Retry-After header value, if the server sent one
+            
+        Returns:
+            Seconds to wait
+        """
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), RETRY_BACKOFF_MAX)
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+        return min(RETRY_BACKOFF_BASE * 2 ** attempt, RETRY_BACKOFF_MAX) + random.uniform(0, RETRY_JITTER)
     
     def _format_response(self, data: Any, error: Optional[str] = None) -> MCPResponse:
         """Format response for MCP protocol.
@@ -4,8 +4,10 @@ Supports specialized MCP server configurations for different agent groups.
 """
 
 import asyncio
+import bisect
 import logging
-from typing import Dict, Any, List, Optional, Set
+import time
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Set, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 from .mcp_manager import MCPManager, MCPSearchResult
@@ -46,6 +48,11 @@ class DomainMCPServer(BaseModel):
 class DomainManager:
     """Manager for domain-specific MCP configurations and agent segmentation."""
     
+    # Seconds a domain search result stays reusable
+    SEARCH_CACHE_TTL = 300.0
+    # Maximum number of cached domain searches
+    SEARCH_CACHE_SIZE = 256
+    
     def __init__(self):
         """Initialize the domain manager."""
         self.domains: Dict[AgentDomain, DomainConfig] = {}
@@ -53,6 +60,7 @@ class DomainManager:
         self.global_mcp_manager = MCPManager()
         self.domain_managers: Dict[AgentDomain, MCPManager] = {}
         self.is_initialized = False
+        self._search_cache: Dict[Tuple, Tuple[float, List[MCPSearchResult]]] = {}
         
     def register_domain(self, domain: AgentDomain, config: DomainConfig):
         """Register a new agent domain with its configuration.
@@ -63,8 +71,21 @@ class DomainManager:
         """
         self.domains[domain] = config
         self.domain_servers[domain] = []
+        self.cache_clear()
         logger.info(f"Registered domain: {domain.value}")
     
+    def register_domains(self, configs: Mapping[AgentDomain, DomainConfig]):
+        """Register several agent domains at once.
+        
+        Args:
+            configs: Domain configurations keyed by domain
+        """
+        self.domains.update(configs)
+        for domain in configs:
+            self.domain_servers[domain] = []
+        self.cache_clear()
+        logger.info(f"Registered domains: {', '.join(domain.value for domain in configs)}")
+    
     def register_server_for_domain(self, domain: AgentDomain, server_name: str, 
                                  server: BaseMCPServer, priority: int = 1,
                                  custom_config: Optional[Dict[str, Any]] = None):
@@ -96,13 +117,21 @@ class DomainManager:
             priority=priority,
             custom_config=custom_config or {}
         )
-        self.domain_servers[domain].append(domain_server)
-        
-        # Sort by priority
-        self.domain_servers[domain].sort(key=lambda x: x.priority, reverse=True)
+        # Insert in priority order (highest first, ties in registration order)
+        bisect.insort(self.domain_servers[domain], domain_server, key=lambda x: -x.priority)
+        self.cache_clear()
         
         logger.info(f"Registered server {server_name} for domain {domain.value} (priority: {priority})")
     
+    def register_servers(self, entries: Iterable[Tuple[AgentDomain, str, BaseMCPServer, int]]):
+        """Register several MCP servers for their domains at once.
+        
+        Args:
+            entries: (domain, server_name, server, priority) tuples
+        """
+        for domain, server_name, server, priority in entries:
+            self.register_server_for_domain(domain, server_name, server, priority)
+    
     async def initialize_domain(self, domain: AgentDomain):
         """Initialize MCP servers for a specific domain.
         
@@ -123,12 +152,12 @@ class DomainManager:
         
         logger.info("Initializing Domain Manager...")
         
-        # Initialize global manager
+        # Initialize global manager; every domain server is registered with it,
+        # so this starts all servers concurrently before the domain managers run
         await self.global_mcp_manager.initialize()
         
         # Initialize all domain managers
-        for domain in self.domain_managers:
-            await self.initialize_domain(domain)
+        await asyncio.gather(*(self.initialize_domain(domain) for domain in self.domain_managers))
         
         self.is_initialized = True
         logger.info("Domain Manager initialization complete")
@@ -147,6 +176,27 @@ class DomainManager:
         Returns:
             List of search results from domain-specific sources
         """
+        # Repeat searches within SEARCH_CACHE_TTL are answered from memory
+        key = (domain, query, max_results, tuple(sources) if sources is not None else None)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            stored_at, results = cached
+            if time.monotonic() - stored_at < self.SEARCH_CACHE_TTL:
+                return list(results)
+            del self._search_cache[key]
+        
+        results = await self._search_domain_uncached(domain, query, max_results, sources)
+        
+        # Empty results are not cached, since failed sources also yield none
+        if results:
+            if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+                self._search_cache.pop(next(iter(self._search_cache)))
+            self._search_cache[key] = (time.monotonic(), results)
+        return list(results)
+    
+    async def _search_domain_uncached(self, domain: AgentDomain, query: str, max_results: int,
+                                      sources: Optional[List[str]]) -> List[MCPSearchResult]:
+        """Run a domain search against the MCP servers."""
         if not self.is_initialized:
             await self.initialize_all()
         
@@ -162,6 +212,10 @@ class DomainManager:
         
         return await self.domain_managers[domain].search_all(query, max_results, sources)
     
+    def cache_clear(self):
+        """Drop all cached domain search results."""
+        self._search_cache.clear()
+    
     async def get_content_domain(self, domain: AgentDomain, source: str, 
                                resource_id: str) -> Optional[Dict[str, Any]]:
         """Get content from a domain-specific MCP source.
@@ -228,15 +282,16 @@ class DomainManager:
         Returns:
             Health status for all domains
         """
-        health_status = {
-            "global_manager": await self.global_mcp_manager.health_check(),
-            "domains": {}
-        }
-        
-        for domain in self.domain_managers:
-            health_status["domains"][domain.value] = await self.health_check_domain(domain)
+        domains = list(self.domain_managers)
+        global_status, *domain_statuses = await asyncio.gather(
+            self.global_mcp_manager.health_check(),
+            *(self.health_check_domain(domain) for domain in domains)
+        )
         
-        return health_status
+        return {
+            "global_manager": global_status,
+            "domains": {domain.value: status for domain, status in zip(domains, domain_statuses)}
+        }
     
     def list_domains(self) -> List[AgentDomain]:
         """List all registered domains.
@@ -253,10 +308,22 @@ class DomainManager:
             domain: The agent domain
             
         Returns:
-            List of domain server configurations
+            List of domain server configurations, highest priority first
         """
         return self.domain_servers.get(domain, [])
     
+    def get_top_server(self, domain: AgentDomain) -> Optional[DomainMCPServer]:
+        """Get the highest-priority server configured for a domain.
+        
+        Args:
+            domain: The agent domain
+            
+        Returns:
+            Domain server configuration or None if the domain has no servers
+        """
+        servers = self.domain_servers.get(domain)
+        return servers[0] if servers else None
+    
     async def cleanup_domain(self, domain: AgentDomain):
         """Clean up MCP servers for a specific domain.
         
@@ -280,6 +347,7 @@ class DomainManager:
             cleanup_tasks.append(self.cleanup_domain(domain))
         
         await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+        self.cache_clear()
         self.is_initialized = False
         logger.info("Domain Manager cleanup complete")
 
@@ -5,13 +5,53 @@ Provides a unified interface for accessing external data sources.
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Any, List, Optional, Tuple, TypeVar
 from pydantic import BaseModel
 from .base_server import BaseMCPServer, MCPResource
+from .search_cache import SearchCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Searches slower than this percentile of a source's recent latencies get a
+# duplicate request, so hedging costs roughly 5% extra load
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20  # Latencies observed before a source is hedged
+HEDGE_WINDOW = 100  # Recent latencies kept per source
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float) -> T:
+    """Run a call, issuing a duplicate if it has not finished after delay.
+    
+    The first copy to succeed wins and the other is cancelled.
+    
+    Args:
+        call: Function starting the call, invoked once per copy
+        delay: Seconds to wait for the first copy before starting the second
+        
+    Returns:
+        Result of the first successful copy
+    """
+    tasks = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.add(asyncio.ensure_future(call()))
+        while True:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if not tasks:
+                # Every copy failed; surface the last error
+                return done.pop().result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
 class MCPSearchResult(BaseModel):
     """Unified model for MCP search results."""
     source: str
@@ -24,27 +64,49 @@ class MCPSearchResult(BaseModel):
 class MCPManager:
     """Manager for coordinating multiple MCP servers."""
     
-    def __init__(self):
-        """Initialize the MCP manager."""
+    # Seconds a health check result is reused
+    HEALTH_CHECK_TTL = 5.0
+    
+    def __init__(self, hedge_searches: bool = True, search_cache: Optional[SearchCache] = None):
+        """Initialize the MCP manager.
+        
+        Args:
+            hedge_searches: Whether to duplicate a search that runs slower than
+                the source's recent 95th percentile latency
+            search_cache: Optional persistent cache answering repeated searches
+                without contacting the source. The caller owns and closes it.
+        """
         self.servers: Dict[str, BaseMCPServer] = {}
         self.is_initialized = False
+        self.hedge_searches = hedge_searches
+        self.search_cache = search_cache
+        self._search_latencies: Dict[str, Deque[float]] = {}
+        self._inflight_searches: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self._health_status: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._health_check_task: Optional[asyncio.Future] = None
         
     async def initialize(self):
         """Initialize all registered MCP servers."""
         if not self.is_initialized:
             logger.info("Initializing MCP Manager...")
             
-            # Initialize all servers
-            for server_name, server in self.servers.items():
-                try:
-                    await server.initialize()
-                    logger.info(f"Initialized MCP server: {server_name}")
-                except Exception as e:
-                    logger.error(f"Failed to initialize MCP server {server_name}: {e}")
+            # Initialize all servers concurrently; each startup probe is a network round trip
+            await asyncio.gather(*(
+                self._initialize_server(server_name, server)
+                for server_name, server in self.servers.items()
+            ))
             
             self.is_initialized = True
             logger.info("MCP Manager initialization complete")
     
+    async def _initialize_server(self, server_name: str, server: BaseMCPServer):
+        """Initialize one MCP server, logging rather than raising on failure."""
+        try:
+            await server.initialize()
+            logger.info(f"Initialized MCP server: {server_name}")
+        except Exception as e:
+            logger.error(f"Failed to initialize MCP server {server_name}: {e}")
+    
     def register_server(self, name: str, server: BaseMCPServer):
         """Register an MCP server.
         
@@ -53,6 +115,7 @@ class MCPManager:
             server: MCP server instance
         """
         self.servers[name] = server
+        self._health_status = None
         logger.info(f"Registered MCP server: {name}")
     
     async def search_all(self, query: str, max_results: int = 10, 
@@ -73,42 +136,45 @@ class MCPManager:
         results = []
         search_sources = sources if sources else list(self.servers.keys())
         
-        # Search each source concurrently
-        tasks = []
-        for source_name in search_sources:
-            if source_name in self.servers:
-                task = self._search_source(source_name, query, max_results)
-                tasks.append(task)
+        # Search each registered source concurrently; results are paired with
+        # these names, so sources without a server must not be in the list
+        registered_sources = [name for name in search_sources if name in self.servers]
+        tasks = [
+            self._search_source(source_name, query, max_results)
+            for source_name in registered_sources
+        ]
         
         # Wait for all searches to complete
         source_results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Combine and format results
-        for i, source_name in enumerate(search_sources):
-            if source_name in self.servers:
-                if isinstance(source_results[i], Exception):
-                    logger.error(f"Search failed for {source_name}: {source_results[i]}")
-                    continue
-                
-                for result in source_results[i]:
-                    unified_result = MCPSearchResult(
-                        source=source_name,
-                        title=result.get("title", ""),
-                        content=result.get("snippet", result.get("abstract", "")),
-                        url=result.get("url"),
-                        relevance_score=result.get("relevance_score", 0.0),
-                        metadata=result
-                    )
-                    results.append(unified_result)
+        for source_name, source_result in zip(registered_sources, source_results):
+            if isinstance(source_result, Exception):
+                logger.error(f"Search failed for {source_name}: {source_result}")
+                continue
+            
+            for result in source_result:
+                unified_result = MCPSearchResult(
+                    source=source_name,
+                    title=result.get("title", ""),
+                    content=result.get("snippet", result.get("abstract", "")),
+                    url=result.get("url"),
+                    relevance_score=result.get("relevance_score", 0.0),
+                    metadata=result
+                )
+                results.append(unified_result)
         
         # Sort by relevance score
         results.sort(key=lambda x: x.relevance_score, reverse=True)
         
-        return results[:max_results * len(search_sources)]
+        return results[:max_results * len(registered_sources)]
     
     async def _search_source(self, source_name: str, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search a specific MCP source.
         
+        A search identical to one already in flight waits for that search's
+        results instead of sending another request.
+        
         Args:
             source_name: Name of the source
             query: Search query
@@ -117,13 +183,61 @@ class MCPManager:
         Returns:
             List of search results
         """
+        key = (source_name, query, max_results)
+        search = self._inflight_searches.get(key)
+        if search is None:
+            search = asyncio.ensure_future(self._run_search(source_name, query, max_results))
+            self._inflight_searches[key] = search
+            search.add_done_callback(lambda _: self._inflight_searches.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others' search
+        return list(await asyncio.shield(search))
+    
+    async def _run_search(self, source_name: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Search a specific MCP source, hedging it when it runs slow."""
         try:
+            if self.search_cache is not None:
+                cached = await self.search_cache.get(source_name, query, max_results)
+                if cached is not None:
+                    return cached
+            
             server = self.servers[source_name]
-            return await server.search(query, max_results)
+            delay = self._hedge_delay(source_name)
+            start = time.perf_counter()
+            if delay is None:
+                results = await server.search(query, max_results)
+            else:
+                results = await hedged(lambda: server.search(query, max_results), delay)
+            self._search_latencies.setdefault(
+                source_name, deque(maxlen=HEDGE_WINDOW)
+            ).append(time.perf_counter() - start)
+            
+            # Servers report failures as no results, so only non-empty results are kept
+            if self.search_cache is not None and results:
+                await self.search_cache.set(source_name, query, max_results, results)
+            return results
         except Exception as e:
             logger.error(f"Search failed for {source_name}: {e}")
             return []
     
+    def _hedge_delay(self, source_name: str) -> Optional[float]:
+        """Get how long to wait before hedging a search of a source.
+        
+        Args:
+            source_name: Name of the source
+            
+        Returns:
+            The source's recent 95th percentile latency in seconds, or None if
+            hedging is off, the source is rate limited, or too few searches
+            have been timed
+        """
+        if not self.hedge_searches or not self.servers[source_name].allows_hedging:
+            return None
+        latencies = self._search_latencies.get(source_name)
+        if latencies is None or len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(latencies)
+        return ordered[int(HEDGE_PERCENTILE * (len(ordered) - 1))]
+    
     async def get_content(self, source: str, resource_id: str) -> Optional[Dict[str, Any]]:
         """Get content from a specific MCP source.
         
@@ -172,26 +286,49 @@ class MCPManager:
     async def health_check(self) -> Dict[str, Any]:
         """Check health of all MCP servers.
         
+        A result is reused for HEALTH_CHECK_TTL seconds, and concurrent callers
+        share a single round of server checks.
+        
         Returns:
             Health status for all servers
         """
         if not self.is_initialized:
             await self.initialize()
         
+        if self._health_status is not None:
+            checked_at, health_status = self._health_status
+            if time.monotonic() - checked_at < self.HEALTH_CHECK_TTL:
+                return {**health_status, "servers": dict(health_status["servers"])}
+        
+        if self._health_check_task is None or self._health_check_task.done():
+            self._health_check_task = asyncio.ensure_future(self._check_health())
+        # Shielded so one caller being cancelled does not cancel the others' check
+        health_status = await asyncio.shield(self._health_check_task)
+        return {**health_status, "servers": dict(health_status["servers"])}
+    
+    async def _check_health(self) -> Dict[str, Any]:
+        """Check every server's health and store the result for reuse."""
         health_status = {
             "manager_status": "healthy" if self.is_initialized else "not_initialized",
             "servers": {}
         }
         
-        for source_name, server in self.servers.items():
-            try:
-                health_status["servers"][source_name] = await server.health_check()
-            except Exception as e:
+        # Check all servers concurrently
+        checks = await asyncio.gather(
+            *(server.health_check() for server in self.servers.values()),
+            return_exceptions=True
+        )
+        for source_name, check in zip(self.servers, checks):
+            if isinstance(check, Exception):
                 health_status["servers"][source_name] = {
                     "status": "error",
-                    "error": str(e)
+                    "error": str(check)
                 }
+            else:
+                health_status["servers"][source_name] = check
         
+        self._health_status = (time.monotonic(), health_status)
+        self._health_check_task = None
         return health_status
     
     async def cleanup(self):
@@ -204,6 +341,7 @@ class MCPManager:
             cleanup_tasks.append(task)
         
         await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+        self._health_status = None
         self.is_initialized = False
         logger.info("MCP Manager cleanup complete")
     
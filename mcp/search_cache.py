@@ -0,0 +1,145 @@
+"""
+Persistent cache for MCP search results.
+Lets repeated runs answer identical searches without contacting the source again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds search results stay valid, by source
+DEFAULT_SEARCH_TTLS: Dict[str, float] = {
+    "arxiv": 24 * 3600,
+    "wikipedia": 7 * 24 * 3600
+}
+DEFAULT_SEARCH_TTL = 24 * 3600  # For sources not listed above
+
+class SearchCache:
+    """SQLite-backed cache of MCP search results.
+
+    Entries are keyed by source, query and result count and expire after
+    their source's TTL. The database runs in WAL mode so several processes
+    can read it while one writes.
+    """
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_SEARCH_TTL):
+        """Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file, created on first use
+            ttls: Seconds results stay valid, by source name
+                (default: DEFAULT_SEARCH_TTLS)
+            default_ttl: Seconds results stay valid for sources not in ttls
+        """
+        self.path = path
+        self.ttls = DEFAULT_SEARCH_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mcp_search_cache "
+                "(key TEXT PRIMARY KEY, results BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(source: str, query: str, max_results: int) -> str:
+        """Build the cache key for a search.
+
+        Args:
+            source: Name of the MCP source
+            query: Search query
+            max_results: Maximum number of results requested
+
+        Returns:
+            SHA-256 hex digest of the search parameters
+        """
+        payload = json.dumps([source, query, max_results], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _dumps(results: List[Dict[str, Any]]) -> bytes:
+        """Serialize results to UTF-8 JSON, with orjson when available."""
+        if orjson is not None:
+            return orjson.dumps(results, default=str)
+        return json.dumps(results, ensure_ascii=False, default=str).encode("utf-8")
+
+    @staticmethod
+    def _loads(data: bytes) -> List[Dict[str, Any]]:
+        """Parse stored results, with orjson when available."""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    async def get(self, source: str, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Get the stored results of a search.
+
+        Args:
+            source: Name of the MCP source
+            query: Search query
+            max_results: Maximum number of results requested
+
+        Returns:
+            The stored results, or None if missing or expired
+        """
+        key = self.make_key(source, query, max_results)
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT results, expires_at FROM mcp_search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        results, expires_at = row
+        if expires_at <= time.time():
+            with conn:
+                conn.execute("DELETE FROM mcp_search_cache WHERE key = ?", (key,))
+            return None
+        return self._loads(results)
+
+    async def set(self, source: str, query: str, max_results: int,
+                  results: List[Dict[str, Any]]) -> None:
+        """Store the results of a search.
+
+        Args:
+            source: Name of the MCP source
+            query: Search query
+            max_results: Maximum number of results requested
+            results: Search results to store
+        """
+        ttl = self.ttls.get(source, self.default_ttl)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO mcp_search_cache (key, results, expires_at) VALUES (?, ?, ?)",
+                (self.make_key(source, query, max_results),
+                 self._dumps(results),
+                 time.time() + ttl)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
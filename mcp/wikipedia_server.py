@@ -7,6 +7,7 @@ import re
 import logging
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
+import aiohttp
 from bs4 import BeautifulSoup
 from .base_server import BaseMCPServer, MCPResource
 from datetime import datetime
@@ -35,11 +36,16 @@ class WikipediaContent(BaseModel):
 class WikipediaMCPServer(BaseMCPServer):
     """MCP server for Wikipedia content access."""
     
-    def __init__(self):
-        """Initialize the Wikipedia MCP server."""
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the Wikipedia MCP server.
+        
+        Args:
+            session: Optional HTTP session shared with other MCP servers
+        """
         super().__init__(
             name="Wikipedia MCP Server",
-            description="Provides access to Wikipedia articles and search functionality"
+            description="Provides access to Wikipedia articles and search functionality",
+            session=session
         )
         self.base_url = "https://en.wikipedia.org/api/rest_v1"
         self.search_url = "https://en.wikipedia.org/w/api.php"
@@ -128,14 +134,10 @@ class WikipediaMCPServer(BaseMCPServer):
             
             # Get full article content
             content_url = f"{self.base_url}/page/html/{title.replace(' ', '_')}"
-            content_response = await self._make_request(content_url)
+            content_response = await self._make_raw_request(content_url)
             
-            # Parse HTML content - content_response should be a string
-            if isinstance(content_response, str):
-                soup = BeautifulSoup(content_response, 'html.parser')
-            else:
-                logger.error("Unexpected content response type")
-                return None
+            # Parse HTML content; BeautifulSoup detects the encoding from the bytes
+            soup = BeautifulSoup(content_response, 'html.parser')
             
             # Extract main content
             main_content = soup.find('div', {'id': 'content'})
@@ -0,0 +1,128 @@
+import pytest
+import asyncio
+import aiohttp
+from yarl import URL
+from core.llm_service import LLMResponse
+
+
+class StubLLMService:
+    """LLM service stand-in that records prompts instead of calling Ollama."""
+
+    def __init__(self, content: str = "Finding one\nFinding two\nFinding three", delay: float = 0):
+        self.content = content
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_response(self, prompt, system_prompt=None, json_mode=False):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return LLMResponse(content=self.content)
+        finally:
+            self.in_flight -= 1
+
+    async def generate_response_stream(self, prompt, system_prompt=None):
+        response = await self.generate_response(prompt, system_prompt)
+        self.stream_closed = False
+        try:
+            # Yield a few characters at a time so lines span chunk boundaries
+            for start in range(0, len(response.content), 4):
+                self.chunks_sent = start // 4 + 1
+                yield response.content[start:start + 4]
+        finally:
+            self.stream_closed = True
+
+    async def recommend_kpi_actions(self, kpi_gaps, kpi_names):
+        self.prompts.append(kpi_gaps)
+        return {name: f"- Review {name}\n2. Staff {name}" for name in kpi_names}
+
+    async def analyze_kpis(self, kpis):
+        self.prompts.append(str(kpis))
+        return "Free-text KPI review"
+
+
+class StubStream:
+    """aiohttp StreamReader stand-in recording how many bytes were requested."""
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.requested = None
+
+    async def read(self, n: int = -1):
+        self.requested = n
+        return self.raw if n < 0 else self.raw[:n]
+
+
+class StubResponse:
+    """aiohttp response stand-in returning a fixed status and body."""
+
+    def __init__(self, status: int, body: str, delay: float = 0,
+                 content_type: str = "text/html; charset=utf-8"):
+        self.status = status
+        self.body = body
+        self.delay = delay
+        self.headers = {"Content-Type": content_type}
+        self.charset = "utf-8"
+        self.content = StubStream(body.encode("utf-8"))
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def text(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            url = URL("https://stub.invalid")
+            raise aiohttp.ClientResponseError(aiohttp.RequestInfo(url, "GET", {}, url), (), status=self.status)
+
+
+class StubSession:
+    """aiohttp session stand-in mapping URLs to responses or exceptions."""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def get(self, url):
+        response = self.responses[url]
+        if isinstance(response, list):
+            # Successive attempts for the same URL
+            response = response.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def stub_llm_service():
+    """Factory for StubLLMService instances."""
+    return StubLLMService
+
+
+@pytest.fixture
+def stub_response():
+    """Factory for StubResponse instances."""
+    return StubResponse
+
+
+@pytest.fixture
+def install_web_session():
+    """Make a researcher fetch web pages from a StubSession built from responses."""
+    def install(researcher, responses):
+        session = StubSession(responses)
+
+        async def get_session():
+            return session
+
+        researcher._get_session = get_session
+        return session
+
+    return install
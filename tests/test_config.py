@@ -0,0 +1,55 @@
+import pytest
+from config.config import Settings, settings
+from core.llm_service import get_llm_service
+
+
+def test_settings_load_with_defaults():
+    """Test that settings load and expose the configured defaults."""
+    assert settings.KPI_TARGETS["case_resolution"] == 0.85
+    assert settings.LLM_CACHE_ENABLED is True
+    assert settings.OLLAMA_NUM_PARALLEL == 4
+
+
+def test_llm_settings_defaults():
+    """Test the defaults of the LLM cache and Ollama settings."""
+    assert settings.LLM_CACHE_SIZE == 1024
+    assert settings.LLM_SEMANTIC_CACHE_THRESHOLD is None
+    assert settings.LLM_EMBEDDING_MODEL == "nomic-embed-text"
+    assert settings.KPI_LOWER_IS_BETTER == ["time_to_benefit"]
+
+
+def test_settings_read_from_environment(monkeypatch):
+    """Test that settings are overridden by, and coerced from, environment variables."""
+    monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "8")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.92")
+
+    loaded = Settings()
+
+    assert loaded.OLLAMA_NUM_PARALLEL == 8
+    assert loaded.LLM_CACHE_ENABLED is False
+    assert loaded.LLM_SEMANTIC_CACHE_THRESHOLD == 0.92
+
+
+@pytest.mark.parametrize("field, value", [
+    ("LLM_CACHE_SIZE", 1),
+    ("LLM_CACHE_ENABLED", False),
+    ("OLLAMA_NUM_PARALLEL", 1),
+    ("KPI_TARGETS", {}),
+])
+def test_settings_are_frozen(field, value):
+    """Test that loaded settings cannot be reassigned."""
+    with pytest.raises(TypeError):
+        setattr(settings, field, value)
+
+
+def test_shared_llm_service_follows_settings(monkeypatch):
+    """Test that the shared LLM service is configured from settings."""
+    monkeypatch.setattr("core.llm_service.settings", Settings(LLM_CACHE_SIZE=16, OLLAMA_NUM_PARALLEL=2))
+    monkeypatch.setattr("core.llm_service._llm_services", {})
+
+    service = get_llm_service()
+
+    assert service.cache.maxsize == 16
+    assert service.max_concurrency == 2
+    assert service.semantic_cache is None
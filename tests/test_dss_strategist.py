@@ -1,5 +1,5 @@
 import pytest
-from agents.strategist.dss_strategist import DSSStrategist
+from agents.strategist.dss_strategist import DSSStrategist, get_strategist
 
 
 @pytest.fixture
@@ -88,4 +88,63 @@ async def test_invalid_request_type(strategist):
     
     response = await strategist.process_request(request)
     assert not response.success
-    assert "Invalid request type specified" in response.errors 
\ No newline at end of file
+    assert "Invalid request type specified" in response.errors 
+
+@pytest.mark.asyncio
+async def test_requests_dispatch_to_handlers(strategist, stub_llm_service):
+    strategist.llm_service = stub_llm_service("Advice")
+
+    kpi_response = await strategist.process_request({"type": "kpi_analysis", "data": {"case_resolution": 0.8}})
+    strategy_response = await strategist.process_request({"type": "strategy_analysis", "data": "Expand SNAP outreach"})
+
+    assert kpi_response.success
+    assert kpi_response.data["analysis"]["case_resolution"]["gap"] == 0.05
+    assert strategy_response.success
+    assert strategy_response.message == "Strategy analysis completed."
+    assert strategy_response.data == {"analysis": "Advice"}
+    assert strategist.llm_service.prompts == ["case_resolution: current 0.8, target 0.85, gap 0.05", "Expand SNAP outreach"]
+
+
+@pytest.mark.asyncio
+async def test_kpi_gaps_are_computed_without_the_llm(strategist, stub_llm_service):
+    strategist.llm_service = stub_llm_service("Advice")
+
+    result = await strategist.analyze_kpis({"time_to_benefit": 45, "client_satisfaction": 0.82, "call_volume": 900})
+
+    assert result["success"]
+    assert result["data"]["analysis"] == {
+        "time_to_benefit": {
+            "current_value": 45.0, "target": 30.0, "gap": 15.0,
+            "recommendations": ["Review time_to_benefit", "Staff time_to_benefit"]
+        },
+        "client_satisfaction": {
+            "current_value": 0.82, "target": 0.9, "gap": 0.08,
+            "recommendations": ["Review client_satisfaction", "Staff client_satisfaction"]
+        }
+    }
+    assert result["data"]["untracked"] == ["call_volume"]
+    assert len(strategist.llm_service.prompts) == 1
+
+    # Lower-is-better KPIs beating their target have a negative gap
+    ahead = await strategist.analyze_kpis({"time_to_benefit": 21})
+    assert ahead["data"]["analysis"]["time_to_benefit"]["gap"] == -9.0
+    assert len(strategist.llm_service.prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_untracked_kpis_fall_back_to_llm_analysis(strategist, stub_llm_service):
+    strategist.llm_service = stub_llm_service("Advice")
+
+    result = await strategist.analyze_kpis({"call_volume": 900})
+
+    assert result["success"]
+    assert result["data"]["analysis"] == "Free-text KPI review"
+    assert result["data"]["untracked"] == ["call_volume"]
+    assert strategist.llm_service.prompts == ["{'call_volume': 900}"]
+
+
+def test_get_strategist_returns_shared_instance():
+    strategist = get_strategist()
+
+    assert isinstance(strategist, DSSStrategist)
+    assert get_strategist() is strategist
@@ -0,0 +1,357 @@
+import pytest
+import asyncio
+import ollama
+from core import llm_cache
+from core.llm_cache import DiskLLMCache, InMemoryLLMCache, make_cache_key
+from core.llm_service import LLMResponse, LLMService, build_sections_prompt, parse_sections
+
+
+class StubOllamaClient:
+    """ollama.AsyncClient stand-in that records the peak number of in-flight chats."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+        self.embedded = []
+
+    async def embeddings(self, model, prompt):
+        self.embedded.append(prompt)
+        # Bag-of-letters embedding: texts with the same letters are identical
+        return {"embedding": [prompt.lower().count(c) for c in "abcdefghijklmnopqrstuvwxyz"]}
+
+    async def chat(self, model, messages, stream=False, format=""):
+        self.calls.append(messages)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return {"message": {"content": f"reply to {messages[-1]['content']}"}, "eval_count": 3}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def llm_service():
+    """Create an LLM service backed by a stub Ollama client."""
+    service = LLMService()
+    client = StubOllamaClient()
+    service._get_client = lambda: client
+    service.stub_client = client
+    return service
+
+
+@pytest.mark.asyncio
+async def test_generate_response_uses_async_client(llm_service):
+    """Test that responses come from the async client with metadata."""
+    response = await llm_service.generate_response("hello", "be brief")
+
+    assert response.content == "reply to hello"
+    assert response.metadata["model"] == "mistral"
+    assert response.metadata["eval_count"] == 3
+    assert llm_service.stub_client.calls[0][0] == {"role": "system", "content": "be brief"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap(llm_service):
+    """Test that gathered requests are in flight at the same time."""
+    responses = await asyncio.gather(*(llm_service.generate_response(f"p{i}") for i in range(4)))
+
+    assert [r.content for r in responses] == [f"reply to p{i}" for i in range(4)]
+    assert llm_service.stub_client.peak == 4
+
+
+def test_client_is_reused_per_event_loop():
+    """Test that one client serves a loop and a new loop gets a fresh client."""
+    service = LLMService()
+
+    async def get_clients():
+        return service._get_client(), service._get_client()
+
+    first, again = asyncio.run(get_clients())
+    second, _ = asyncio.run(get_clients())
+
+    assert first is again
+    assert second is not first
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_hit_the_cache(llm_service):
+    """Test that an exact repeat is served from the cache."""
+    first = await llm_service.generate_response("hello", "be brief")
+    second = await llm_service.generate_response("hello", "be brief")
+    await llm_service.generate_response("hello", "be verbose")
+    await llm_service.generate_response("hello", "be brief", json_mode=True)
+
+    assert second is first
+    assert len(llm_service.stub_client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled():
+    """Test that a service with caching disabled always calls the model."""
+    service = LLMService(cache_enabled=False)
+    client = StubOllamaClient()
+    service._get_client = lambda: client
+
+    await service.generate_response("hello")
+    await service.generate_response("hello")
+
+    assert service.cache is None
+    assert len(client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    """Test that the LRU cache drops the oldest untouched entry."""
+    cache = InMemoryLLMCache(maxsize=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_persists_responses(tmp_path):
+    """Test that a response stored by one disk cache is read back by another."""
+    await DiskLLMCache(str(tmp_path), model=LLMResponse).set(
+        "key", LLMResponse(content="cached", model="mistral")
+    )
+
+    cached = await DiskLLMCache(str(tmp_path), model=LLMResponse).get("key")
+    assert cached == LLMResponse(content="cached", model="mistral")
+    assert [p.name for p in tmp_path.iterdir()] == ["key.json"]
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_drops_expired_responses(tmp_path, monkeypatch):
+    """Test that an entry past its TTL is treated as a miss and removed."""
+    cache = DiskLLMCache(str(tmp_path), ttl=60)
+    await cache.set("key", "value")
+    assert await cache.get("key") == "value"
+
+    monkeypatch.setattr(llm_cache.time, "time", lambda: float("inf"))
+    assert await cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_serves_similar_prompts():
+    """Test that a paraphrased prompt under the same system prompt reuses a response."""
+    service = LLMService(semantic_threshold=0.99)
+    client = StubOllamaClient()
+    service._get_client = lambda: client
+
+    first = await service.generate_response("listen to the data", "analyst")
+    reordered = await service.generate_response("silent to the data", "analyst")
+    other_system = await service.generate_response("silent to the data", "strategist")
+    unrelated = await service.generate_response("zzz", "analyst")
+
+    assert reordered is first
+    assert other_system is not first
+    assert unrelated.content == "reply to zzz"
+    assert len(client.calls) == 3
+    # Each distinct prompt is embedded once, on lookup or on store
+    assert sorted(client.embedded) == ["listen to the data", "silent to the data", "zzz"]
+
+
+@pytest.mark.asyncio
+async def test_client_pool_is_sized_from_max_concurrency(monkeypatch):
+    """Test that the Ollama client's connection pool is bounded by the concurrency cap."""
+    created = []
+    monkeypatch.setattr(ollama, "AsyncClient", lambda **kwargs: created.append(kwargs) or object())
+    service = LLMService(max_concurrency=3)
+
+    service._get_client()
+
+    limits = created[0]["limits"]
+    assert limits.max_connections == 6
+    assert limits.max_keepalive_connections == 6
+    assert limits.keepalive_expiry == LLMService.KEEPALIVE_EXPIRY
+
+
+def test_semantic_cache_is_off_by_default():
+    """Test that only exact caching is enabled unless a threshold is given."""
+    service = LLMService()
+
+    assert service.cache is not None
+    assert service.semantic_cache is None
+
+
+def test_cache_key_matches_without_orjson(monkeypatch):
+    """Test that the stdlib fallback produces the same cache keys as orjson."""
+    with_orjson = make_cache_key("mistral", "Résumé the KPIs", "Be brief", True)
+    monkeypatch.setattr(llm_cache, "orjson", None)
+
+    assert make_cache_key("mistral", "Résumé the KPIs", "Be brief", True) == with_orjson
+    assert make_cache_key("mistral", "Résumé the KPIs", "Be brief") != with_orjson
+
+
+def test_sections_round_trip():
+    """Test that a sectioned response is split back into named answers."""
+    prompt = build_sections_prompt([("first", "Say one"), ("second", "Say two")], context="Shared text")
+    text = "===SECTION first===\n- one\n\n===SECTION second===\ntwo\n"
+
+    assert prompt.count("Shared text") == 1
+    assert "### SECTION: second\nSay two" in prompt
+    assert parse_sections(text) == {"first": "- one", "second": "two"}
+    assert parse_sections("no delimiters") == {}
+
+
+@pytest.mark.asyncio
+async def test_generate_multi_makes_one_call(llm_service):
+    """Test that several sections are answered by a single chat request."""
+    async def chat(model, messages, stream=False, format=""):
+        llm_service.stub_client.calls.append(messages)
+        return {"message": {"content": "===SECTION a===\nA\n===SECTION b===\nB"}}
+
+    llm_service.stub_client.chat = chat
+
+    answers = await llm_service.generate_multi([("a", "Say A"), ("b", "Say B")], context="ctx")
+
+    assert answers == {"a": "A", "b": "B"}
+    assert len(llm_service.stub_client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_deltas_and_closes_early(llm_service):
+    """Test that streamed deltas arrive in order and closing stops the request."""
+    closed = []
+
+    async def parts():
+        try:
+            for word in ["First ", "line\n", "Second ", "line\n", "Third"]:
+                yield {"message": {"content": word}}
+        finally:
+            closed.append(True)
+
+    async def chat(model, messages, stream=False, format=""):
+        assert stream is True
+        return parts()
+
+    llm_service.stub_client.chat = chat
+
+    received = []
+    stream = llm_service.generate_response_stream("list things")
+    async for delta in stream:
+        received.append(delta)
+        if delta.endswith("\n") and len(received) > 2:
+            break
+    await stream.aclose()
+
+    assert "".join(received) == "First line\nSecond line\n"
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_stream_caches_only_complete_responses(llm_service):
+    """Test that a stream read to the end is cached and one closed early is not."""
+    async def parts():
+        for word in ["one\n", "two\n", "three"]:
+            yield {"message": {"content": word}}
+
+    async def chat(model, messages, stream=False, format=""):
+        llm_service.stub_client.calls.append(messages)
+        return parts()
+
+    llm_service.stub_client.chat = chat
+
+    stream = llm_service.generate_response_stream("cut short")
+    async for _ in stream:
+        break
+    await stream.aclose()
+    assert [delta async for delta in llm_service.generate_response_stream("cut short")] == ["one\n", "two\n", "three"]
+    assert len(llm_service.stub_client.calls) == 2
+
+    # The complete stream is now served from the cache, in one chunk
+    assert [delta async for delta in llm_service.generate_response_stream("cut short")] == ["one\ntwo\nthree"]
+    assert (await llm_service.generate_response("cut short")).content == "one\ntwo\nthree"
+    assert len(llm_service.stub_client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_analysis_prompts_put_data_last(llm_service):
+    """Test that analysis prompts share a static prefix and end with the data."""
+    await llm_service.analyze_kpis({"case_resolution": 0.8})
+    await llm_service.analyze_kpis({"case_resolution": 0.9})
+
+    first, second = (call[-1]["content"] for call in llm_service.stub_client.calls)
+    prefix = first[:first.index("DATA:")]
+
+    assert second.startswith(prefix)
+    assert first.rstrip().endswith("{'case_resolution': 0.8}")
+    assert llm_service.stub_client.calls[0][0] == llm_service.stub_client.calls[1][0]
+
+
+def test_agents_share_one_llm_service():
+    """Test that agents get the process-wide service for the default model."""
+    from agents.researcher.researcher import Researcher
+    from agents.strategist.dss_strategist import DSSStrategist
+    from core.llm_service import get_llm_service
+
+    assert Researcher().llm_service is DSSStrategist().llm_service
+    assert get_llm_service() is get_llm_service("mistral")
+    assert get_llm_service("llama3") is not get_llm_service()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_are_capped():
+    """Test that no more than max_concurrency chats run at once."""
+    service = LLMService(cache_enabled=False, max_concurrency=2)
+    client = StubOllamaClient()
+    service._get_client = lambda: client
+
+    await asyncio.gather(*(service.generate_response(f"p{i}") for i in range(6)))
+
+    assert len(client.calls) == 6
+    assert client.peak == 2
+
+
+def test_max_concurrency_defaults_to_ollama_num_parallel(monkeypatch):
+    """Test that the cap follows the OLLAMA_NUM_PARALLEL environment variable."""
+    monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "3")
+
+    assert LLMService().max_concurrency == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_the_cache_for_follow_ups(llm_service):
+    """Test that a strategist KPI analysis prefetches its follow-up analyses."""
+    from agents.strategist.dss_strategist import DSSStrategist
+
+    strategist = DSSStrategist(prefetch_follow_ups=True)
+    strategist.llm_service = llm_service
+    kpis = {"case_resolution": 0.8}
+
+    await strategist.analyze_kpis(kpis)
+    await asyncio.gather(*llm_service._prefetch_tasks)
+    calls = len(llm_service.stub_client.calls)
+    await llm_service.analyze_bottlenecks(kpis)
+    await llm_service.assess_risks(kpis)
+
+    assert calls == 3
+    assert len(llm_service.stub_client.calls) == 3
+    assert not llm_service._prefetch_tasks
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_skipped_without_cache():
+    """Test that prefetching does nothing when there is no cache to warm."""
+    service = LLMService(cache_enabled=False)
+
+    assert service.prefetch(service.analyze_kpis({})) is None
+
+
+@pytest.mark.asyncio
+async def test_metadata_is_built_on_first_access(llm_service):
+    """Test that response metadata is only assembled when read."""
+    response = await llm_service.generate_response("hello")
+
+    assert "metadata" not in response.__dict__
+    assert response.metadata["eval_count"] == 3
+    assert response.metadata is response.metadata
+    assert "raw" not in response.model_dump()
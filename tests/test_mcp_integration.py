@@ -1,6 +1,14 @@
 import pytest
 import asyncio
-from mcp.mcp_manager import MCPManager, MCPSearchResult
+import aiohttp
+from yarl import URL
+from mcp import base_server
+from mcp.base_server import BaseMCPServer
+from mcp.domain_manager import DEFAULT_DOMAIN_CONFIGS, AgentDomain, DomainManager
+from mcp import mcp_manager as mcp_manager_module
+from mcp.mcp_manager import MCPManager, MCPSearchResult, hedged
+from mcp import search_cache
+from mcp.search_cache import SearchCache
 from mcp.wikipedia_server import WikipediaMCPServer
 from mcp.arxiv_server import ArxivMCPServer
 
@@ -42,6 +50,18 @@ async def test_mcp_server_registration():
     
     await manager.cleanup()
 
+@pytest.mark.asyncio
+async def test_shared_session_outlives_server_cleanup():
+    """Test that servers reuse an injected session and leave closing it to the caller."""
+    async with aiohttp.ClientSession() as session:
+        wikipedia_server = WikipediaMCPServer(session=session)
+        arxiv_server = ArxivMCPServer(session=session)
+        
+        assert wikipedia_server.session is arxiv_server.session is session
+        await wikipedia_server.cleanup()
+        await arxiv_server.cleanup()
+        assert not session.closed
+
 @pytest.mark.asyncio
 async def test_mcp_search_result_model():
     """Test MCPSearchResult model validation."""
@@ -162,4 +182,522 @@ async def test_arxiv_server_list_resources(arxiv_server):
     assert isinstance(resources, list)
     assert len(resources) > 0
     
-    await arxiv_server.cleanup() 
\ No newline at end of file
+    await arxiv_server.cleanup() 
+
+class SlowMCPServer(BaseMCPServer):
+    """MCP server stand-in whose startup probe and health check take a while."""
+    
+    in_flight = 0
+    peak = 0
+    
+    async def _probe(self):
+        SlowMCPServer.in_flight += 1
+        SlowMCPServer.peak = max(SlowMCPServer.peak, SlowMCPServer.in_flight)
+        await asyncio.sleep(0.01)
+        SlowMCPServer.in_flight -= 1
+    
+    async def _initialize_server(self):
+        await self._probe()
+    
+    async def health_check(self):
+        await self._probe()
+        return await super().health_check()
+    
+    async def search(self, query: str, max_results: int = 10):
+        return []
+    
+    async def get_content(self, resource_id: str):
+        return None
+
+@pytest.mark.asyncio
+async def test_domain_manager_starts_and_checks_servers_concurrently():
+    """Test that server startup and health checks fan out across servers and domains."""
+    SlowMCPServer.peak = 0
+    domain_manager = DomainManager()
+    for domain in (AgentDomain.RESEARCH, AgentDomain.STRATEGIC):
+        domain_manager.register_domain(domain, DEFAULT_DOMAIN_CONFIGS[domain])
+        for i in range(2):
+            name = f"{domain.value}_{i}"
+            domain_manager.register_server_for_domain(domain, name, SlowMCPServer(name, "slow"))
+    
+    await domain_manager.initialize_all()
+    assert SlowMCPServer.peak == 4
+    
+    SlowMCPServer.peak = 0
+    health_status = await domain_manager.health_check_all()
+    assert SlowMCPServer.peak == 8
+    assert set(health_status["domains"]) == {"research", "strategic"}
+    assert health_status["domains"]["strategic"]["servers"]["strategic_1"]["status"] == "healthy"
+    
+    await domain_manager.cleanup_all()
+
+@pytest.mark.asyncio
+async def test_domain_search_results_are_cached_until_ttl(monkeypatch):
+    """Test that repeat domain searches reuse results until they expire."""
+    calls = []
+    
+    class CountingServer(SlowMCPServer):
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            calls.append(query)
+            return [{"title": query, "snippet": "text", "relevance_score": 0.5}]
+    
+    domain_manager = DomainManager()
+    domain_manager.register_domain(AgentDomain.GENERAL, DEFAULT_DOMAIN_CONFIGS[AgentDomain.GENERAL])
+    domain_manager.register_server_for_domain(AgentDomain.GENERAL, "counting", CountingServer("counting", "counts"))
+    
+    first = await domain_manager.search_domain(AgentDomain.GENERAL, "snap", max_results=3)
+    second = await domain_manager.search_domain(AgentDomain.GENERAL, "snap", max_results=3)
+    await domain_manager.search_domain(AgentDomain.GENERAL, "snap", max_results=5)
+    assert first == second
+    assert calls == ["snap", "snap"]
+    
+    monkeypatch.setattr(DomainManager, "SEARCH_CACHE_TTL", 0.0)
+    await domain_manager.search_domain(AgentDomain.GENERAL, "snap", max_results=3)
+    assert len(calls) == 3
+    
+    await domain_manager.cleanup_all()
+    assert domain_manager._search_cache == {}
+
+def test_domain_servers_are_kept_in_priority_order():
+    """Test that servers are ordered by priority at registration, ties keeping registration order."""
+    domain_manager = DomainManager()
+    domain_manager.register_domain(AgentDomain.RESEARCH, DEFAULT_DOMAIN_CONFIGS[AgentDomain.RESEARCH])
+    assert domain_manager.get_top_server(AgentDomain.RESEARCH) is None
+    
+    for name, priority in [("low", 1), ("high", 3), ("mid_a", 2), ("mid_b", 2)]:
+        domain_manager.register_server_for_domain(
+            AgentDomain.RESEARCH, name, SlowMCPServer(name, "slow"), priority=priority
+        )
+    
+    servers = domain_manager.get_domain_servers(AgentDomain.RESEARCH)
+    assert [server.server_name for server in servers] == ["high", "mid_a", "mid_b", "low"]
+    assert domain_manager.get_top_server(AgentDomain.RESEARCH).server_name == "high"
+
+def test_bulk_registration_matches_individual_calls():
+    """Test that register_domains and register_servers set up the same registry."""
+    servers = {name: SlowMCPServer(name, "slow") for name in ("wiki", "arxiv")}
+    entries = [
+        (AgentDomain.RESEARCH, "wiki", servers["wiki"], 3),
+        (AgentDomain.GENERAL, "wiki", servers["wiki"], 2),
+        (AgentDomain.RESEARCH, "arxiv", servers["arxiv"], 2)
+    ]
+    
+    bulk = DomainManager()
+    bulk.register_domains(DEFAULT_DOMAIN_CONFIGS)
+    bulk.register_servers(entries)
+    
+    single = DomainManager()
+    for domain, config in DEFAULT_DOMAIN_CONFIGS.items():
+        single.register_domain(domain, config)
+    for domain, name, server, priority in entries:
+        single.register_server_for_domain(domain, name, server, priority=priority)
+    
+    assert bulk.domains == single.domains
+    assert bulk.domain_servers == single.domain_servers
+    assert bulk.get_domain_sources(AgentDomain.RESEARCH) == ["wiki", "arxiv"]
+
+@pytest.mark.asyncio
+async def test_search_all_skips_unregistered_sources():
+    """Test that requested sources without a registered server are ignored."""
+    class StaticServer(SlowMCPServer):
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            if self.name == "failing":
+                raise RuntimeError("source down")
+            return [{"title": self.name, "snippet": query, "relevance_score": 0.5}] * 3
+    
+    manager = MCPManager()
+    manager.register_server("business_db", StaticServer("business_db", "static"))
+    manager.register_server("failing_db", StaticServer("failing", "static"))
+    
+    # An unregistered source ahead of the others used to shift results onto the wrong names
+    results = await manager.search_all("strategy", max_results=1,
+                                       sources=["policy_db", "failing_db", "business_db", "market_research"])
+    
+    # Capped at max_results per registered source, not per requested one
+    assert [result.source for result in results] == ["business_db", "business_db"]
+    await manager.cleanup()
+
+class StubHTTPSession:
+    """aiohttp.ClientSession stand-in replying with scripted status codes."""
+    
+    def __init__(self, statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+    
+    def request(self, method, url, headers=None, params=None, json=None):
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return StubHTTPResponse(self, status)
+
+class StubHTTPResponse:
+    def __init__(self, session, status):
+        self.session = session
+        self.status = status
+        self.headers = session.headers
+    
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.peak = max(self.session.peak, self.session.in_flight)
+        await asyncio.sleep(0.01)
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.session.in_flight -= 1
+    
+    def raise_for_status(self):
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(URL("https://example.org"), "GET", {})
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status)
+    
+    async def read(self):
+        return b'{"status": %d}' % self.status
+
+@pytest.mark.asyncio
+async def test_server_requests_are_capped_per_server():
+    """Test that a burst of requests never exceeds the server's concurrency cap."""
+    session = StubHTTPSession([200])
+    server = SlowMCPServer("capped", "capped", session=session, max_concurrent_requests=2)
+    
+    results = await asyncio.gather(*(server._make_request("https://example.org") for _ in range(6)))
+    
+    assert results == [{"status": 200}] * 6
+    assert session.peak == 2
+
+@pytest.mark.asyncio
+async def test_server_requests_are_spaced_by_min_interval():
+    """Test that request starts are spread out by the minimum interval."""
+    session = StubHTTPSession([200])
+    server = SlowMCPServer("spaced", "spaced", session=session, min_request_interval=0.05)
+    
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(server._make_request("https://example.org") for _ in range(3)))
+    
+    assert loop.time() - start >= 0.1
+
+def test_arxiv_concurrency_defaults_from_environment(monkeypatch):
+    """Test that the arXiv server takes its request limits from the environment."""
+    monkeypatch.setenv("ARXIV_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("ARXIV_MIN_REQUEST_INTERVAL", "3")
+    server = ArxivMCPServer()
+    
+    assert server._request_semaphore._value == 2
+    assert server._min_request_interval == 3.0
+    assert ArxivMCPServer(max_concurrent_requests=5)._request_semaphore._value == 5
+
+ARXIV_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/2103.12345v1</id>
+    <published>2021-03-23T00:00:00Z</published>
+    <title>Digital Services Research</title>
+    <summary>A study of digital services.</summary>
+    <author><name>Ada Lovelace</name></author>
+  </entry>
+</feed>"""
+
+def test_arxiv_response_parses_every_entry():
+    """Test that streaming the Atom feed keeps each entry's fields."""
+    feed = ARXIV_FEED.replace("</feed>", """  <entry>
+    <id>http://arxiv.org/abs/2104.00001v2</id>
+    <title>Second Paper</title>
+    <summary>Another abstract.</summary>
+    <author><name>Alan Turing</name></author>
+    <author><name>Grace Hopper</name></author>
+  </entry>
+</feed>""")
+    
+    papers = ArxivMCPServer()._parse_arxiv_response(feed.encode("utf-8"))
+    
+    assert [paper["arxiv_id"] for paper in papers] == ["2103.12345v1", "2104.00001v2"]
+    assert papers[0]["published_date"] == "2021-03-23T00:00:00Z"
+    assert papers[1]["authors"] == ["Alan Turing", "Grace Hopper"]
+    assert ArxivMCPServer()._parse_arxiv_response(b"not xml") == []
+
+def test_arxiv_relevance_counts_term_occurrences():
+    """Test that arXiv relevance counts every query term occurrence, capped at 1."""
+    server = ArxivMCPServer()
+    
+    assert server._calculate_relevance("Digital services and DIGITAL policy", "digital housing") == 1.0
+    assert server._calculate_relevance("Digital services", "digital housing budget") == pytest.approx(1 / 3)
+    assert server._calculate_relevance("Digital services", "housing") == 0.0
+    assert server._calculate_relevance("Digital services", "") == 0.0
+
+@pytest.mark.asyncio
+async def test_arxiv_server_caches_searches_and_papers(monkeypatch):
+    """Test that repeat arXiv lookups are served from memory until they expire."""
+    server = ArxivMCPServer()
+    calls = []
+    
+    async def fake_request(url, params=None, **kwargs):
+        calls.append(params)
+        return ARXIV_FEED.encode("utf-8")
+    
+    monkeypatch.setattr(server, "_make_raw_request", fake_request)
+    
+    first = await server.search("digital services", max_results=5)
+    assert await server.search("digital services", max_results=5) == first
+    assert first[0]["arxiv_id"] == "2103.12345v1"
+    paper = await server.get_content("2103.12345v1")
+    assert await server.get_content("2103.12345v1") == paper
+    assert len(calls) == 2
+    
+    # One batched call fetches only the papers not cached yet
+    contents = await server.get_contents(["2103.12345v1", "2104.00001"])
+    assert list(contents) == ["2103.12345v1"]
+    assert calls[-1]["id_list"] == "2104.00001"
+    assert len(calls) == 3
+    # Unversioned IDs match the versioned ID the feed reports
+    assert "2103.12345" in await server.get_contents(["2103.12345"])
+    assert len(calls) == 4
+    
+    monkeypatch.setattr(server, "SEARCH_CACHE_TTL", 0)
+    await server.search("digital services", max_results=5)
+    assert len(calls) == 5
+
+@pytest.mark.asyncio
+async def test_arxiv_server_coalesces_concurrent_requests(monkeypatch):
+    """Test that identical concurrent arXiv lookups share one API call."""
+    server = ArxivMCPServer()
+    calls = []
+    
+    async def fake_request(url, params=None, **kwargs):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        return ARXIV_FEED.encode("utf-8")
+    
+    monkeypatch.setattr(server, "_make_raw_request", fake_request)
+    
+    searches = await asyncio.gather(*(server.search("digital services") for _ in range(3)))
+    papers = await asyncio.gather(*(server.get_content("2103.12345") for _ in range(3)))
+    
+    assert searches[0] == searches[1] == searches[2] != []
+    assert papers[0] == papers[1] == papers[2] is not None
+    assert len(calls) == 2
+    assert server._inflight == {}
+    
+    # Feeds were parsed off the event loop, on a pool cleanup releases
+    assert server._parse_pool is not None
+    await server.cleanup()
+    assert server._parse_pool is None
+
+@pytest.mark.asyncio
+async def test_owned_session_is_tuned_and_serializes_with_orjson():
+    """Test that a server's own session pools connections and encodes JSON with json_dumps."""
+    server = SlowMCPServer("owned", "owned")
+    await server.initialize()
+    
+    assert server.session._json_serialize is base_server.json_dumps
+    assert server.session.connector.limit_per_host == 32
+    assert server.session.timeout.total == 30
+    assert base_server.json_dumps({"query": "café"}) == '{"query":"café"}'
+    await server.cleanup()
+
+@pytest.mark.asyncio
+async def test_server_requests_retry_throttled_and_failed_responses(monkeypatch):
+    """Test that 429/5xx responses are retried and other errors are raised at once."""
+    monkeypatch.setattr(base_server, "RETRY_BACKOFF_BASE", 0)
+    session = StubHTTPSession([429, 503, 200], headers={"Retry-After": "0"})
+    server = SlowMCPServer("retrying", "retrying", session=session)
+    
+    assert await server._make_request("https://example.org") == {"status": 200}
+    assert session.calls == 3
+    
+    session = StubHTTPSession([404, 200])
+    server = SlowMCPServer("missing", "missing", session=session)
+    with pytest.raises(aiohttp.ClientResponseError):
+        await server._make_request("https://example.org")
+    assert session.calls == 1
+
+def test_retry_delay_backs_off_with_jitter():
+    """Test that retry delays grow exponentially with jitter unless Retry-After is given."""
+    for attempt in range(3):
+        delay = BaseMCPServer._retry_delay(attempt)
+        base = base_server.RETRY_BACKOFF_BASE * 2 ** attempt
+        assert base <= delay <= base + base_server.RETRY_JITTER
+    assert BaseMCPServer._retry_delay(10) <= base_server.RETRY_BACKOFF_MAX + base_server.RETRY_JITTER
+    assert BaseMCPServer._retry_delay(0, "2") == 2.0
+
+@pytest.mark.asyncio
+async def test_hedged_call_takes_the_faster_copy():
+    """Test that a stalled call is duplicated and the straggler cancelled."""
+    delays = [1.0, 0.0]
+    started = []
+    
+    async def call():
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+    
+    assert await asyncio.wait_for(hedged(call, 0.01), timeout=0.5) == 0.0
+    assert started == [1.0, 0.0]
+    
+    started.clear()
+    delays.reverse()
+    assert await hedged(call, 0.5) == 0.0
+    assert started == [0.0]
+
+@pytest.mark.asyncio
+async def test_search_is_hedged_once_latencies_are_known(monkeypatch):
+    """Test that searches slower than the source's recent p95 get a second request."""
+    monkeypatch.setattr(mcp_manager_module, "HEDGE_MIN_SAMPLES", 3)
+    
+    class StallingServer(SlowMCPServer):
+        calls = 0
+        
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            StallingServer.calls += 1
+            # After three fast searches the next one stalls unless hedged
+            await asyncio.sleep(1.0 if StallingServer.calls == 4 else 0.0)
+            return [{"title": query, "relevance_score": 1.0}]
+    
+    manager = MCPManager()
+    manager.register_server("stalling", StallingServer("stalling", "stalling"))
+    for _ in range(3):
+        await manager.search_all("warm up")
+    
+    results = await asyncio.wait_for(manager.search_all("hedged"), timeout=0.5)
+    assert [result.title for result in results] == ["hedged"]
+    assert StallingServer.calls == 5
+
+@pytest.mark.asyncio
+async def test_rate_limited_sources_are_never_hedged(monkeypatch):
+    """Test that sources with a request spacing policy never get a duplicate search."""
+    monkeypatch.setattr(mcp_manager_module, "HEDGE_MIN_SAMPLES", 3)
+    
+    class ThrottledServer(SlowMCPServer):
+        calls = 0
+        
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            ThrottledServer.calls += 1
+            await asyncio.sleep(0.05 if ThrottledServer.calls == 4 else 0.0)
+            return [{"title": query, "relevance_score": 1.0}]
+    
+    manager = MCPManager()
+    manager.register_server("throttled", ThrottledServer("throttled", "throttled", min_request_interval=1.0))
+    for _ in range(4):
+        await manager.search_all(f"search {ThrottledServer.calls}")
+    
+    assert ThrottledServer.calls == 4
+    assert manager._hedge_delay("throttled") is None
+    assert not ArxivMCPServer().allows_hedging
+
+@pytest.mark.asyncio
+async def test_health_checks_are_reused_within_ttl(monkeypatch):
+    """Test that health checks are shared by concurrent callers and reused until the TTL."""
+    class CountingServer(SlowMCPServer):
+        checks = 0
+        
+        async def _initialize_server(self):
+            pass
+        
+        async def health_check(self):
+            CountingServer.checks += 1
+            return await super().health_check()
+    
+    manager = MCPManager()
+    manager.register_server("counting", CountingServer("counting", "counting"))
+    
+    statuses = await asyncio.gather(*(manager.health_check() for _ in range(3)))
+    await manager.health_check()
+    assert CountingServer.checks == 1
+    assert statuses[0]["servers"]["counting"]["status"] == "healthy"
+    
+    monkeypatch.setattr(MCPManager, "HEALTH_CHECK_TTL", 0)
+    await manager.health_check()
+    assert CountingServer.checks == 2
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_searches_share_one_request():
+    """Test that concurrent identical searches of a source send a single request."""
+    class CountingServer(SlowMCPServer):
+        searches = 0
+        
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            CountingServer.searches += 1
+            await asyncio.sleep(0.01)
+            return [{"title": query, "relevance_score": 1.0}]
+    
+    manager = MCPManager()
+    manager.register_server("counting", CountingServer("counting", "counting"))
+    
+    same, other, _ = await asyncio.gather(
+        manager.search_all("DSS"), manager.search_all("SNAP"), manager.search_all("DSS")
+    )
+    assert CountingServer.searches == 2
+    assert [result.title for result in same] == ["DSS"]
+    assert [result.title for result in other] == ["SNAP"]
+    
+    await manager.search_all("DSS")
+    assert CountingServer.searches == 3
+
+@pytest.mark.asyncio
+async def test_search_cache_expires_entries_per_source(tmp_path):
+    """Test that cached search results expire after their source's TTL."""
+    cache = SearchCache(str(tmp_path / "search.sqlite3"), ttls={"arxiv": 0, "wikipedia": 60})
+    results = [{"title": "MCP", "relevance_score": 0.5}]
+    await cache.set("wikipedia", "MCP", 3, results)
+    await cache.set("arxiv", "MCP", 3, results)
+    
+    assert await cache.get("wikipedia", "MCP", 3) == results
+    assert await cache.get("wikipedia", "MCP", 5) is None
+    assert await cache.get("arxiv", "MCP", 3) is None
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_search_cache_reads_entries_written_without_orjson(tmp_path, monkeypatch):
+    """Test that the stdlib fallback and orjson read each other's entries."""
+    path = str(tmp_path / "search.sqlite3")
+    results = [{"title": "Résumé", "relevance_score": 0.5}]
+    monkeypatch.setattr(search_cache, "orjson", None)
+    cache = SearchCache(path)
+    await cache.set("wikipedia", "MCP", 3, results)
+    cache.close()
+    
+    monkeypatch.undo()
+    cache = SearchCache(path)
+    assert await cache.get("wikipedia", "MCP", 3) == results
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_search_cache_is_reused_across_managers(tmp_path):
+    """Test that a new manager answers a cached search without calling the server."""
+    class CountingServer(SlowMCPServer):
+        searches = 0
+        
+        async def _initialize_server(self):
+            pass
+        
+        async def search(self, query: str, max_results: int = 10):
+            CountingServer.searches += 1
+            return [{"title": query, "relevance_score": 1.0}]
+    
+    path = str(tmp_path / "search.sqlite3")
+    for _ in range(2):
+        cache = SearchCache(path)
+        manager = MCPManager(search_cache=cache)
+        manager.register_server("counting", CountingServer("counting", "counting"))
+        results = await manager.search_all("DSS")
+        cache.close()
+    
+    assert CountingServer.searches == 1
+    assert [result.title for result in results] == ["DSS"]
@@ -1,6 +1,9 @@
 import pytest
 import asyncio
-from agents.researcher.researcher import Researcher, ResearchQuery, ResearchSource
+import aiohttp
+from agents.researcher.researcher import Researcher, ResearchQuery, ResearchSource, _parse_bulleted
+from core.llm_service import LLMService
+from mcp.mcp_manager import MCPManager
 
 @pytest.fixture
 def researcher():
@@ -46,6 +49,25 @@ async def test_research_source_model():
     assert source.title == "Test Document"
     assert source.relevance_score == 0.8
 
+@pytest.mark.asyncio
+async def test_research_source_ignores_extra_fields_and_is_frozen():
+    """Test that ResearchSource drops unknown keys and cannot be mutated."""
+    from pydantic import ValidationError
+
+    source = ResearchSource(
+        url="https://example.com",
+        title="Test Document",
+        content="Content",
+        source_type="web",
+        timestamp="2024-01-01",
+        relevance_score=0.8,
+        fetched_by="crawler"
+    )
+
+    assert "fetched_by" not in source.model_dump(mode="json")
+    with pytest.raises(ValidationError):
+        source.relevance_score = 0.1
+
 @pytest.mark.asyncio
 async def test_document_analysis(researcher):
     """Test document analysis functionality."""
@@ -184,4 +206,481 @@ async def test_theme_extraction(researcher):
     
     assert isinstance(themes, list)
     assert len(themes) <= 5  # Should extract up to 5 themes
-    assert all(isinstance(theme, str) for theme in themes) 
\ No newline at end of file
+    assert all(isinstance(theme, str) for theme in themes) 
+
+def _page(title: str) -> str:
+    return f"<html><head><title>{title}</title></head><body>DSS services</body></html>"
+
+
+@pytest.mark.parametrize("hra_response, fetch_errors", [
+    (ConnectionError("unreachable"), {"www.nyc.gov": 1}),
+    ({"status": 404, "body": "Not Found"}, {}),
+    ({"status": 200, "body": "%PDF", "content_type": "application/pdf"}, {}),
+], ids=["connection_error", "not_found", "non_html"])
+@pytest.mark.asyncio
+async def test_web_search_skips_unusable_sources(researcher, stub_response, install_web_session,
+                                                 hra_response, fetch_errors):
+    """Test that failed, non-200 and non-HTML sources are skipped and page reads are size-capped."""
+    if isinstance(hra_response, dict):
+        hra_response = stub_response(**hra_response)
+    dss = stub_response(200, _page("DSS"), delay=0.02)
+    install_web_session(researcher, {
+        "https://www1.nyc.gov/site/dss/index.page": dss,
+        "https://www.nyc.gov/site/hra/index.page": hra_response,
+        "https://www.nyc.gov/site/dhs/index.page": stub_response(200, _page("DHS")),
+    })
+    query = ResearchQuery(topic="DSS", keywords=["services"], scope="focused", sources=["web"])
+
+    sources = await researcher._search_web_sources(query)
+
+    assert [source["title"] for source in sources] == ["DSS", "DHS"]
+    assert researcher._fetch_errors == fetch_errors
+    assert dss.content.requested == Researcher.MAX_PAGE_BYTES
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_retries_transient_failures(researcher, stub_response, install_web_session):
+    """Test that connection errors and 5xx responses are retried before giving up."""
+    researcher.FETCH_RETRY_BASE_DELAY = 0
+    researcher.FETCH_RETRY_JITTER = 0
+    session = install_web_session(researcher, {
+        "https://www1.nyc.gov/site/dss/index.page": [
+            aiohttp.ClientConnectionError("reset"), stub_response(200, _page("DSS"))
+        ],
+        "https://www.nyc.gov/site/hra/index.page": [
+            stub_response(503, "busy"), stub_response(502, "bad gateway"), stub_response(200, _page("HRA"))
+        ],
+        "https://www.nyc.gov/site/dhs/index.page": [stub_response(500, "error")] * 3,
+    })
+    query = ResearchQuery(topic="DSS", keywords=["services"], scope="focused", sources=["web"])
+
+    sources = await researcher._search_web_sources(query)
+
+    assert [source["title"] for source in sources] == ["DSS", "HRA"]
+    assert session.responses["https://www.nyc.gov/site/dhs/index.page"] == []
+
+
+@pytest.mark.asyncio
+async def test_web_pages_are_parsed_off_the_event_loop(researcher, stub_response, install_web_session):
+    """Test that page parsing runs in the parse pool, not on the loop thread."""
+    import threading
+
+    parse_threads = []
+    parse_page = researcher._parse_page
+
+    def recording_parse_page(html, search_terms):
+        parse_threads.append(threading.current_thread().name)
+        return parse_page(html, search_terms)
+
+    researcher._parse_page = recording_parse_page
+    install_web_session(researcher, {
+        "https://www1.nyc.gov/site/dss/index.page": stub_response(200, _page("DSS")),
+        "https://www.nyc.gov/site/hra/index.page": stub_response(200, _page("HRA")),
+        "https://www.nyc.gov/site/dhs/index.page": stub_response(200, _page("DHS")),
+    })
+    query = ResearchQuery(topic="DSS", keywords=["services"], scope="focused", sources=["web"])
+
+    sources = await researcher._search_web_sources(query)
+
+    assert [source["title"] for source in sources] == ["DSS", "HRA", "DHS"]
+    assert len(parse_threads) == 3
+    assert all(name.startswith("researcher-parse") for name in parse_threads)
+
+    # Cleanup releases the pool, and the next search starts a new one
+    await researcher.cleanup()
+    assert researcher._parse_pool is None
+    assert len(await researcher._search_web_sources(query)) == 3
+    assert len(parse_threads) == 6
+
+
+@pytest.mark.asyncio
+async def test_document_analysis_preserves_order(researcher, stub_llm_service):
+    """Test that concurrent document analysis keeps the input order."""
+    researcher.llm_service = stub_llm_service()
+    documents = [{"title": f"Doc {i}", "content": "DSS policy"} for i in range(3)]
+
+    result = await researcher.analyze_documents({"documents": documents})
+
+    assert result["success"] is True
+    titles = [analysis["title"] for analysis in result["data"]["individual_analyses"]]
+    assert titles == ["Doc 0", "Doc 1", "Doc 2"]
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_research_merges_web_and_mcp(researcher, stub_llm_service):
+    """Test that web and MCP sources are merged and sorted by relevance."""
+    researcher.llm_service = stub_llm_service()
+
+    async def fake_web_sources(query):
+        return [{
+            "url": "https://example.com",
+            "title": "Web Page",
+            "content": "DSS web content",
+            "source_type": "web",
+            "timestamp": "2024-01-01",
+            "relevance_score": 0.4
+        }]
+
+    async def fake_mcp_sources(query, max_results):
+        return [ResearchSource(
+            url="https://en.wikipedia.org/wiki/DSS",
+            title="Wiki Page",
+            content="DSS wiki content",
+            source_type="mcp_wikipedia",
+            timestamp="2024-01-01",
+            relevance_score=0.9
+        )]
+
+    researcher._search_web_sources = fake_web_sources
+    researcher._search_mcp_research_sources = fake_mcp_sources
+
+    result = await researcher.conduct_comprehensive_research({"query": "DSS"})
+
+    assert result["success"] is True
+    assert [s["title"] for s in result["data"]["sources"]] == ["Wiki Page", "Web Page"]
+    assert result["data"]["source_breakdown"] == {"web_sources": 1, "mcp_sources": 1}
+    assert len(result["data"]["key_findings"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_research_adds_web_only_when_mcp_falls_short(researcher, stub_llm_service):
+    """Test that web sources join only slow or sparse MCP searches."""
+    researcher.llm_service = stub_llm_service()
+    researcher.ESCALATION_DEFAULT_DELAY = 0.05
+    web_searches = []
+    mcp_delay = 0.0
+
+    async def fake_web_sources(query):
+        web_searches.append(query.topic)
+        return []
+
+    async def fake_mcp_sources(query, max_results):
+        await asyncio.sleep(mcp_delay)
+        return [ResearchSource(
+            url=f"https://en.wikipedia.org/wiki/{i}",
+            title=f"Wiki Page {i}",
+            content=f"DSS wiki content {i}",
+            source_type="mcp_wikipedia",
+            timestamp="2024-01-01",
+            relevance_score=0.9
+        ) for i in range(2)]
+
+    researcher._search_web_sources = fake_web_sources
+    researcher._search_mcp_research_sources = fake_mcp_sources
+
+    await researcher.conduct_comprehensive_research({"query": "fast", "max_results": 2, "adaptive": True})
+    await researcher.conduct_comprehensive_research({"query": "sparse", "max_results": 3, "adaptive": True})
+    mcp_delay = 0.1
+    result = await researcher.conduct_comprehensive_research(
+        {"query": "slow", "max_results": 2, "adaptive": True}
+    )
+
+    assert web_searches == ["sparse", "slow"]
+    assert result["data"]["source_breakdown"] == {"web_sources": 0, "mcp_sources": 2}
+
+
+@pytest.mark.asyncio
+async def test_sufficient_mcp_results_cancel_the_web_search(researcher, stub_llm_service):
+    """Test that enough relevant MCP sources end comprehensive research early unless opted out."""
+    researcher.llm_service = stub_llm_service()
+    finished = []
+
+    async def slow_web_sources(query):
+        await asyncio.sleep(0.2)
+        finished.append("web")
+        return []
+
+    async def fake_mcp_sources(query, max_results):
+        return [ResearchSource(
+            url=f"https://en.wikipedia.org/wiki/{i}",
+            title=f"Wiki Page {i}",
+            content=f"DSS wiki content {i}",
+            source_type="mcp_wikipedia",
+            timestamp="2024-01-01",
+            relevance_score=0.9
+        ) for i in range(2)]
+
+    researcher._search_web_sources = slow_web_sources
+    researcher._search_mcp_research_sources = fake_mcp_sources
+
+    result = await asyncio.wait_for(
+        researcher.conduct_comprehensive_research({"query": "DSS", "max_results": 2}), timeout=0.15
+    )
+    assert result["data"]["source_breakdown"] == {"web_sources": 0, "mcp_sources": 2}
+    await asyncio.sleep(0.25)
+    assert finished == []
+
+    await researcher.conduct_comprehensive_research({"query": "DSS", "max_results": 2, "partial_ok": False})
+    assert finished == ["web"]
+
+
+@pytest.mark.asyncio
+async def test_synthesis_findings_block_skips_extraction_calls(researcher, stub_llm_service):
+    """Test that a trailing JSON block in the synthesis replaces extraction calls."""
+    llm_service = stub_llm_service(
+        "DSS synthesis text.\n\n```json\n"
+        '{"findings": ["F1", "F2"], "recommendations": ["R1"]}\n```'
+    )
+    researcher.llm_service = llm_service
+
+    result = await researcher.synthesize_research({
+        "sources": [{"title": "Doc", "content": "DSS content"}],
+        "research_question": "What works?"
+    })
+
+    assert result["success"] is True
+    assert result["data"]["synthesis"] == "DSS synthesis text."
+    assert result["data"]["key_findings"] == ["F1", "F2"]
+    assert result["data"]["recommendations"] == ["R1"]
+    assert len(llm_service.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_synthesis_without_findings_block_falls_back(researcher, stub_llm_service):
+    """Test that a synthesis without a valid block falls back to extraction."""
+    researcher.llm_service = stub_llm_service('{"findings": "not a list"}')
+    query = ResearchQuery(topic="DSS", keywords=[], scope="focused", sources=[])
+
+    synthesis, findings, recommendations = await researcher._split_synthesis("Plain synthesis", query)
+
+    assert synthesis == "Plain synthesis"
+    assert findings == ['{"findings": "not a list"}']
+    assert recommendations == findings
+
+
+def test_researcher_uses_injected_mcp_manager():
+    """Test that a shared MCP manager can be passed in instead of an empty one."""
+    mcp_manager = MCPManager()
+
+    assert Researcher(mcp_manager=mcp_manager).mcp_manager is mcp_manager
+    assert Researcher().mcp_manager is not mcp_manager
+
+
+@pytest.mark.asyncio
+async def test_repeated_research_prompt_skips_pipeline(researcher):
+    """Test that research() answers a repeated prompt without re-running research."""
+    runs = []
+
+    async def fake_comprehensive_research(research_data):
+        runs.append(research_data["query"])
+        return {"success": runs[-1] != "fails", "data": {"synthesis": f"About {runs[-1]}"}, "errors": ["boom"]}
+
+    researcher.conduct_comprehensive_research = fake_comprehensive_research
+
+    assert await researcher.research("SNAP") == "About SNAP"
+    assert await researcher.research("SNAP") == "About SNAP"
+    await researcher.research("fails")
+    await researcher.research("fails")
+
+    assert runs == ["SNAP", "fails", "fails"]
+
+
+@pytest.mark.asyncio
+async def test_best_practices_helpers_run_concurrently(researcher, stub_llm_service):
+    """Test that practice extraction and the implementation guide overlap."""
+    llm_service = stub_llm_service(delay=0.01)
+    researcher.llm_service = llm_service
+
+    result = await researcher.research_best_practices({"practice_area": "case management"})
+
+    assert result["success"] is True
+    assert result["data"]["key_practices"] == ["Finding one", "Finding two", "Finding three"]
+    assert len(llm_service.prompts) == 3
+    assert llm_service.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_policy_research_batches_follow_up_prompts(researcher, stub_llm_service):
+    """Test that policy implications and recommendations share one LLM call."""
+    llm_service = stub_llm_service(
+        "===SECTION key_implications===\n- Update eligibility rules\n"
+        "===SECTION recommendations===\n1. Pilot in Queens\n"
+    )
+    researcher.llm_service = llm_service
+
+    result = await researcher.research_policy_implications({"policy_topic": "SNAP"})
+
+    assert result["success"] is True
+    assert result["data"]["key_implications"] == ["Update eligibility rules"]
+    assert result["data"]["recommendations"] == ["1. Pilot in Queens"]
+    assert len(llm_service.prompts) == 2
+
+
+class PeakOllamaClient:
+    """ollama.AsyncClient stand-in whose streams record the peak number in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def chat(self, model, messages, stream=False, format=""):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+        async def parts():
+            try:
+                await asyncio.sleep(0.01)
+                yield {"message": {"content": "- Finding"}}
+            finally:
+                self.in_flight -= 1
+
+        return parts()
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_bounded_by_the_llm_service(researcher):
+    """Test that concurrent LLM calls never exceed the LLM service's limit."""
+    llm_service = LLMService(cache_enabled=False, max_concurrency=2)
+    client = PeakOllamaClient()
+    llm_service._get_client = lambda: client
+    researcher.llm_service = llm_service
+
+    findings = await asyncio.wait_for(
+        asyncio.gather(*(researcher._extract_key_findings(f"synthesis {i}") for i in range(6))),
+        timeout=5
+    )
+
+    assert findings == [["Finding"]] * 6
+    assert client.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_list_extraction_reuses_existing_bullets(researcher, stub_llm_service):
+    """Test that extraction skips the LLM when the source is already a list."""
+    llm_service = stub_llm_service()
+    researcher.llm_service = llm_service
+
+    themes = await researcher._extract_themes("## Themes\n- Access\n* Equity\n\n1. Speed\n2) Trust")
+    insights = await researcher._extract_document_insights("Intro prose.\n1. Access\n2. Equity\n3. Speed")
+    findings = await researcher._extract_key_findings("- Access\n- Equity")
+
+    assert themes == ["Access", "Equity", "Speed", "Trust"]
+    # Prose with an outline, or too short a list, still goes to the LLM
+    assert insights == findings == ["Finding one", "Finding two", "Finding three"]
+    assert len(llm_service.prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_extraction_stops_streaming_at_limit(researcher, stub_llm_service):
+    """Test that list extraction closes the LLM stream once enough items arrive."""
+    lines = ["# Heading"] + [f"Finding {i}" for i in range(20)]
+    llm_service = stub_llm_service("\n".join(lines))
+    researcher.llm_service = llm_service
+
+    findings = await researcher._extract_key_findings("long synthesis")
+
+    assert findings == [f"Finding {i}" for i in range(5)]
+    assert llm_service.stream_closed
+    assert llm_service.chunks_sent * 4 < len(llm_service.content)
+
+    # A cut-off stream is not cached, so a repeat asks the LLM again
+    assert await researcher._extract_key_findings("long synthesis") == findings
+    assert len(llm_service.prompts) == 2
+
+
+def test_parse_bulleted_strips_markers_and_headings():
+    """Test that LLM list output is split into clean items."""
+    text = "## Findings\r\n- First finding\r\n\r\n* Second finding\n• Third\n**Bold** item\n1. Numbered"
+
+    assert _parse_bulleted(text) == ["First finding", "Second finding", "Third", "**Bold** item", "1. Numbered"]
+    assert _parse_bulleted(text, limit=2) == ["First finding", "Second finding"]
+
+
+@pytest.mark.asyncio
+async def test_findings_and_recommendations_use_one_json_call(researcher, stub_llm_service):
+    """Test that findings and recommendations come from a single JSON response."""
+    llm_service = stub_llm_service('{"findings": ["F1", "F2"], "recommendations": ["R1"]}')
+    researcher.llm_service = llm_service
+    query = ResearchQuery(topic="SNAP", keywords=[], scope="focused", sources=[])
+
+    findings, recommendations = await researcher._extract_findings_and_recommendations("synthesis", query)
+
+    assert findings == ["F1", "F2"]
+    assert recommendations == ["R1"]
+    assert len(llm_service.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_findings_and_recommendations_fall_back_without_json(researcher, stub_llm_service):
+    """Test that a non-JSON response falls back to separate extraction calls."""
+    llm_service = stub_llm_service()
+    researcher.llm_service = llm_service
+    query = ResearchQuery(topic="SNAP", keywords=[], scope="focused", sources=[])
+
+    findings, recommendations = await researcher._extract_findings_and_recommendations("synthesis", query)
+
+    assert findings == ["Finding one", "Finding two", "Finding three"]
+    assert recommendations == findings
+    assert len(llm_service.prompts) == 3
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_sources_are_dropped(researcher):
+    """Test that overlapping sources collapse to the most relevant one."""
+    text = "DSS expands SNAP outreach to families across all five boroughs this year"
+    sources = [
+        ResearchSource(url="a", title="A", content=text, source_type="web",
+                       timestamp="2024-01-01", relevance_score=0.4),
+        ResearchSource(url="b", title="B", content="Homeless shelter capacity report for winter",
+                       source_type="web", timestamp="2024-01-01", relevance_score=0.5),
+        ResearchSource(url="c", title="C", content=text + " too", source_type="mcp",
+                       timestamp="2024-01-01", relevance_score=0.9),
+    ]
+
+    assert [source.title for source in researcher._deduplicate_sources(sources)] == ["B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_source_content_is_truncated_by_tokens(researcher):
+    """Test that source content is cut at a token count, not a character count."""
+    content = " ".join(f"word{i}" for i in range(500))
+
+    assert researcher._truncate_tokens(content).split() == [f"word{i}" for i in range(Researcher.SOURCE_SUMMARY_TOKENS)]
+    assert researcher._truncate_tokens("short  text", 10) == "short text"
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_and_closed(researcher):
+    """Test that the web session is created once and closed by aclose."""
+    session = await researcher._get_session()
+
+    assert await researcher._get_session() is session
+    assert session.connector.limit_per_host == 16
+
+    await researcher.aclose()
+    assert session.closed
+    assert researcher.session is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_session(researcher):
+    """Test that concurrent _get_session calls never create duplicate sessions."""
+    sessions = await asyncio.gather(*(researcher._get_session() for _ in range(10)))
+
+    assert all(session is sessions[0] for session in sessions)
+    await researcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_relevance_is_case_insensitive(researcher):
+    """Test that relevance counts term matches regardless of case."""
+    content = "dss DSS Dss policy"
+
+    assert researcher._calculate_relevance(content, "DSS policy") == 1.0
+    assert researcher._calculate_relevance(content, "housing") == 0.0
+    assert researcher._calculate_relevance(content, "") == 0.0
+    assert researcher._calculate_relevance("one DSS mention", "DSS housing budget") == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_parse_page_extracts_title_content_and_relevance(researcher):
+    """Test that a page is parsed once into title, visible text and relevance."""
+    page = researcher._parse_page(
+        "<html><head><title>DSS Home</title><style>p {}</style></head>"
+        "<body><p>Social   services</p>\n<script>var services;</script><p>for NYC</p></body></html>",
+        "services"
+    )
+
+    assert page["title"] == "DSS Home"
+    assert page["content"] == "DSS HomeSocial services for NYC"
+    assert page["relevance_score"] == 1.0
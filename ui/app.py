@@ -15,7 +15,10 @@ from typing import Dict, Any, List
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from flask import Flask, render_template, request, jsonify, session
+from flask import json as flask_json
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
+import orjson
 import threading
 
 # Import our agent system
@@ -24,12 +27,23 @@ from agents.strategist.dss_strategist import DSSStrategist
 from mcp.domain_manager import DomainManager, AgentDomain, DEFAULT_DOMAIN_CONFIGS
 from mcp.wikipedia_server import WikipediaMCPServer
 from mcp.arxiv_server import ArxivMCPServer
-from core.llm_service import LLMService
+from core.llm_service import get_llm_service
 from mcp.mcp_manager import MCPManager
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for large agent response payloads."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'agent-one-secret-key-2024'
-socketio = SocketIO(app, cors_allowed_origins="*")
+app.json = ORJSONProvider(app)
+# Route Socket.IO packets through the app's JSON provider as well
+socketio = SocketIO(app, cors_allowed_origins="*", json=flask_json)
 
 # Global variables for agent instances
 agents = {}
@@ -76,31 +90,24 @@ def initialize_agents():
     print("🔧 Initializing Agent-One System...")
     
     # Initialize LLM service
-    llm_service = LLMService()
+    llm_service = get_llm_service()
     
     # Initialize domain manager
     domain_manager = DomainManager()
     
     # Register all domains
-    for domain, config in DEFAULT_DOMAIN_CONFIGS.items():
-        domain_manager.register_domain(domain, config)
+    domain_manager.register_domains(DEFAULT_DOMAIN_CONFIGS)
     
     # Register MCP servers for research domain
     wikipedia_server = WikipediaMCPServer()
     arxiv_server = ArxivMCPServer()
     
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "wikipedia", wikipedia_server, priority=3
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.GENERAL, "wikipedia", wikipedia_server, priority=2
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.RESEARCH, "arxiv", arxiv_server, priority=2
-    )
-    domain_manager.register_server_for_domain(
-        AgentDomain.GENERAL, "arxiv", arxiv_server, priority=1
-    )
+    domain_manager.register_servers([
+        (AgentDomain.RESEARCH, "wikipedia", wikipedia_server, 3),
+        (AgentDomain.GENERAL, "wikipedia", wikipedia_server, 2),
+        (AgentDomain.RESEARCH, "arxiv", arxiv_server, 2),
+        (AgentDomain.GENERAL, "arxiv", arxiv_server, 1)
+    ])
     
     # Initialize domain manager
     asyncio.run(domain_manager.initialize_all())
@@ -301,7 +308,7 @@ def mcp_search():
         async def search_domain():
             try:
                 results = await domain_manager.search_domain(domain, query, max_results)
-                return [result.dict() for result in results]
+                return [result.model_dump(mode="json") for result in results]
             except Exception as e:
                 return {'error': str(e)}
         